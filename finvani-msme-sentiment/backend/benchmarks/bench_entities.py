@@ -0,0 +1,71 @@
+"""
+Benchmark: entity extraction cost per article.
+
+Times the gazetteer EntityExtractor (one Aho-Corasick pass per headline)
+against a spaCy statistical NER pipeline on the same corpus. spaCy is not a
+dependency of the API; the baseline is skipped unless it is installed along
+with the model, e.g.
+    pip install spacy && python -m spacy download en_core_web_sm
+
+Run from backend/:
+    python -m benchmarks.bench_entities --count 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath("."))
+
+from benchmarks.bench_language_detect import SAMPLES
+from src.services.ner_entities import EntityExtractor
+
+# English headlines with the kind of entities the extractor is meant for
+ENTITY_SAMPLES = [
+    "SBI cuts MSME loan rates for Ludhiana textile cluster - Business Standard",
+    "Tiruppur garment exporters seek ECLGS extension as US orders slow - Mint",
+    "Surat diamond artisans get Mudra loans under PM Vishwakarma - Times of India",
+    "RBI asks banks to speed up TReDS onboarding for small businesses in Gujarat - ET",
+    "Bajaj Finance, Shriram Finance expand MSME lending in Uttar Pradesh and Bihar - Moneycontrol",
+    "Pune auto component makers hit by chip shortage - Hindustan Times",
+]
+
+
+def _time(fn, texts, batch: bool) -> float:
+    start = time.perf_counter()
+    if batch:
+        fn(texts)
+    else:
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / len(texts) * 1e6
+
+
+def run(count: int, seed: int, spacy_model: str):
+    rng = random.Random(seed)
+    texts = [rng.choice(ENTITY_SAMPLES + [text for _, text in SAMPLES]) for _ in range(count)]
+
+    start = time.perf_counter()
+    extractor = EntityExtractor()
+    build_ms = (time.perf_counter() - start) * 1e3
+    gazetteer_us = _time(extractor.extract_batch, texts, batch=True)
+    print(f"{'gazetteer':>10}: {gazetteer_us:8.2f} us/article (automaton built in {build_ms:.0f} ms)")
+
+    try:
+        import spacy
+        nlp = spacy.load(spacy_model, disable=["parser", "lemmatizer", "tagger", "attribute_ruler"])
+    except (ImportError, OSError) as e:
+        print(f"{'spacy':>10}: skipped ({e})")
+        return
+    spacy_us = _time(lambda batch: list(nlp.pipe(batch, batch_size=256)), texts, batch=True)
+    print(f"{'spacy':>10}: {spacy_us:8.2f} us/article ({spacy_model}, ner only; {spacy_us / gazetteer_us:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entity extraction cost per article.")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spacy-model", default="en_core_web_sm")
+    args = parser.parse_args()
+    run(args.count, args.seed, args.spacy_model)
@@ -0,0 +1,83 @@
+"""
+Benchmark: one-at-a-time SentimentAnalyzer.predict vs predict_batch.
+
+Run from backend/:
+    python -m benchmarks.bench_inference --model-path model_output --data ../data/raw/2025-01-01.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.append(os.path.abspath("."))
+
+from src.models.infer import SentimentAnalyzer
+
+SAMPLE_HEADLINES = [
+    "RBI increases repo rate by 50 bps, hitting MSME loans.",
+    "Government announces subsidy for small exporters.",
+    "Sensex stays flat ahead of budget announcement.",
+    "SIDBI launches new credit line for women-led micro enterprises in rural districts.",
+    "एमएसएमई क्षेत्र को सस्ते कर्ज के लिए नई योजना",
+    "சிறு தொழில்களுக்கு புதிய கடன் திட்டம்",
+    "Textile units in Tiruppur face cash crunch as raw material costs climb for the third straight month",
+    "GST collections rise 12% year on year",
+]
+
+
+def load_headlines(data_path: str | None, limit: int) -> List[str]:
+    if data_path and Path(data_path).exists():
+        headlines = []
+        with open(data_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    title = json.loads(line).get("title")
+                except json.JSONDecodeError:
+                    continue
+                if title:
+                    headlines.append(title)
+                if len(headlines) >= limit:
+                    break
+        if headlines:
+            return headlines
+    # Fall back to the built-in samples, repeated up to the requested size
+    return (SAMPLE_HEADLINES * (limit // len(SAMPLE_HEADLINES) + 1))[:limit]
+
+
+def time_it(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(model_path: str, data_path: str | None, limit: int, batch_sizes: List[int]):
+    analyzer = SentimentAnalyzer(model_path=model_path)
+    # Measure the model, not the prediction cache
+    analyzer.cache = None
+    headlines = load_headlines(data_path, limit)
+    print(f"Benchmarking {len(headlines)} headlines on {analyzer.model_path}")
+
+    # Warm up so the first timed run does not pay for lazy initialisation
+    analyzer.predict_batch(headlines[:8])
+
+    elapsed = time_it(lambda: [analyzer.predict(h) for h in headlines])
+    baseline = len(headlines) / elapsed
+    print(f"{'loop':>12}: {baseline:8.1f} headlines/sec ({elapsed:.2f}s)")
+
+    for batch_size in batch_sizes:
+        elapsed = time_it(lambda: analyzer.predict_batch(headlines, batch_size=batch_size))
+        rate = len(headlines) / elapsed
+        print(f"{'batch=' + str(batch_size):>12}: {rate:8.1f} headlines/sec ({elapsed:.2f}s, {rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare predict() loop against predict_batch().")
+    parser.add_argument("--model-path", default="model_output")
+    parser.add_argument("--data", default=None, help="JSONL file with a 'title' field per line")
+    parser.add_argument("--limit", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 64])
+    args = parser.parse_args()
+    run(args.model_path, args.data, args.limit, args.batch_sizes)
@@ -0,0 +1,79 @@
+"""
+Benchmark: full 22-language ingestion run against a local stub RSS server.
+
+Compares serial fetching with the concurrent fetch mode, then repeats the
+concurrent run to show conditional GETs (304 Not Modified) skipping parsing.
+With --trace-memory each line also reports the Python heap peak of the run
+(tracemalloc slows parsing down, so timings are only comparable without it).
+The peak should stay flat as the number of feeds grows.
+
+Run from backend/:
+    python -m benchmarks.bench_ingestion --latency-ms 150
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.abspath("."))
+
+from benchmarks.stub_rss_server import StubRSSServer
+from src.ingestion.rss_google_news import GoogleNewsIngester, LANGUAGES
+
+QUERIES = ["MSME", "SME India", "Business Loan", "Economy India", "Finance Ministry", "RBI"]
+
+
+def timed_run(base_url: str, data_dir: str, max_workers: int, per_host_limit: int, trace_memory: bool):
+    """Returns (seconds, peak traced heap in MB or None) for one full run."""
+    ingester = GoogleNewsIngester(
+        data_dir,
+        base_url=base_url,
+        max_workers=max_workers,
+        per_host_limit=per_host_limit
+    )
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    ingester.run_ingestion(QUERIES, LANGUAGES)
+    elapsed = time.perf_counter() - start
+    if not trace_memory:
+        return elapsed, None
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def describe(elapsed: float, peak) -> str:
+    return f"{elapsed:6.2f}s" + (f", peak heap {peak:6.1f}MB" if peak is not None else "")
+
+
+def run(latency_ms: float, max_workers: int, per_host_limit: int, items_per_feed: int, trace_memory: bool):
+    logging.getLogger().setLevel(logging.WARNING)
+    feeds = len(QUERIES) * len(LANGUAGES)
+
+    with StubRSSServer(latency_ms=latency_ms, items_per_feed=items_per_feed) as server:
+        with tempfile.TemporaryDirectory() as serial_dir:
+            result = timed_run(server.base_url, serial_dir, 1, 1, trace_memory)
+            print(f"{'serial':>22}: {describe(*result)} for {feeds} feeds")
+
+        with tempfile.TemporaryDirectory() as concurrent_dir:
+            result = timed_run(server.base_url, concurrent_dir, max_workers, per_host_limit, trace_memory)
+            print(f"{'concurrent (cold)':>22}: {describe(*result)} (workers={max_workers}, per_host={per_host_limit})")
+
+            before = server.not_modified
+            result = timed_run(server.base_url, concurrent_dir, max_workers, per_host_limit, trace_memory)
+            print(f"{'concurrent (304s)':>22}: {describe(*result)} ({server.not_modified - before}/{feeds} not modified)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Wall-clock time of a full 22-language ingestion run.")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Simulated server round trip")
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--per-host-limit", type=int, default=8)
+    parser.add_argument("--items-per-feed", type=int, default=20)
+    parser.add_argument("--trace-memory", action="store_true", help="Report tracemalloc peak per run")
+    args = parser.parse_args()
+    run(args.latency_ms, args.max_workers, args.per_host_limit, args.items_per_feed, args.trace_memory)
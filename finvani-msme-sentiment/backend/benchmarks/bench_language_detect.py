@@ -0,0 +1,62 @@
+"""
+Microbenchmark: language detection cost per headline.
+
+Times detect_script (Unicode blocks only) and detect_batch (including the
+Devanagari n-gram fallback) over a synthetic corpus of mixed-script
+headlines, reporting microseconds per headline.
+
+Run from backend/:
+    python -m benchmarks.bench_language_detect --count 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath("."))
+
+from src.preprocess.language_detect import detect_batch, detect_script
+
+# (feed language, headline) samples; Google News titles carry a " - Publisher" suffix
+SAMPLES = [
+    ("en", "RBI keeps repo rate unchanged, MSME lenders expect relief in credit costs - Mint"),
+    ("hi", "आरबीआई ने रेपो रेट में कोई बदलाव नहीं किया, छोटे उद्योगों को राहत की उम्मीद - दैनिक भास्कर"),
+    ("hi", "MSME sector sees record credit growth in Q2 - Business Standard"),
+    ("mr", "रिझर्व्ह बँकेने रेपो दरात कोणताही बदल केलेला नाही, लघु उद्योगांना दिलासा - लोकसत्ता"),
+    ("ne", "सरकारले साना उद्योगहरूलाई सहुलियत ऋण दिने निर्णय गरेको छ - कान्तिपुर"),
+    ("mai", "सरकार छोट उद्योग सभ केँ सस्त ऋण देत, मिथिला मे खुशी"),
+    ("bn", "রিজার্ভ ব্যাংক সুদের হার অপরিবর্তিত রাখল, ক্ষুদ্র শিল্পে স্বস্তি - আনন্দবাজার"),
+    ("ta", "ரிசர்வ் வங்கி வட்டி விகிதத்தில் மாற்றமில்லை, சிறு தொழில்களுக்கு நிம்மதி - தினமலர்"),
+    ("te", "రిజర్వ్ బ్యాంక్ వడ్డీ రేట్లు యథాతథం, చిన్న పరిశ్రమలకు ఊరట - ఈనాడు"),
+    ("gu", "રિઝર્વ બેંકે વ્યાજ દર યથાવત રાખ્યા, નાના ઉદ્યોગોને રાહત - સંદેશ"),
+    ("ur", "ریزرو بینک نے شرح سود برقرار رکھی، چھوٹی صنعتوں کو راحت - انقلاب"),
+    ("ml", "റിസർവ് ബാങ്ക് പലിശ നിരക്ക് മാറ്റമില്ല, ചെറുകിട വ്യവസായങ്ങൾക്ക് ആശ്വാസം - മനോരമ"),
+]
+
+
+def run(count: int, seed: int):
+    rng = random.Random(seed)
+    corpus = [rng.choice(SAMPLES) for _ in range(count)]
+    hints = [hint for hint, _ in corpus]
+    texts = [text for _, text in corpus]
+
+    start = time.perf_counter()
+    for text in texts:
+        detect_script(text)
+    script_us = (time.perf_counter() - start) / count * 1e6
+
+    start = time.perf_counter()
+    detect_batch(texts, hints)
+    batch_us = (time.perf_counter() - start) / count * 1e6
+
+    print(f"{'detect_script':>14}: {script_us:6.2f} us/headline")
+    print(f"{'detect_batch':>14}: {batch_us:6.2f} us/headline ({count / (batch_us * count / 1e6):,.0f} headlines/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Language detection cost per headline.")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.count, args.seed)
@@ -0,0 +1,76 @@
+"""
+Benchmark: headline normalization throughput on a 100k-headline corpus.
+
+Compares normalize_text called per headline with normalize_batch (one
+translate/regex pass over the joined batch). The corpus is built from the
+mixed-script samples of bench_language_detect with the noise real feeds
+carry: zero-width joiners, NBSPs, Indic digits, HTML entities, decomposed
+Unicode and " - Publisher" suffixes.
+
+Run from backend/:
+    python -m benchmarks.bench_normalize --count 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import unicodedata
+
+sys.path.append(os.path.abspath("."))
+
+from benchmarks.bench_language_detect import SAMPLES
+from src.preprocess.normalize import normalize_batch, normalize_text
+
+NOISE = [
+    lambda t: t.replace(" ", " ", 2),
+    lambda t: t.replace("्", "्‍", 1),
+    lambda t: t.replace("2", "२").replace("5", "५"),
+    lambda t: t.replace(" & ", " &amp; "),
+    lambda t: unicodedata.normalize("NFD", t),
+    lambda t: t + "​",
+    lambda t: t,
+]
+
+
+PUBLISHERS = [None, "The Hindu", "Economic Times", "दैनिक भास्कर"]
+
+
+def build_corpus(count: int, seed: int):
+    rng = random.Random(seed)
+    corpus, publishers = [], []
+    for i in range(count):
+        publisher = rng.choice(PUBLISHERS)
+        text = f"{rng.choice(SAMPLES)[1]} ({i % 97} crore, 2025 & beyond)"
+        if publisher:
+            text += f" - {publisher}"
+        corpus.append(rng.choice(NOISE)(text))
+        publishers.append(publisher)
+    return corpus, publishers
+
+
+def run(count: int, batch_size: int, seed: int):
+    corpus, publishers = build_corpus(count, seed)
+
+    start = time.perf_counter()
+    single = [normalize_text(text, publisher=publisher) for text, publisher in zip(corpus, publishers)]
+    single_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = []
+    for i in range(0, count, batch_size):
+        batched.extend(normalize_batch(corpus[i:i + batch_size], publishers[i:i + batch_size]))
+    batch_s = time.perf_counter() - start
+
+    assert batched == single, "batch and per-headline results differ"
+    print(f"{'per headline':>14}: {single_s:6.2f}s ({count / single_s:,.0f} headlines/s)")
+    print(f"{'batched':>14}: {batch_s:6.2f}s ({count / batch_s:,.0f} headlines/s, batch_size={batch_size})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headline normalization throughput.")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.count, args.batch_size, args.seed)
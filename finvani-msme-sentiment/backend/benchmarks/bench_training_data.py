@@ -0,0 +1,115 @@
+"""
+Benchmark: training examples/sec per epoch, per-item tokenization vs the pre-tokenized pipeline.
+
+"before": SentimentDataset (encode_plus on every access, padded to max_len)
+          behind a single-process DataLoader.
+"after":  build_dataloader (tokenized once into mmapped arrays, length-bucketed
+          batches, dynamic padding, DataLoader workers).
+
+Each epoch runs a forward and backward pass per batch so padding shows up in
+the numbers; --data-only times the input pipeline alone. The one-off
+tokenization in build_dataloader (cache in a temp dir) is timed and
+reported separately, along with the first "after" epoch's rate with it
+included, since it is paid before the first epoch starts.
+
+Run from backend/:
+    python -m benchmarks.bench_training_data --count 5000 --epochs 2
+    python -m benchmarks.bench_training_data --model hf-internal-testing/tiny-random-distilbert
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath("."))
+
+import torch
+from torch.utils.data import DataLoader
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from benchmarks.bench_language_detect import SAMPLES
+from src.models.dataset import SentimentDataset
+from src.models.train_sentiment import build_dataloader
+from src.preprocess.generate_synthetic_headlines import SyntheticHeadlineGenerator
+
+
+def build_corpus(count: int, seed: int):
+    rng = random.Random(seed)
+    headlines = SyntheticHeadlineGenerator().generate_by_template(count, rng) + [text for _, text in SAMPLES]
+    return [
+        {"headline": rng.choice(headlines), "sentiment": rng.choice(["POS", "NEU", "NEG"])}
+        for _ in range(count)
+    ]
+
+
+def run_epoch(loader, model, optimizer) -> int:
+    seen = 0
+    for batch in loader:
+        seen += batch['labels'].shape[0]
+        if model is None:
+            continue
+        optimizer.zero_grad()
+        out = model(input_ids=batch['input_ids'], attention_mask=batch['attention_mask'], labels=batch['labels'])
+        out.loss.backward()
+        optimizer.step()
+    return seen
+
+
+def time_epochs(name: str, loader, model, optimizer, epochs: int, setup_seconds: float = 0.0):
+    """Examples/s per epoch; `setup_seconds` (one-off preparation) is also shown added to the first epoch."""
+    for epoch in range(epochs):
+        if hasattr(loader.batch_sampler, "set_epoch"):
+            loader.batch_sampler.set_epoch(epoch)
+        start = time.perf_counter()
+        seen = run_epoch(loader, model, optimizer)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>7} epoch {epoch + 1}: {seen / elapsed:8.1f} examples/s ({elapsed:.2f}s)")
+        if epoch == 0 and setup_seconds:
+            total = elapsed + setup_seconds
+            print(f"{name:>7} epoch 1 incl. setup: {seen / total:8.1f} examples/s ({total:.2f}s)")
+
+
+def run(args):
+    torch.manual_seed(args.seed)
+    data = build_corpus(args.count, args.seed)
+    tokenizer = AutoTokenizer.from_pretrained(args.model, use_fast=True)
+    model = None if args.data_only else AutoModelForSequenceClassification.from_pretrained(args.model, num_labels=3)
+    optimizer = None if model is None else torch.optim.AdamW(model.parameters(), lr=2e-5)
+    if model is not None:
+        model.train()
+
+    before = DataLoader(
+        SentimentDataset(data, tokenizer, max_len=args.max_len),
+        batch_size=args.batch_size,
+        shuffle=True
+    )
+    time_epochs("before", before, model, optimizer, args.epochs)
+
+    with tempfile.TemporaryDirectory() as cache_root:
+        start = time.perf_counter()
+        after = build_dataloader(
+            data, tokenizer,
+            batch_size=args.batch_size,
+            num_workers=args.num_workers,
+            max_len=args.max_len,
+            cache_root=cache_root,
+            seed=args.seed
+        )
+        tokenize_seconds = time.perf_counter() - start
+        print(f"  after tokenization (once, cached): {len(data) / tokenize_seconds:8.1f} examples/s ({tokenize_seconds:.2f}s)")
+        time_epochs("after", after, model, optimizer, args.epochs, setup_seconds=tokenize_seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Training input pipeline throughput.")
+    parser.add_argument("--model", default="distilbert-base-uncased")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-len", type=int, default=128)
+    parser.add_argument("--num-workers", type=int, default=2)
+    parser.add_argument("--data-only", action="store_true", help="Skip the model; time the input pipeline only.")
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
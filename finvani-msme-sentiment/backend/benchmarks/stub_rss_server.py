@@ -0,0 +1,94 @@
+"""
+Local stub of the Google News RSS endpoint for offline benchmarks.
+
+Serves a canned RSS document per (q, hl) with a strong ETag and Last-Modified,
+answers If-None-Match / If-Modified-Since with 304, and can add artificial
+latency to mimic a real round trip.
+"""
+import hashlib
+import threading
+import time
+import urllib.parse
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+LAST_MODIFIED = formatdate(timeval=1_700_000_000, usegmt=True)
+
+
+def render_feed(query: str, lang: str, items: int) -> bytes:
+    entries = []
+    for i in range(items):
+        title = escape(f"{query} headline {i} for {lang} - Stub Publisher")
+        entries.append(
+            "<item>"
+            f"<title>{title}</title>"
+            f"<link>https://example.com/{lang}/{urllib.parse.quote_plus(query)}/{i}</link>"
+            f"<pubDate>{formatdate(timeval=1_700_000_000 + i * 60, usegmt=True)}</pubDate>"
+            f"<description>&lt;a href=\"#\"&gt;{title}&lt;/a&gt;</description>"
+            '<source url="https://example.com">Stub Publisher</source>'
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0"><channel><title>Stub</title>'
+        + "".join(entries)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+class StubRSSServer:
+    """Threaded HTTP server running in the background; use as a context manager."""
+
+    def __init__(self, latency_ms: float = 0.0, items_per_feed: int = 20, port: int = 0):
+        self.latency_ms = latency_ms
+        self.items_per_feed = items_per_feed
+        self.requests = 0
+        self.not_modified = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                params = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+                query = params.get("q", [""])[0]
+                lang = params.get("hl", ["en-IN"])[0].split("-")[0]
+                body = render_feed(query, lang, server.items_per_feed)
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000.0)
+
+                if self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/rss/search"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,518 @@
+"""
+End-to-end benchmark suite with machine-readable results and regression checks.
+
+Runs fully offline: feeds come from the local stub RSS server and the model is
+a tiny randomly initialised one (benchmarks/tiny_model.py), so numbers measure
+our code paths rather than network or model quality. Sections:
+
+    ingestion  fetch_feed parse throughput (22 languages), dedup + JSONL append
+    news       /news/latest latency against data size and language, from the
+               article store (SQLite, the default) and from the JSONL files
+    predict    SentimentAnalyzer.predict / predict_batch against batch size and sequence length
+    api        p50/p99 of /analyze/ and /news/latest under concurrent load
+
+Results are written as JSON (--output). If a baseline exists (--baseline,
+default benchmarks/baseline.json) every metric is compared with it and the run
+exits with status 1 when one regressed by more than its tolerance. Baselines
+are machine-specific: record one on the machine that runs the check.
+benchmarks/example_results.json shows the results format (a --quick run).
+
+Run from backend/:
+    python -m benchmarks.suite --save-baseline          # on main
+    python -m benchmarks.suite                          # on the branch; fails on regressions
+    python -m benchmarks.suite --sections ingestion news --quick
+    python -m benchmarks.suite --sections news --news-paths db
+"""
+import argparse
+import datetime
+import hashlib
+import http.client
+import json
+import logging
+import math
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.abspath("."))
+
+# Before any src import: time the model instead of the prediction cache
+os.environ.setdefault("PREDICTION_CACHE_SIZE", "0")
+
+from benchmarks.bench_language_detect import SAMPLES
+from benchmarks.stub_rss_server import StubRSSServer
+from src.config import settings
+from src.ingestion.rss_google_news import GoogleNewsIngester, LANGUAGES
+from src.services.msme_relevance import get_relevance_scorer
+from src.services.ner_entities import get_entity_extractor
+
+SECTIONS = ("ingestion", "news", "predict", "api")
+# Where /news/latest reads from: the article store (the default) or the newest JSONL file
+NEWS_PATHS = ("db", "jsonl")
+BASELINE_PATH = os.path.join("benchmarks", "baseline.json")
+RESULTS_PATH = os.path.join("benchmarks", "results", "latest.json")
+# Relative change tolerated before a metric counts as regressed; tail latencies are noisier
+DEFAULT_TOLERANCE = 0.25
+TAIL_TOLERANCE = 0.5
+
+
+class Results:
+    """Flat metric name -> {value, unit, better, tolerance} plus free-form details per section."""
+
+    def __init__(self):
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self.details: Dict[str, Any] = {}
+
+    def add(self, name: str, value: float, unit: str, better: str = "lower", tolerance: Optional[float] = None):
+        self.metrics[name] = {"value": round(float(value), 4), "unit": unit, "better": better}
+        if tolerance is not None:
+            self.metrics[name]["tolerance"] = tolerance
+        print(f"  {name:<58} {value:12.3f} {unit}")
+
+    def add_latencies(self, prefix: str, latencies_ms: Sequence[float], elapsed: float):
+        self.add(f"{prefix}.p50_ms", percentile(latencies_ms, 50), "ms")
+        self.add(f"{prefix}.p99_ms", percentile(latencies_ms, 99), "ms", tolerance=TAIL_TOLERANCE)
+        self.add(f"{prefix}.requests_per_s", len(latencies_ms) / elapsed, "req/s", better="higher")
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(max(1, math.ceil(q / 100.0 * len(ordered))), len(ordered))
+    return ordered[rank - 1]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def synthetic_articles(count: int, seed: int = 0, day: str = "2026-01-01") -> List[Dict[str, Any]]:
+    """Article records shaped like the ingester's, across the SAMPLES languages, newest last."""
+    rng = random.Random(seed)
+    start = datetime.datetime.fromisoformat(day)
+    articles = []
+    for i in range(count):
+        lang, title = rng.choice(SAMPLES)
+        link = f"https://example.com/{lang}/{i}"
+        articles.append({
+            "source": "google_news",
+            "query": "MSME",
+            "language": lang,
+            "feed_language": lang,
+            "title": f"{title} #{i}",
+            "link": link,
+            "published": str(start + datetime.timedelta(seconds=i * 30)),
+            "summary": title,
+            "fetched_at": str(start),
+            "id": hashlib.md5(link.encode("utf-8")).hexdigest()
+        })
+    return articles
+
+
+# --- ingestion ---
+
+def bench_ingestion(results: Results, args):
+    print("ingestion")
+    relevance, entities = get_relevance_scorer(), get_entity_extractor()
+
+    def ingester(data_dir: str, base_url: Optional[str] = None) -> GoogleNewsIngester:
+        # Same enrichment as the API's ingester
+        return GoogleNewsIngester(
+            data_dir,
+            base_url=base_url,
+            relevance=relevance.score_batch,
+            entities=entities.extract_batch
+        )
+
+    with StubRSSServer(items_per_feed=args.items_per_feed) as server, tempfile.TemporaryDirectory() as tmp:
+        parsed, elapsed = 0, 0.0
+        for lang in LANGUAGES:
+            # A fresh ingester per feed: no validators (so no 304) and no dedup hits
+            feed_ingester = ingester(os.path.join(tmp, lang), server.base_url)
+            start = time.perf_counter()
+            parsed += len(feed_ingester.fetch_feed("MSME", lang))
+            elapsed += time.perf_counter() - start
+        results.add("ingestion.fetch_feed.articles_per_s", parsed / elapsed, "articles/s", better="higher")
+        results.add("ingestion.fetch_feed.ms_per_feed", elapsed / len(LANGUAGES) * 1e3, "ms")
+
+    articles = synthetic_articles(args.articles, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        first = ingester(tmp)
+        start = time.perf_counter()
+        unique = first._dedup(articles)
+        first.save_to_jsonl(unique)
+        elapsed = time.perf_counter() - start
+        results.add("ingestion.dedup_append.articles_per_s", len(unique) / elapsed, "articles/s", better="higher")
+
+        # A new run over the same articles: every id is answered by the on-disk dedup index
+        second = ingester(tmp)
+        start = time.perf_counter()
+        repeated = second._dedup(articles)
+        second.save_to_jsonl(repeated)
+        elapsed = time.perf_counter() - start
+        results.add("ingestion.dedup_duplicates.articles_per_s", len(articles) / elapsed, "articles/s", better="higher")
+        results.details["ingestion"] = {"articles": len(articles), "unique": len(unique), "repeated": len(repeated)}
+
+
+# --- model ---
+
+def texts_of_length(tokenizer, tokens: int, count: int, seed: int = 0) -> List[str]:
+    """`count` distinct mixed-language texts of about `tokens` tokens each (special tokens included)."""
+    rng = random.Random(seed)
+    words = " ".join(text for _, text in SAMPLES).split()
+    texts = []
+    for i in range(count):
+        ids: List[int] = []
+        while len(ids) < tokens:
+            ids += tokenizer(" ".join(rng.choice(words) for _ in range(16)), add_special_tokens=False)["input_ids"]
+        texts.append(f"{i} " + tokenizer.decode(ids[:max(tokens - 3, 1)]))
+    return texts
+
+
+def load_analyzer(model_path: str):
+    from src.models.infer import SentimentAnalyzer
+    return SentimentAnalyzer(model_path=model_path, backend="torch")
+
+
+def bench_predict(results: Results, args, model_path: str):
+    print("predict")
+    analyzer = load_analyzer(model_path)
+    for tokens in args.seq_lengths:
+        for batch_size in args.batch_sizes:
+            count = max(batch_size * 4, args.min_texts)
+            texts = texts_of_length(analyzer.tokenizer, tokens, count, args.seed)
+            # Warm-up pass (allocator, thread pools) on different texts
+            analyzer.predict_batch(texts[:batch_size], batch_size=batch_size)
+            start = time.perf_counter()
+            if batch_size == 1:
+                for text in texts:
+                    analyzer.predict(text)
+            else:
+                analyzer.predict_batch(texts, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            results.add(f"predict.len={tokens}.batch={batch_size}.ms_per_headline", elapsed / count * 1e3, "ms")
+
+
+# --- API ---
+
+class LocalAPIServer:
+    """The FastAPI app under uvicorn on a background thread, without startup events (no scheduler, no warmup)."""
+
+    def __init__(self, model_path: str):
+        import socket
+        import uvicorn
+        from src.api.main import app
+        from src.api.routers import analyze
+
+        # Same registry path as production, pointed at the benchmark model
+        analyze.ANALYZER.factory = lambda registry: load_analyzer(model_path)
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, lifespan="off", log_level="warning", access_log=False
+        ))
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        deadline = time.monotonic() + 30
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("API server did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+def run_requests(
+    port: int,
+    make_request: Callable[[int], Tuple[str, str, Optional[str]]],
+    total: int,
+    concurrency: int
+) -> Tuple[List[float], int, float]:
+    """
+    `total` requests from `concurrency` threads, each on its own keep-alive connection.
+    make_request(i) returns (method, path, body or None). Returns (latencies in ms, errors, seconds).
+    """
+    per_worker = [list(range(w, total, concurrency)) for w in range(concurrency)]
+
+    def worker(indexes: List[int]):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        latencies, errors = [], 0
+        for i in indexes:
+            method, path, body = make_request(i)
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            start = time.perf_counter()
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            latencies.append((time.perf_counter() - start) * 1e3)
+            errors += response.status >= 400
+        connection.close()
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(worker, per_worker))
+    elapsed = time.perf_counter() - start
+    return [ms for latencies, _ in outcomes for ms in latencies], sum(errors for _, errors in outcomes), elapsed
+
+
+def write_data_file(data_dir: str, name: str, articles: List[Dict[str, Any]]):
+    with open(os.path.join(data_dir, name), "w", encoding="utf-8") as f:
+        for article in articles:
+            f.write(json.dumps(article, ensure_ascii=False) + "\n")
+
+
+def use_article_store(workdir: str):
+    """Serve /news/latest from a fresh SQLite article store under `workdir`, migrated to head."""
+    from src.db import database
+    engine = database.make_engine(f"sqlite:///{os.path.join(workdir, 'data', 'processed', 'finvani.db')}")
+    database.init_db(engine)
+    database.SessionLocal.configure(bind=engine)
+    settings.ARTICLE_STORE_ENABLED = True
+    return engine
+
+
+def next_cursor(port: int, path: str) -> Optional[str]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        return response.getheader("X-Next-Cursor")
+    finally:
+        connection.close()
+
+
+def time_latest(results: Results, args, server: LocalAPIServer, prefix: str, langs: Sequence[Optional[str]]):
+    """Uncached and cached p50 of /news/latest per language."""
+    from src.api.routers import news
+
+    for lang in langs:
+        path = "/news/latest" + (f"?lang={lang}" if lang else "")
+        label = lang or "all"
+
+        def uncached(i):
+            news.NEWS_CACHE.invalidate()
+            return "GET", path, None
+
+        latencies, _, _ = run_requests(server.port, uncached, args.news_requests, 1)
+        results.add(f"{prefix}.lang={label}.uncached_p50_ms", percentile(latencies, 50), "ms")
+        latencies, _, _ = run_requests(server.port, lambda i: ("GET", path, None), args.news_requests, 1)
+        results.add(f"{prefix}.lang={label}.cached_p50_ms", percentile(latencies, 50), "ms")
+
+
+def bench_news(results: Results, args, server: LocalAPIServer, workdir: str):
+    print("news")
+    from src.api.routers import news
+    from src.db import crud
+
+    langs = [None] + sorted({lang for lang, _ in SAMPLES})[:args.news_languages]
+    data_dir = os.path.join(workdir, "data", "raw")
+    if "jsonl" in args.news_paths:
+        settings.ARTICLE_STORE_ENABLED = False
+        for day, size in enumerate(args.file_sizes, start=1):
+            # A newer file per size: /news/latest always serves the newest one
+            write_data_file(data_dir, f"2026-01-{day:02d}.jsonl", synthetic_articles(size, args.seed))
+            news.NEWS_CACHE.invalidate()
+            latencies, _, _ = run_requests(server.port, lambda i: ("GET", "/news/latest", None), 1, 1)
+            # First request after a new file builds its sidecar index
+            results.add(f"news.jsonl.size={size}.first_request_ms", latencies[0], "ms")
+            time_latest(results, args, server, f"news.jsonl.size={size}", langs)
+
+    if "db" in args.news_paths:
+        engine = use_article_store(workdir)
+        for size in args.file_sizes:
+            # Same article ids across sizes, so the store grows to `size` rows
+            articles = synthetic_articles(size, args.seed)
+            start = time.perf_counter()
+            crud.upsert_articles(engine, articles)
+            results.add(f"news.db.size={size}.upsert_articles_per_s", size / (time.perf_counter() - start),
+                        "articles/s", better="higher")
+            news.NEWS_CACHE.invalidate()
+            time_latest(results, args, server, f"news.db.size={size}", langs)
+
+            # Keyset paging: the second page, addressed by the first page's cursor (never cached)
+            cursor = next_cursor(server.port, "/news/latest")
+            if cursor:
+                path = f"/news/latest?cursor={cursor}"
+                latencies, _, _ = run_requests(server.port, lambda i: ("GET", path, None), args.news_requests, 1)
+                results.add(f"news.db.size={size}.next_page_p50_ms", percentile(latencies, 50), "ms")
+
+
+def bench_api(results: Results, args, server: LocalAPIServer):
+    print("api")
+    from src.api.routers import analyze
+
+    analyze.ANALYZER.get()
+    results.details["api_model"] = analyze.ANALYZER.status()
+    texts = [text for _, text in SAMPLES]
+
+    def analyze_request(i):
+        # Distinct texts so nothing is served from a cache
+        return "POST", "/analyze/", json.dumps({"text": f"{texts[i % len(texts)]} #{i}"})
+
+    endpoints = {
+        "analyze": analyze_request,
+        "news_latest": lambda i: ("GET", "/news/latest?lang=hi", None)
+    }
+    for name, make_request in endpoints.items():
+        for concurrency in args.concurrency:
+            latencies, errors, elapsed = run_requests(server.port, make_request, args.api_requests, concurrency)
+            results.add_latencies(f"api.{name}.c={concurrency}", latencies, elapsed)
+            if errors:
+                results.add(f"api.{name}.c={concurrency}.errors", errors, "requests")
+
+
+# --- baseline ---
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print current vs baseline per shared metric; returns the names of regressed metrics."""
+    regressions = []
+    print(f"\n{'metric':<58} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, metric in current["metrics"].items():
+        base = baseline.get("metrics", {}).get(name)
+        if base is None or not base["value"]:
+            continue
+        change = (metric["value"] - base["value"]) / base["value"]
+        allowed = max(metric.get("tolerance", 0.0), tolerance)
+        worse = change > allowed if metric["better"] == "lower" else change < -allowed
+        if worse:
+            regressions.append(name)
+        print(f"{name:<58} {base['value']:12.3f} {metric['value']:12.3f} {change:+7.1%}{'  REGRESSION' if worse else ''}")
+    missing = sorted(set(baseline.get("metrics", {})) - set(current["metrics"]))
+    if missing:
+        print(f"({len(missing)} baseline metrics not measured in this run)")
+    return regressions
+
+
+def write_json(path: str, data: Dict[str, Any]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def run(args) -> int:
+    logging.getLogger().setLevel(logging.WARNING)
+    results = Results()
+    backend_dir = os.path.abspath(".")
+    output, baseline_path = os.path.abspath(args.output), os.path.abspath(args.baseline)
+
+    workdir = tempfile.mkdtemp(prefix="finvani-bench-")
+    try:
+        if "ingestion" in args.sections:
+            bench_ingestion(results, args)
+
+        model_path = args.model_path
+        if model_path is None and set(args.sections) & {"predict", "api"}:
+            from benchmarks.tiny_model import build_tiny_model
+            model_path = build_tiny_model(os.path.join(workdir, "tiny-model"), seed=args.seed)
+        if "predict" in args.sections:
+            bench_predict(results, args, model_path)
+
+        if set(args.sections) & {"news", "api"}:
+            # The API resolves data/raw and data/processed against the working directory
+            data_dir = os.path.join(workdir, "data", "raw")
+            os.makedirs(data_dir)
+            os.chdir(workdir)
+            try:
+                with LocalAPIServer(model_path or "model_output") as server:
+                    if "news" in args.sections:
+                        bench_news(results, args, server, workdir)
+                    if "api" in args.sections:
+                        if "news" not in args.sections:
+                            from src.db import crud
+                            # /news/latest under load reads from the default path, the article store
+                            crud.upsert_articles(use_article_store(workdir), synthetic_articles(args.file_sizes[0], args.seed))
+                        bench_api(results, args, server)
+            finally:
+                os.chdir(backend_dir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sections": list(args.sections),
+            "model": args.model_path or "tiny-random",
+            "news_paths": list(args.news_paths)
+        },
+        "metrics": results.metrics,
+        "details": results.details
+    }
+    write_json(output, report)
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        write_json(baseline_path, report)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --save-baseline to record one.")
+        return 0
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("cpus") != report["meta"]["cpus"]:
+        print("Warning: baseline was recorded on a machine with a different CPU count.")
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed beyond tolerance: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline end-to-end benchmarks with baseline comparison.")
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--output", default=RESULTS_PATH, help="Where this run's JSON results go")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Relative change allowed before a metric counts as regressed")
+    parser.add_argument("--model-path", help="Benchmark this model directory instead of the tiny random one")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--items-per-feed", type=int, default=100)
+    parser.add_argument("--articles", type=int, default=20000, help="Articles for dedup + append")
+    parser.add_argument("--file-sizes", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="Articles per data file for /news/latest")
+    parser.add_argument("--news-paths", nargs="+", choices=NEWS_PATHS, default=list(NEWS_PATHS),
+                        help="Where /news/latest reads from: the article store, the JSONL files, or both")
+    parser.add_argument("--news-languages", type=int, default=3, help="Languages timed per file size (plus all)")
+    parser.add_argument("--news-requests", type=int, default=30)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--seq-lengths", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--min-texts", type=int, default=64, help="Minimum headlines timed per predict setting")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--api-requests", type=int, default=400, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.quick:
+        args.items_per_feed, args.articles, args.file_sizes = 20, 2000, [1000, 5000]
+        args.news_requests, args.api_requests, args.min_texts = 10, 100, 16
+        args.batch_sizes, args.seq_lengths, args.concurrency = [1, 32], [16, 128], [1, 8]
+    sys.exit(run(args))
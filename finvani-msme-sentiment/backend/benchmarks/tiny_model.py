@@ -0,0 +1,80 @@
+"""
+Tiny randomly initialised sentiment model for offline benchmarks.
+
+Builds an XLM-R-shaped model directory (SentencePiece-Unigram tokenizer trained
+on the benchmark headlines, a couple of small encoder layers, three labels)
+without downloading anything. SentimentAnalyzer loads it like model_output/.
+Predictions are meaningless; only the code paths and their cost are real.
+"""
+import os
+import random
+from typing import List
+
+import torch
+from tokenizers import Tokenizer, decoders, models, normalizers, pre_tokenizers, processors, trainers
+from transformers import PreTrainedTokenizerFast, XLMRobertaConfig, XLMRobertaForSequenceClassification
+
+from benchmarks.bench_language_detect import SAMPLES
+from src.preprocess.generate_synthetic_headlines import SyntheticHeadlineGenerator
+
+SPECIAL_TOKENS = ["<s>", "<pad>", "</s>", "<unk>", "<mask>"]
+ID2LABEL = {0: "NEGATIVE", 1: "NEUTRAL", 2: "POSITIVE"}
+
+
+def training_texts(count: int = 2000, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return SyntheticHeadlineGenerator().generate_by_template(count, rng) + [text for _, text in SAMPLES] * 20
+
+
+def build_tiny_model(
+    output_dir: str,
+    vocab_size: int = 2000,
+    hidden_size: int = 64,
+    layers: int = 2,
+    heads: int = 4,
+    seed: int = 0
+) -> str:
+    """Write the tiny model and tokenizer to `output_dir` (reused if it already exists). Returns the path."""
+    if os.path.exists(os.path.join(output_dir, "config.json")):
+        return output_dir
+
+    backend = Tokenizer(models.Unigram())
+    backend.normalizer = normalizers.NFKC()
+    backend.pre_tokenizer = pre_tokenizers.Metaspace()
+    backend.decoder = decoders.Metaspace()
+    backend.train_from_iterator(
+        training_texts(seed=seed),
+        trainers.UnigramTrainer(vocab_size=vocab_size, special_tokens=SPECIAL_TOKENS, unk_token="<unk>")
+    )
+    bos, eos = backend.token_to_id("<s>"), backend.token_to_id("</s>")
+    backend.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>",
+        pair="<s> $A </s> </s> $B </s>",
+        special_tokens=[("<s>", bos), ("</s>", eos)]
+    )
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend,
+        bos_token="<s>", eos_token="</s>", cls_token="<s>", sep_token="</s>",
+        pad_token="<pad>", unk_token="<unk>", mask_token="<mask>",
+        model_max_length=512
+    )
+
+    config = XLMRobertaConfig(
+        vocab_size=len(tokenizer),
+        hidden_size=hidden_size,
+        num_hidden_layers=layers,
+        num_attention_heads=heads,
+        intermediate_size=hidden_size * 4,
+        max_position_embeddings=514,
+        pad_token_id=tokenizer.pad_token_id,
+        bos_token_id=bos,
+        eos_token_id=eos,
+        num_labels=len(ID2LABEL),
+        id2label=ID2LABEL,
+        label2id={label: i for i, label in ID2LABEL.items()}
+    )
+    torch.manual_seed(seed)
+    model = XLMRobertaForSequenceClassification(config)
+    model.save_pretrained(output_dir, safe_serialization=True)
+    tokenizer.save_pretrained(output_dir)
+    return output_dir
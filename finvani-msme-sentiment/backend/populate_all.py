@@ -6,6 +6,8 @@ from pathlib import Path
 sys.path.append(os.path.abspath("."))
 
 from src.ingestion.rss_google_news import GoogleNewsIngester, LANGUAGES
+from src.config import settings
+from src.db import crud, database
 
 def run():
     print("Starting full ingestion for 22 languages...")
@@ -24,7 +26,21 @@ def run():
     base_path = Path("../data/raw").resolve()
     print(f"Saving data to: {base_path}")
     
-    ingester = GoogleNewsIngester(str(base_path))
+    on_saved = None
+    if settings.ARTICLE_STORE_ENABLED:
+        database.init_db()
+        on_saved = [lambda articles: crud.upsert_articles(database.engine, articles)]
+
+    ingester = GoogleNewsIngester(
+        str(base_path),
+        max_workers=settings.INGESTION_MAX_WORKERS,
+        per_host_limit=settings.INGESTION_PER_HOST_LIMIT,
+        max_retries=settings.INGESTION_MAX_RETRIES,
+        retention_days=settings.DEDUP_RETENTION_DAYS,
+        flush_every=settings.INGESTION_FLUSH_EVERY,
+        fsync=settings.INGESTION_FSYNC,
+        on_saved=on_saved
+    )
     ingester.run_ingestion(queries, LANGUAGES)
     print("Full ingestion complete.")
 
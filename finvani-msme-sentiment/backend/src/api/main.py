@@ -1,7 +1,20 @@
+import time
+_IMPORT_START = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
-from src.api.routers import analyze, news
+import threading
+from src.api.routers import analyze, news, aggregates
+from src.config import settings
+from src.db import database
+from src.models.registry import peak_rss_mb
+
+# Startup timings reported by /ready; importing the app must not load any model
+STARTUP = {"import_seconds": round(time.perf_counter() - _IMPORT_START, 3), "import_peak_rss_mb": peak_rss_mb()}
+# Article store migration, reported by /ready: disabled, migrating, ready or failed
+STORE = {"state": "disabled" if not settings.ARTICLE_STORE_ENABLED else "idle", "error": None, "seconds": None}
 
 app = FastAPI(title="FinVani API")
 
@@ -28,23 +41,83 @@ app.add_middleware(
 # Include Routers
 app.include_router(analyze.router)
 app.include_router(news.router)
+app.include_router(aggregates.router)
 
 @app.on_event("startup")
 async def startup_event():
-    print("🚀 Triggering initial news ingestion on startup...")
+    startup_start = time.perf_counter()
+    if settings.MODEL_WARMUP == "background":
+        # Weights load on their own thread; /health answers meanwhile and /ready reports progress.
+        # The scoring worker starts once the model is ready and the article store is migrated.
+        analyze.ANALYZER.warmup()
+        print("⏳ Sentiment model warming up in the background.")
+    if settings.ARTICLE_STORE_ENABLED:
+        # The first migration imports every JSONL file, so it runs off the event loop;
+        # /ready answers 503 until it is done and the store's writers start after it
+        STORE["state"] = "migrating"
+        threading.Thread(target=_migrate_store, name="article-store-migration", daemon=True).start()
+        print("⏳ Article store migrating in the background.")
+    else:
+        _start_scheduler()
+    STARTUP["startup_seconds"] = round(time.perf_counter() - startup_start, 3)
+
+def _migrate_store():
+    start = time.perf_counter()
+    try:
+        # Creates the schema on first boot and imports the existing JSONL files once
+        database.init_db()
+        # Then replays anything appended since the last synced watermark (writes that failed
+        # or were still pending at shutdown)
+        news.catch_up_store()
+        STORE["state"] = "ready"
+        print("✅ Article store is up to date.")
+    except Exception as e:
+        STORE["state"], STORE["error"] = "failed", str(e)
+        print(f"❌ Article store migration failed: {e}")
+    STORE["seconds"] = round(time.perf_counter() - start, 3)
+    # Ingestion and scoring still run on a failed migration: the JSONL files stay the source of truth
+    news.store_ready(migrated=STORE["state"] == "ready")
+    _start_scheduler()
+
+def _start_scheduler():
+    print("🚀 Starting ingestion scheduler (first run starts immediately)...")
     try:
-        from src.api.routers.news import run_ingestion_task
-        # Run directly (blocking) or in background? 
-        # For startup, blocking safely ensures data is ready before first request.
-        # But for faster boot, we can background it. 
-        # Given Railway 512MB limit, safer to background it so health check passes fast.
-        import threading
-        t = threading.Thread(target=run_ingestion_task)
-        t.start()
-        print("✅ Background ingestion thread started.")
+        # Runs on the scheduler's own thread so the health check passes fast
+        # (Railway 512MB limit); later runs are spaced per feed.
+        news.SCHEDULER.start()
+        print("✅ Ingestion scheduler started.")
     except Exception as e:
-        print(f"❌ Startup ingestion failed: {e}")
+        print(f"❌ Starting ingestion scheduler failed: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    news.SCHEDULER.stop(timeout=5)
+    if news.SCORER is not None:
+        news.SCORER.stop(timeout=5)
+    # Counters are snapshotted on a timer; persist whatever the last interval added
+    aggregates.AGGREGATES.close()
+    await analyze.BATCHER.stop()
 
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up and serving, whether or not the model has loaded."""
     return {"status": "ok"}
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness: 200 once the sentiment model is loaded and the article store is migrated,
+    503 while either is in progress or after either failed.
+    """
+    store_ok = STORE["state"] in ("disabled", "ready")
+    if not analyze.ANALYZER.ready:
+        status = analyze.ANALYZER.state
+    else:
+        status = "ready" if store_ok else f"store_{STORE['state']}"
+    body = {
+        "status": status,
+        "model": analyze.ANALYZER.status(),
+        "article_store": dict(STORE),
+        "startup": STARTUP
+    }
+    return JSONResponse(body, status_code=200 if analyze.ANALYZER.ready and store_ok else 503)
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (file name, mtime_ns, size) of the newest data file
+FileState = Tuple[str, int, int]
+
+
+class NewsResponseCache:
+    """
+    In-process cache for /news responses.
+
+    Entries are keyed on the newest data file's (name, mtime, size) plus the
+    request parameters. The filesystem is consulted at most once every
+    `revalidate_seconds` (to notice writes from other processes such as
+    populate_all.py); in-process ingestion calls `invalidate()` when it
+    finishes, so new data is visible immediately.
+
+    Pages served from the article store have no file to key on: they are kept
+    for at most `revalidate_seconds` and dropped by `invalidate()`, which the
+    ingester and scoring worker call after every write to the store.
+    """
+
+    def __init__(self, revalidate_seconds: float = 30.0):
+        self.revalidate_seconds = revalidate_seconds
+        self._lock = threading.Lock()
+        self._file_state: Optional[FileState] = None
+        self._file_path: Optional[Path] = None
+        self._checked_at = 0.0
+        # (file_state, request params) -> (json body, strong etag)
+        self._responses: Dict[Tuple[FileState, Hashable], Tuple[bytes, str]] = {}
+        # (file_state, lang) -> pre-parsed article pool for randomize=true
+        self._pools: Dict[Tuple[FileState, Optional[str]], List[Dict[str, Any]]] = {}
+        # request params -> (stored at, json body, strong etag, next-page cursor) for article-store pages
+        self._store_responses: Dict[Hashable, Tuple[float, bytes, str, Optional[str]]] = {}
+        # Bumped by invalidate(); a store page loaded across an invalidation is not kept
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def invalidate(self):
+        """Drop everything; the next request re-resolves the newest file."""
+        with self._lock:
+            self._responses.clear()
+            self._pools.clear()
+            self._store_responses.clear()
+            self._generation += 1
+            self._file_state = None
+            self._file_path = None
+            self._checked_at = 0.0
+            self.invalidations += 1
+
+    def current_file(self, resolve: Callable[[], Optional[Path]]) -> Tuple[Optional[Path], Optional[FileState]]:
+        """Newest data file and its state, re-checked on disk only when the revalidation window expired."""
+        now = time.monotonic()
+        with self._lock:
+            if self._file_state is not None and now - self._checked_at < self.revalidate_seconds:
+                return self._file_path, self._file_state
+
+        path = resolve()
+        state = None
+        if path is not None:
+            stat = path.stat()
+            state = (path.name, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            if state != self._file_state:
+                # New file or new writes: older entries can never be served again
+                self._responses.clear()
+                self._pools.clear()
+            self._file_path, self._file_state, self._checked_at = path, state, now
+        return path, state
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+    def get_response(
+        self,
+        state: FileState,
+        params: Hashable,
+        load: Callable[[], List[Dict[str, Any]]]
+    ) -> Tuple[bytes, str]:
+        """Serialised JSON body and ETag for a non-random listing with the given request params."""
+        key = (state, params)
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+        body = json.dumps(load(), ensure_ascii=False).encode("utf-8")
+        entry = (body, self.make_etag(body))
+        with self._lock:
+            self.misses += 1
+            if self._file_state == state:
+                self._responses[key] = entry
+        return entry
+
+    def get_pool(
+        self,
+        state: FileState,
+        lang: Optional[str],
+        load: Callable[[], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Pre-parsed pool of recent articles to sample from for randomize=true."""
+        key = (state, lang)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self.hits += 1
+                return pool
+
+        pool = load()
+        with self._lock:
+            self.misses += 1
+            if self._file_state == state:
+                self._pools[key] = pool
+        return pool
+
+    async def get_store_response(
+        self,
+        params: Hashable,
+        load: Callable[[], Awaitable[Tuple[bytes, Optional[str]]]]
+    ) -> Tuple[bytes, str, Optional[str]]:
+        """Body, ETag and next-page cursor of an article-store page with the given request params."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._store_responses.get(params)
+            if cached is not None and now - cached[0] < self.revalidate_seconds:
+                self.hits += 1
+                return cached[1:]
+            generation = self._generation
+
+        body, next_cursor = await load()
+        entry = (body, self.make_etag(body), next_cursor)
+        with self._lock:
+            self.misses += 1
+            if self._generation == generation:
+                self._store_responses[params] = (now,) + entry
+        return entry
+
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        if not if_none_match:
+            return False
+        candidates = [c.strip() for c in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "file": self._file_state[0] if self._file_state else None,
+            "responses": len(self._responses),
+            "pools": len(self._pools),
+            "store_responses": len(self._store_responses),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations
+        }
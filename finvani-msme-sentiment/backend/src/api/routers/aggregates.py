@@ -1 +1,70 @@
-# Todo: Implement
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from pathlib import Path
+from typing import List, Dict, Any
+import datetime
+import logging
+from src.services.aggregates import SentimentAggregates, GRANULARITIES
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/aggregates",
+    tags=["aggregates"]
+)
+
+def get_processed_dir() -> Path:
+    # Same convention as news.get_data_dir: relative to the working directory (/app in Docker)
+    return Path("data/processed").resolve()
+
+# Running counters, updated from the scored-article stream and snapshotted to disk
+AGGREGATES = SentimentAggregates(
+    get_processed_dir() / "sentiment",
+    snapshot_path=get_processed_dir() / "aggregates.json"
+)
+
+# Longest look-back a request may ask for
+MAX_DAYS = 365
+
+def _since(days: int, granularity: str = "day") -> str:
+    start = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+    return start.strftime("%Y-%m-%dT%H:00" if granularity == "hour" else "%Y-%m-%d")
+
+@router.get("/timeseries", response_model=List[Dict[str, Any]])
+async def get_timeseries(
+    granularity: str = "day",
+    days: int = Query(30, ge=1, le=MAX_DAYS),
+    language: str = None,
+    query: str = None
+):
+    """Sentiment counts per hour/day bucket, optionally for one language and/or query."""
+    if granularity not in GRANULARITIES:
+        raise HTTPException(status_code=422, detail=f"granularity must be one of {list(GRANULARITIES)}")
+    # Queries may refresh from disk (and wait for the scorer's refresh), so they run off the event loop
+    return await run_in_threadpool(
+        AGGREGATES.timeseries,
+        granularity,
+        since=_since(days, granularity),
+        language=language,
+        query=query
+    )
+
+@router.get("/by-language", response_model=List[Dict[str, Any]])
+async def get_by_language(days: int = Query(7, ge=1, le=MAX_DAYS), query: str = None):
+    """Sentiment breakdown per language over the last `days` days."""
+    return await run_in_threadpool(AGGREGATES.by_language, since=_since(days), query=query)
+
+@router.get("/by-query", response_model=List[Dict[str, Any]])
+async def get_by_query(days: int = Query(7, ge=1, le=MAX_DAYS), language: str = None):
+    """Sentiment breakdown per ingestion query (sector) over the last `days` days."""
+    return await run_in_threadpool(AGGREGATES.by_query, since=_since(days), language=language)
+
+@router.get("/by-sector", response_model=List[Dict[str, Any]])
+async def get_by_sector(days: int = Query(7, ge=1, le=MAX_DAYS)):
+    """Sentiment breakdown per sector mentioned in the headlines over the last `days` days."""
+    return await run_in_threadpool(AGGREGATES.by_sector, since=_since(days))
+
+@router.get("/heatmap", response_model=List[Dict[str, Any]])
+async def get_heatmap(days: int = Query(7, ge=1, le=MAX_DAYS)):
+    """Sentiment per Indian state over the last `days` days."""
+    return await run_in_threadpool(AGGREGATES.heatmap, since=_since(days))
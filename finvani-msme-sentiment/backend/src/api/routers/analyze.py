@@ -1,6 +1,10 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from src.models.infer import SentimentAnalyzer
+from typing import List
+import asyncio
+from src.models.registry import ModelRegistry
+from src.services.micro_batcher import MicroBatcher
+from src.config import settings
 import logging
 
 # Configure Logging
@@ -11,14 +15,32 @@ router = APIRouter(
     tags=["analyze"]
 )
 
-# Instantiate the analyzer once at module level to keep model in memory
-try:
-    # Instantiate the analyzer using the default model (XLM-RoBERTa)
-    ANALYZER = SentimentAnalyzer()
-    logger.info("SentimentAnalyzer initialized successfully with default model (XLM-RoBERTa).")
-except Exception as e:
-    logger.error(f"Failed to initialize SentimentAnalyzer: {e}")
-    ANALYZER = None
+def _load_analyzer(registry: ModelRegistry):
+    # Deferred so importing the API does not pull in torch/transformers
+    with registry.timed("import"):
+        from src.models.infer import SentimentAnalyzer
+    with registry.timed("load"):
+        # Default model (XLM-RoBERTa), kept in memory once loaded
+        return SentimentAnalyzer()
+
+# Loaded by the startup warmup (or the first request), never at import time
+ANALYZER = ModelRegistry("sentiment", _load_analyzer)
+
+# Concurrent /analyze/ calls are gathered into one forward pass off the event loop
+BATCHER = MicroBatcher(
+    lambda texts, **kwargs: ANALYZER.get().predict_batch(texts, **kwargs),
+    max_batch_size=settings.BATCH_MAX_SIZE,
+    max_wait_ms=settings.BATCH_MAX_WAIT_MS
+)
+
+async def _require_model():
+    """Wait off the event loop for the model (loading it if needed); 503 if it cannot load."""
+    if ANALYZER.ready:
+        return
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, ANALYZER.get)
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Sentiment model is not available: {e}")
 
 class AnalysisRequest(BaseModel):
     text: str
@@ -27,14 +49,49 @@ class AnalysisResponse(BaseModel):
     label: str
     score: float
 
+# Upper bound on headlines per /analyze/batch call so one request cannot pin the CPU
+MAX_BATCH_TEXTS = 512
+
+class BatchAnalysisRequest(BaseModel):
+    texts: List[str]
+    batch_size: int = 32
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[AnalysisResponse]
+
 @router.post("/", response_model=AnalysisResponse)
 async def analyze_headline(request: AnalysisRequest):
-    if ANALYZER is None:
-        raise HTTPException(status_code=503, detail="Sentiment model is not initialized.")
-    
+    await _require_model()
+
     try:
-        result = ANALYZER.predict(request.text)
+        result = await BATCHER.submit(request.text)
         return AnalysisResponse(label=result["label"], score=result["score"])
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/batch", response_model=BatchAnalysisResponse)
+async def analyze_batch(request: BatchAnalysisRequest):
+    if len(request.texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_TEXTS} texts per batch.")
+    if request.batch_size < 1:
+        raise HTTPException(status_code=422, detail="batch_size must be >= 1")
+    await _require_model()
+
+    try:
+        results = await BATCHER.submit_many(request.texts, batch_size=request.batch_size)
+        return BatchAnalysisResponse(
+            results=[AnalysisResponse(label=r["label"], score=r["score"]) for r in results]
+        )
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats")
+async def get_batcher_stats():
+    """Micro-batcher queue depth, batch-size histogram, wait times and prediction cache counters."""
+    stats = BATCHER.stats()
+    analyzer = ANALYZER.peek()
+    stats["cache"] = analyzer.cache.stats() if analyzer is not None and analyzer.cache is not None else None
+    stats["model"] = ANALYZER.status()
+    return stats
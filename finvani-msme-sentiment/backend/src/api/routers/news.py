@@ -1,10 +1,25 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+import datetime
 import json
 import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from src.ingestion.rss_google_news import GoogleNewsIngester, LANGUAGES
+from src.ingestion.news_index import get_news_index
+from src.ingestion.scheduler import IngestionScheduler
+from src.ingestion.scorer import ScoredSentimentReader, SentimentScorer
+from src.api.routers import analyze, aggregates
+from src.api.response_cache import NewsResponseCache
+from src.services.msme_relevance import get_relevance_scorer
+from src.services.ner_entities import get_entity_extractor
+from src.db import crud, database
+from src.db.sync import StoreSync
+from src.models.registry import ModelRegistry, ModelUnavailable
+from src.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +28,9 @@ router = APIRouter(
     tags=["news"]
 )
 
+# Rendered /news/latest responses; invalidated whenever an ingestion run finishes
+NEWS_CACHE = NewsResponseCache(revalidate_seconds=settings.NEWS_CACHE_REVALIDATE_SECONDS)
+
 def get_data_dir() -> Path:
     # We are in /app in Docker.
     # Safe way: use relative path from current working directory
@@ -33,19 +51,145 @@ def get_latest_data_file() -> Path | None:
     files.sort(key=lambda x: x.name, reverse=True)
     return files[0]
 
-def run_ingestion_task():
-    logger.info("Starting background ingestion task...")
+# Mirrors the JSONL files into the article store from persisted watermarks, so a failed
+# write is replayed by the next pass instead of leaving the store behind for good
+STORE_SYNC = StoreSync(
+    database.engine,
+    get_data_dir(),
+    aggregates.get_processed_dir() / "sentiment",
+    state_path=aggregates.get_processed_dir() / "store_sync.json",
+    retries=settings.STORE_SYNC_RETRIES
+) if settings.ARTICLE_STORE_ENABLED else None
+# Set once the store schema is migrated; until then (or after a failed migration) nothing is synced
+STORE_MIGRATED = threading.Event()
+
+def _sync_store(sync: str) -> None:
+    if STORE_MIGRATED.is_set():
+        getattr(STORE_SYNC, sync)()
+
+def catch_up_store() -> None:
+    """Replay whatever the store missed before the last shutdown (or never had); run after the migration."""
+    counts = STORE_SYNC.sync()
+    logger.info(f"Article store caught up: {counts['articles']} articles, {counts['sentiment']} sentiment records.")
+
+# Built once at startup and shared by every ingestion run and the scoring worker
+RELEVANCE = get_relevance_scorer()
+ENTITIES = get_entity_extractor()
+
+def build_ingester() -> GoogleNewsIngester:
+    return GoogleNewsIngester(
+        str(get_data_dir()),
+        max_workers=settings.INGESTION_MAX_WORKERS,
+        per_host_limit=settings.INGESTION_PER_HOST_LIMIT,
+        max_retries=settings.INGESTION_MAX_RETRIES,
+        retention_days=settings.DEDUP_RETENTION_DAYS,
+        flush_every=settings.INGESTION_FLUSH_EVERY,
+        fsync=settings.INGESTION_FSYNC,
+        # Each flushed batch is bulk-upserted into the article store; cached store pages are then stale
+        on_saved=[
+            lambda articles: _sync_store("sync_articles"),
+            lambda articles: NEWS_CACHE.invalidate()
+        ] if settings.ARTICLE_STORE_ENABLED else None,
+        relevance=RELEVANCE.score_batch,
+        entities=ENTITIES.extract_batch
+    )
+
+# Single owner of ingestion runs: startup, periodic polling and /news/refresh all go through it
+SCHEDULER = IngestionScheduler(
+    build_ingester,
+    settings.INGESTION_QUERIES,
+    # Limited to top languages by default to prevent CPU freeze on free tier
+    settings.INGESTION_LANGUAGES,
+    base_interval=settings.INGESTION_BASE_INTERVAL_SECONDS,
+    min_interval=settings.INGESTION_MIN_INTERVAL_SECONDS,
+    max_interval=settings.INGESTION_MAX_INTERVAL_SECONDS,
+    # Each run also retries any store writes that failed since the last one
+    on_complete=([lambda progress: _sync_store("sync")] if settings.ARTICLE_STORE_ENABLED else []) + [
+        lambda progress: NEWS_CACHE.invalidate()
+    ]
+)
+
+# Precomputed sentiment for /news/latest, read from the scoring worker's companion files
+SENTIMENT = ScoredSentimentReader(aggregates.get_processed_dir() / "sentiment")
+
+def _predict_on_batcher(texts: List[str]) -> List[Dict[str, Any]]:
+    # Share the micro-batcher's thread so background scoring never competes with /analyze for the CPU
+    return analyze.BATCHER.executor.submit(analyze.BATCHER.predict_batch, texts).result()
+
+def _load_zero_shot(registry: ModelRegistry):
+    # Deferred like the sentiment model; only loaded when ZERO_SHOT_SECTORS is on
+    with registry.timed("import"):
+        from src.models.zero_shot import ZeroShotClassifier
+    with registry.timed("load"):
+        return ZeroShotClassifier()
+
+# Sector fallback for headlines the gazetteer finds no sector in; loaded on the scoring thread
+ZERO_SHOT = ModelRegistry("zero_shot", _load_zero_shot)
+
+def _zero_shot_sectors(headlines: List[str]) -> List[List[str]]:
+    # A failed load is not retried for every chunk; gazetteer sectors are still stored
+    if ZERO_SHOT.state == ZERO_SHOT.FAILED:
+        return [[] for _ in headlines]
     try:
-        data_dir = get_data_dir()
-        ingester = GoogleNewsIngester(str(data_dir))
-        queries = ["MSME", "SME India", "Business Loan", "Economy"]
-        # Limit startup ingestion to top languages to prevent CPU freeze on free tier
-        # Full list available via manual trigger if needed
-        startup_langs = ["en", "hi", "ta"] 
-        ingester.run_ingestion(queries, startup_langs)
-        logger.info("Background ingestion task completed.")
-    except Exception as e:
-        logger.error(f"Background ingestion failed: {e}")
+        classifier = ZERO_SHOT.get()
+    except ModelUnavailable:
+        return [[] for _ in headlines]
+    return classifier.tag_batch(headlines, min_score=settings.ZERO_SHOT_MIN_SCORE)
+
+def build_scorer(model_version: str) -> SentimentScorer:
+    return SentimentScorer(
+        get_data_dir(),
+        aggregates.get_processed_dir() / "sentiment",
+        _predict_on_batcher,
+        model_version,
+        batch_size=settings.SCORING_BATCH_SIZE,
+        poll_interval=settings.SCORING_POLL_SECONDS,
+        # The store is updated before the cache is dropped so no stale page is re-cached in between
+        on_scored=[
+            lambda scored: aggregates.AGGREGATES.refresh(force=True)
+        ] + ([lambda scored: _sync_store("sync_sentiment")] if settings.ARTICLE_STORE_ENABLED else []) + [
+            lambda scored: NEWS_CACHE.invalidate()
+        ],
+        # Off-topic articles are never sent to the model
+        relevance=RELEVANCE.score_batch,
+        relevance_threshold=settings.MSME_RELEVANCE_THRESHOLD,
+        entities=ENTITIES.extract_batch,
+        sector_tagger=_zero_shot_sectors if settings.ZERO_SHOT_SECTORS else None
+    )
+
+# Scores newly ingested articles in the background; created and started once the model has
+# loaded and the article store is migrated, whichever comes last
+SCORER: Optional[SentimentScorer] = None
+_SCORER_LOCK = threading.Lock()
+
+# Set once the article store schema is up to date (right away when the store is disabled)
+STORE_READY = threading.Event()
+if not settings.ARTICLE_STORE_ENABLED:
+    STORE_READY.set()
+
+def _start_scorer(analyzer) -> None:
+    global SCORER
+    with _SCORER_LOCK:
+        if SCORER is not None or not STORE_READY.is_set():
+            return
+        SCORER = build_scorer(analyzer.model_version)
+    # Woken after every ingestion run; backfills anything unscored since the last checkpoint first
+    SCHEDULER.on_complete.append(SCORER.notify)
+    SCORER.start()
+
+analyze.ANALYZER.on_ready.append(_start_scorer)
+
+def store_ready(migrated: bool = True) -> None:
+    """
+    Called once the article store migration has finished (`migrated` False if it
+    failed); starts the scorer if the model is already up.
+    """
+    if migrated and settings.ARTICLE_STORE_ENABLED:
+        STORE_MIGRATED.set()
+    STORE_READY.set()
+    analyzer = analyze.ANALYZER.peek()
+    if analyzer is not None:
+        _start_scorer(analyzer)
 
 @router.get("/status")
 async def get_ingestion_status():
@@ -60,20 +204,121 @@ async def get_ingestion_status():
         "status": "ok",
         "count": len(files),
         "files": file_info,
-        "path": str(data_dir)
+        "path": str(data_dir),
+        "cache": NEWS_CACHE.stats(),
+        "scoring": SCORER.status() if SCORER is not None else None,
+        "store_sync": STORE_SYNC.status() if STORE_SYNC is not None else None,
+        "zero_shot": ZERO_SHOT.status() if settings.ZERO_SHOT_SECTORS else None
     }
 
 @router.post("/refresh")
-async def refresh_news(background_tasks: BackgroundTasks):
+async def refresh_news():
     """Trigger a fresh fetch of news from Google RSS."""
-    background_tasks.add_task(run_ingestion_task)
-    return {"message": "Ingestion started in background. Please wait a few moments and refresh."}
+    result = SCHEDULER.trigger()
+    if result["status"] == "merged":
+        return {"message": "Ingestion already in progress. Please wait a few moments and refresh.", **result}
+    return {"message": "Ingestion started in background. Please wait a few moments and refresh.", **result}
+
+@router.get("/schedule")
+async def get_ingestion_schedule():
+    """Run history and next-due time per (query, language) feed."""
+    return SCHEDULER.status()
 
 import random
 
+# Page size bounds for /news/latest
+MAX_PAGE_SIZE = 200
+
+def _parse_bound(value: str, name: str, end: bool = False) -> datetime.datetime:
+    """ISO date or datetime as naive UTC; a bare `until` date covers that whole day."""
+    try:
+        ts = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"{name} must be an ISO date or datetime")
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    if end and len(value) == 10:
+        ts += datetime.timedelta(days=1)
+    return ts
+
+def _query_store(filters: Dict[str, Any], after: Optional[crud.Cursor], limit: int) -> Tuple[bytes, Optional[str]]:
+    """One keyset page as a JSON body, plus the cursor of the next page (None on the last one)."""
+    with database.SessionLocal() as db:
+        rows = crud.list_articles(db, after=after, limit=limit, **filters)
+    body = json.dumps([row.to_dict() for row in rows], ensure_ascii=False).encode("utf-8")
+    next_cursor = crud.encode_cursor(rows[-1].published, rows[-1].id) if len(rows) == limit else None
+    return body, next_cursor
+
+async def _latest_from_store(request: Request, filters: Dict[str, Any], cursor: str, limit: int, cacheable: bool) -> Response:
+    """Keyset page from the article store; the next page's cursor is returned in X-Next-Cursor."""
+    try:
+        after = crud.decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The query blocks on the database, so it runs off the event loop
+    load = lambda: run_in_threadpool(_query_store, filters, after, limit)
+    if cacheable:
+        # The unfiltered first page is what the dashboard polls
+        body, etag, next_cursor = await NEWS_CACHE.get_store_response((filters["language"], limit), load)
+    else:
+        body, next_cursor = await load()
+        etag = NEWS_CACHE.make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if NEWS_CACHE.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.get("/latest", response_model=List[Dict[str, Any]])
-async def get_latest_news(lang: str = None, randomize: bool = False):
-    latest_file = get_latest_data_file()
+async def get_latest_news(
+    request: Request,
+    lang: str = None,
+    randomize: bool = False,
+    query: str = None,
+    source: str = None,
+    since: str = None,
+    until: str = None,
+    sentiment: str = None,
+    cursor: str = None,
+    limit: int = 50
+):
+    """
+    Newest-first articles. With the article store enabled this pages across all
+    days: pass the X-Next-Cursor header of one response as `cursor` to get the
+    next page. `since`/`until` take ISO dates or datetimes (UTC).
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=422, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    filters = {
+        "language": lang,
+        "query": query,
+        "source": source,
+        "since": _parse_bound(since, "since") if since else None,
+        "until": _parse_bound(until, "until", end=True) if until else None,
+        "sentiment": sentiment.upper() if sentiment else None
+    }
+    filtered = cursor or any(v is not None for k, v in filters.items() if k != "language")
+    if randomize and filtered:
+        # The random sample comes from the newest file's recent pool, which only knows about lang
+        raise HTTPException(status_code=400, detail="randomize can only be combined with lang")
+
+    if settings.ARTICLE_STORE_ENABLED and not randomize:
+        try:
+            return await _latest_from_store(request, filters, cursor, limit, cacheable=not filtered)
+        except HTTPException:
+            raise
+        except Exception as e:
+            if filtered:
+                logger.error(f"Article store query failed: {e}")
+                raise HTTPException(status_code=503, detail="Article store unavailable")
+            # Plain listings can still be served from the newest file
+            logger.error(f"Article store query failed, serving from the data file: {e}")
+    elif filtered and not randomize:
+        raise HTTPException(status_code=400, detail="Filters and cursors require the article store (ARTICLE_STORE_ENABLED)")
+
+    latest_file, file_state = NEWS_CACHE.current_file(get_latest_data_file)
     
     if not latest_file:
         return [
@@ -86,36 +331,22 @@ async def get_latest_news(lang: str = None, randomize: bool = False):
             }
         ]
     
-    articles = []
     try:
-        with open(latest_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-                try:
-                    article = json.loads(line)
-                    # Filter by language if provided (and if article has language field)
-                    if lang and article.get("language") != lang:
-                        continue
-                        
-                    articles.append(article)
-                except json.JSONDecodeError:
-                    continue
-                
-                # If randomize is False, we can break early optimization
-                # But if randomize is True, we need a larger pool to sample from
-                if not randomize and len(articles) >= 50:
-                    break
-                # Only cap at a larger number if randomizing
-                if randomize and len(articles) >= 200:
-                    break
-                    
-        # Apply randomization if requested
-        if randomize and articles:
-            random.shuffle(articles)
-            
-        # Return top 50
-        return articles[:50]
+        # Newest-first straight from the sidecar index; no linear scan of the file
+        index = get_news_index(latest_file)
+        # Sentiment comes from the companion files; the model is never called on this path
+        load = lambda limit: SENTIMENT.attach(latest_file.name, index.latest(lang, limit=limit))
+        if randomize:
+            # Sample from a larger in-memory pool of recent articles
+            pool = NEWS_CACHE.get_pool(file_state, lang, lambda: load(200))
+            articles = random.sample(pool, min(50, len(pool)))
+            return JSONResponse(articles, headers={"Cache-Control": "no-store"})
+
+        body, etag = NEWS_CACHE.get_response(file_state, (lang, limit), lambda: load(limit))
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if NEWS_CACHE.etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
         
     except Exception as e:
         logger.error(f"Error reading data file: {e}")
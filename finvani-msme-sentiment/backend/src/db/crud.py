@@ -1 +1,220 @@
-# Todo: Implement
+import base64
+import datetime
+import json
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import bindparam, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from src.db.schemas import Article
+
+logger = logging.getLogger(__name__)
+
+# Columns an upsert refreshes on conflict; sentiment is owned by update_sentiment
+ARTICLE_FIELDS = ("source", "query", "language", "title", "link", "summary", "published", "fetched_at")
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+Bind = Union[Engine, Connection]
+
+
+@contextmanager
+def _transaction(bind: Bind) -> Iterator[Connection]:
+    """Own transaction for an Engine; a Connection (e.g. inside a migration) keeps the caller's."""
+    if isinstance(bind, Connection):
+        yield bind
+    else:
+        with bind.begin() as conn:
+            yield conn
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Ingester timestamps (str(datetime)) as naive UTC; naive inputs are taken as-is."""
+    if not value:
+        return None
+    try:
+        ts = datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def article_row(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Map an ingested article dict to an `articles` row (None if it has no id/title)."""
+    if not article.get("id") or not article.get("title"):
+        return None
+    fetched_at = _parse_datetime(article.get("fetched_at"))
+    return {
+        "id": article["id"],
+        "source": article.get("source"),
+        "query": article.get("query"),
+        "language": article.get("language") or "",
+        "title": article["title"],
+        "link": article.get("link"),
+        "summary": article.get("summary"),
+        "published": _parse_datetime(article.get("published")) or fetched_at or datetime.datetime.utcnow(),
+        "fetched_at": fetched_at
+    }
+
+
+def upsert_articles(bind: Bind, articles: Iterable[Dict[str, Any]]) -> int:
+    """
+    Insert or refresh articles in one statement per call.
+
+    The rows go through a single executemany, which SQLAlchemy sends as
+    multi-row INSERT ... VALUES pages (execute_values on psycopg2) with
+    ON CONFLICT (id) DO UPDATE, so a flush of N articles is a handful of
+    round trips rather than N.
+    """
+    rows = [row for row in map(article_row, articles) if row is not None]
+    if not rows:
+        return 0
+    insert = _INSERTS.get(bind.dialect.name)
+    if insert is None:
+        raise ValueError(f"Unsupported database dialect '{bind.dialect.name}'")
+
+    stmt = insert(Article.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Article.__table__.c.id],
+        set_={field: stmt.excluded[field] for field in ARTICLE_FIELDS}
+    )
+    with _transaction(bind) as conn:
+        conn.execute(stmt, rows)
+    return len(rows)
+
+
+def update_sentiment(bind: Bind, scored: Iterable[Dict[str, Any]]) -> int:
+    """Store scoring-worker output ({id, label, score, model_version}) with one executemany UPDATE."""
+    rows = [
+        {
+            "article_id": record["id"],
+            "label": record["label"],
+            "score": record["score"],
+            "version": record.get("model_version")
+        }
+        for record in scored
+    ]
+    if not rows:
+        return 0
+    table = Article.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("article_id"))
+        .values(
+            sentiment_label=bindparam("label"),
+            sentiment_score=bindparam("score"),
+            model_version=bindparam("version")
+        )
+    )
+    with _transaction(bind) as conn:
+        conn.execute(stmt, rows)
+    return len(rows)
+
+
+def _iter_jsonl(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_jsonl(bind: Bind, raw_dir: Path, scored_dir: Optional[Path] = None, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Load the daily JSONL files (and their companion sentiment files) into the store.
+    Safe to re-run: articles are upserted and sentiment is written by id.
+    """
+    counts = {"articles": 0, "sentiment": 0}
+    raw_dir = Path(raw_dir)
+    for path in sorted(raw_dir.glob("*.jsonl")) if raw_dir.exists() else []:
+        for chunk in _chunked(_iter_jsonl(path), batch_size):
+            counts["articles"] += upsert_articles(bind, chunk)
+        logger.info(f"Imported articles from {path.name}.")
+
+    if scored_dir is not None and Path(scored_dir).exists():
+        for path in sorted(Path(scored_dir).glob("*.jsonl")):
+            for chunk in _chunked(_iter_jsonl(path), batch_size):
+                counts["sentiment"] += update_sentiment(bind, chunk)
+    return counts
+
+
+# --- listing ---
+
+Cursor = Tuple[datetime.datetime, str]
+
+
+def encode_cursor(published: datetime.datetime, article_id: str) -> str:
+    """Opaque keyset cursor for the position just after (published, id)."""
+    raw = json.dumps([published.isoformat(), article_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Inverse of encode_cursor; raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        published, article_id = json.loads(raw)
+        return datetime.datetime.fromisoformat(published), str(article_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def list_articles(
+    db: Session,
+    language: Optional[str] = None,
+    query: Optional[str] = None,
+    source: Optional[str] = None,
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+    sentiment: Optional[str] = None,
+    after: Optional[Cursor] = None,
+    limit: int = 50
+) -> List[Article]:
+    """
+    Newest-first articles across all days, keyset-paginated on (published, id).
+
+    `after` is the (published, id) of the last article of the previous page;
+    the next page starts strictly below it. With at most one of language,
+    query, source or sentiment set, there is a matching (column, published, id)
+    index, so a page is one index seek plus `limit` rows however deep the
+    client has paged; further filters are applied to the rows that seek
+    walks, so sparse combinations read more than `limit` rows.
+    """
+    stmt = select(Article)
+    if language:
+        stmt = stmt.where(Article.language == language)
+    if query:
+        stmt = stmt.where(Article.query == query)
+    if source:
+        stmt = stmt.where(Article.source == source)
+    if since is not None:
+        stmt = stmt.where(Article.published >= since)
+    if until is not None:
+        stmt = stmt.where(Article.published < until)
+    if sentiment:
+        stmt = stmt.where(Article.sentiment_label == sentiment)
+    if after is not None:
+        stmt = stmt.where(tuple_(Article.published, Article.id) < tuple_(*after))
+    stmt = stmt.order_by(Article.published.desc(), Article.id.desc()).limit(limit)
+    return list(db.execute(stmt).scalars())
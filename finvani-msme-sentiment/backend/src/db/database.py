@@ -1 +1,69 @@
-# Todo: Implement
+import logging
+import os
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+try:
+    from src.config import settings
+except ImportError:
+    # Fallback for running directly as script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+Base = declarative_base()
+
+
+def make_engine(url: str = settings.DATABASE_URL) -> Engine:
+    """
+    Pooled engine for `url`.
+
+    SQLite (local runs and tests) gets WAL mode so the API can read while the
+    ingester writes; Postgres gets a bounded QueuePool with pre-ping so
+    connections dropped by the server are replaced transparently.
+    """
+    if url.startswith("sqlite"):
+        db_path = url.split("///", 1)[-1]
+        if db_path and db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        engine = create_engine(url, connect_args={"check_same_thread": False, "timeout": 30})
+
+        @event.listens_for(engine, "connect")
+        def _sqlite_pragmas(dbapi_connection, _):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+        return engine
+
+    return create_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
+
+
+engine = make_engine()
+SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+def init_db(bind: Engine = None):
+    """Bring the schema up to date (alembic upgrade head); the first upgrade also imports existing JSONL."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["engine"] = bind or engine
+    command.upgrade(config, "head")
+    logger.info("Database schema is up to date.")
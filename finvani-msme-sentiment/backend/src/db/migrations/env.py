@@ -0,0 +1,18 @@
+from alembic import context
+
+from src.db.database import Base, engine as default_engine
+from src.db import schemas  # noqa: F401  (registers the tables on Base.metadata)
+
+# init_db() passes its engine through config.attributes; `alembic` CLI runs fall back to DATABASE_URL
+engine = context.config.attributes.get("engine", default_engine)
+
+with engine.connect() as connection:
+    context.configure(
+        connection=connection,
+        target_metadata=Base.metadata,
+        # SQLite cannot ALTER most things in place
+        render_as_batch=connection.dialect.name == "sqlite"
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+    connection.commit()
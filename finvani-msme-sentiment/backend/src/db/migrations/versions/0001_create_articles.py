@@ -0,0 +1,38 @@
+"""Create the articles table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "articles",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("source", sa.String(64)),
+        sa.Column("query", sa.String(128)),
+        sa.Column("language", sa.String(8), nullable=False),
+        sa.Column("title", sa.Text, nullable=False),
+        sa.Column("link", sa.Text),
+        sa.Column("summary", sa.Text),
+        sa.Column("published", sa.DateTime, nullable=False),
+        sa.Column("fetched_at", sa.DateTime),
+        sa.Column("sentiment_label", sa.String(16)),
+        sa.Column("sentiment_score", sa.Float),
+        sa.Column("model_version", sa.String(128)),
+    )
+    op.create_index("ix_articles_language_published", "articles", ["language", "published", "id"])
+    op.create_index("ix_articles_published", "articles", ["published", "id"])
+    op.create_index("ix_articles_sentiment_label", "articles", ["sentiment_label"])
+
+
+def downgrade():
+    op.drop_table("articles")
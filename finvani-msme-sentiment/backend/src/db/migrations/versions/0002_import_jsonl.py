@@ -0,0 +1,33 @@
+"""Import the existing data/raw JSONL files and their scored sentiment
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+import logging
+from pathlib import Path
+
+from alembic import op
+
+from src.db import crud
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger(__name__)
+
+# Same convention as the API: paths relative to the working directory (/app in Docker)
+RAW_DIR = Path("data/raw")
+SCORED_DIR = Path("data/processed/sentiment")
+
+
+def upgrade():
+    # Runs on the migration's own connection so the import commits with the revision bump
+    counts = crud.import_jsonl(op.get_bind(), RAW_DIR.resolve(), SCORED_DIR.resolve())
+    logger.info(f"Imported {counts['articles']} articles and {counts['sentiment']} sentiment scores.")
+
+
+def downgrade():
+    op.execute("DELETE FROM articles")
@@ -0,0 +1,20 @@
+"""Index articles by (query, published, id) for filtered keyset pagination
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_articles_query_published", "articles", ["query", "published", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_articles_query_published", table_name="articles")
@@ -0,0 +1,27 @@
+"""Index articles by (source, published, id) and (sentiment_label, published, id)
+
+Keyset pages filtered by source or sentiment get the same single index seek as
+language and query; the plain sentiment_label index is a prefix of the new one.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_articles_source_published", "articles", ["source", "published", "id"])
+    op.create_index("ix_articles_sentiment_published", "articles", ["sentiment_label", "published", "id"])
+    op.drop_index("ix_articles_sentiment_label", table_name="articles")
+
+
+def downgrade():
+    op.create_index("ix_articles_sentiment_label", "articles", ["sentiment_label"])
+    op.drop_index("ix_articles_sentiment_published", table_name="articles")
+    op.drop_index("ix_articles_source_published", table_name="articles")
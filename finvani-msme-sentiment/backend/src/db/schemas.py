@@ -1 +1,62 @@
-# Todo: Implement
+import datetime
+from typing import Any, Dict
+
+from sqlalchemy import Column, DateTime, Float, Index, String, Text
+
+from src.db.database import Base
+
+
+class Article(Base):
+    """
+    One ingested article. `id` is the ingester's dedup id (md5 of link + title),
+    so re-ingesting the same article upserts instead of duplicating.
+    """
+    __tablename__ = "articles"
+
+    id = Column(String(32), primary_key=True)
+    source = Column(String(64))
+    query = Column(String(128))
+    language = Column(String(8), nullable=False, default="")
+    title = Column(Text, nullable=False)
+    link = Column(Text)
+    summary = Column(Text)
+    # UTC, naive; falls back to fetched_at when the feed gave no date
+    published = Column(DateTime, nullable=False)
+    fetched_at = Column(DateTime)
+
+    # Filled in by the scoring worker
+    sentiment_label = Column(String(16))
+    sentiment_score = Column(Float)
+    model_version = Column(String(128))
+
+    __table_args__ = (
+        # Newest-first listings per language; id breaks ties between equal timestamps
+        Index("ix_articles_language_published", "language", "published", "id"),
+        Index("ix_articles_published", "published", "id"),
+        Index("ix_articles_query_published", "query", "published", "id"),
+        Index("ix_articles_source_published", "source", "published", "id"),
+        Index("ix_articles_sentiment_published", "sentiment_label", "published", "id"),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as a JSONL record (timestamps as str(datetime) in UTC), plus `sentiment`."""
+        sentiment = None
+        if self.sentiment_label is not None:
+            sentiment = {
+                "label": self.sentiment_label,
+                "score": self.sentiment_score,
+                "model_version": self.model_version
+            }
+        return {
+            "id": self.id,
+            "source": self.source,
+            "query": self.query,
+            "language": self.language,
+            "title": self.title,
+            "link": self.link,
+            "summary": self.summary,
+            "published": str(self.published.replace(tzinfo=datetime.timezone.utc)),
+            "fetched_at": str(self.fetched_at) if self.fetched_at else None,
+            "sentiment": sentiment
+        }
+
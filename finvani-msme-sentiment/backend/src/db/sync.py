@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+
+try:
+    from src.db import crud
+except ImportError:
+    # Fallback for running directly as script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.db import crud
+
+logger = logging.getLogger(__name__)
+
+
+class StoreSync:
+    """
+    Keeps the article store in step with the JSONL files, which stay the source of truth.
+
+    For every raw file (data/raw) and scored companion file
+    (data/processed/sentiment) it persists a watermark: the byte offset and
+    inode up to which complete lines have been written to the store. Each
+    pass upserts only what was appended since, in chunks, and advances the
+    watermark after each chunk commits. A chunk whose write still fails after
+    `retries` attempts stops the pass with the watermark in place, so the next
+    pass (the next flush, scoring chunk or scheduler run) replays it. A file
+    that shrank below its watermark or was replaced is re-read from the
+    start; both writes are idempotent.
+
+    Sentiment is only synced once the articles are caught up: an UPDATE for a
+    row that is not in the store yet would match nothing and be lost.
+    """
+    STATE_VERSION = 1
+
+    def __init__(
+        self,
+        bind: Engine,
+        raw_dir: Path,
+        scored_dir: Path,
+        state_path: Optional[Path] = None,
+        batch_size: int = 1000,
+        retries: int = 3,
+        retry_delay: float = 0.5
+    ):
+        """
+        Args:
+            bind: Engine of the article store.
+            raw_dir: Directory of ingested JSONL files.
+            scored_dir: Directory of the scoring worker's companion files.
+            state_path: Where watermarks are persisted (None = memory only; everything is re-read on restart).
+            batch_size: Records per upsert/update statement.
+            retries: Attempts per chunk before the pass gives up.
+            retry_delay: Seconds before the first retry; doubled for each further one.
+        """
+        self.bind = bind
+        self.raw_dir = Path(raw_dir)
+        self.scored_dir = Path(scored_dir)
+        self.state_path = Path(state_path) if state_path else None
+        self.batch_size = batch_size
+        self.retries = max(1, retries)
+        self.retry_delay = retry_delay
+
+        # One pass per stream at a time; the ingester and the scoring worker call in from their own threads
+        self._locks = {"articles": threading.Lock(), "sentiment": threading.Lock()}
+        self._state_lock = threading.Lock()
+        # stream -> file name -> [offset, inode]
+        self._watermarks: Dict[str, Dict[str, List[int]]] = self._load_state()
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    # --- state ---
+
+    def _load_state(self) -> Dict[str, Dict[str, List[int]]]:
+        empty = {"articles": {}, "sentiment": {}}
+        if self.state_path is None or not self.state_path.exists():
+            return empty
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable store sync state {self.state_path}: {e}")
+            return empty
+        if state.get("version") != self.STATE_VERSION:
+            return empty
+        return {stream: state.get(stream, {}) for stream in empty}
+
+    def _save_state(self):
+        if self.state_path is None:
+            return
+        with self._state_lock:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.STATE_VERSION, **self._watermarks}, f)
+            os.replace(tmp_path, self.state_path)
+
+    # --- passes ---
+
+    def sync_articles(self) -> int:
+        """Upsert articles appended to the raw files since their watermarks. Returns articles written."""
+        with self._locks["articles"]:
+            return self._sync("articles", self.raw_dir, crud.upsert_articles)
+
+    def sync_sentiment(self) -> int:
+        """Write sentiment appended to the scored files, once the articles are caught up. Returns records written."""
+        self.sync_articles()
+        with self._locks["sentiment"]:
+            if self.behind("articles"):
+                logger.warning("Article store is behind on articles; sentiment sync deferred.")
+                return 0
+            return self._sync("sentiment", self.scored_dir, crud.update_sentiment)
+
+    def sync(self) -> Dict[str, int]:
+        """Catch up both streams (startup and after every ingestion run)."""
+        articles = self.sync_articles()
+        return {"articles": articles, "sentiment": self.sync_sentiment()}
+
+    def behind(self, stream: str) -> bool:
+        """True if a file of `stream` has complete lines past its watermark."""
+        directory = self.raw_dir if stream == "articles" else self.scored_dir
+        for path in sorted(directory.glob("*.jsonl")) if directory.exists() else []:
+            stat = path.stat()
+            if self._start(stream, path.name, stat) < self._complete_size(path, stat.st_size):
+                return True
+        return False
+
+    def _start(self, stream: str, name: str, stat: os.stat_result) -> int:
+        offset, inode = self._watermarks[stream].get(name, (0, None))
+        if stat.st_size < offset or (inode is not None and inode != stat.st_ino):
+            logger.warning(f"{name} was truncated or replaced; re-syncing it from the start.")
+            return 0
+        return offset
+
+    @staticmethod
+    def _complete_size(path: Path, size: int) -> int:
+        """Size up to the last newline (a trailing partial line is still being written)."""
+        if size == 0:
+            return 0
+        with open(path, "rb") as f:
+            f.seek(max(0, size - 1))
+            if f.read(1) == b"\n":
+                return size
+            f.seek(0)
+            return f.read(size).rfind(b"\n") + 1
+
+    def _write(self, write: Callable[[Engine, List[Dict[str, Any]]], int], chunk: List[Dict[str, Any]]) -> int:
+        for attempt in range(self.retries):
+            try:
+                return write(self.bind, chunk)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                if attempt == self.retries - 1:
+                    raise
+                logger.warning(f"Article store write failed (attempt {attempt + 1}/{self.retries}): {e}")
+                time.sleep(self.retry_delay * 2 ** attempt)
+
+    def _sync(self, stream: str, directory: Path, write: Callable[[Engine, List[Dict[str, Any]]], int]) -> int:
+        if not directory.exists():
+            return 0
+        written = 0
+        watermarks = self._watermarks[stream]
+        try:
+            for path in sorted(directory.glob("*.jsonl")):
+                stat = path.stat()
+                offset = self._start(stream, path.name, stat)
+                if stat.st_size <= offset:
+                    continue
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    chunk: List[Dict[str, Any]] = []
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            # Partially written line; picked up next pass
+                            break
+                        try:
+                            chunk.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            pass
+                        offset += len(line)
+                        if len(chunk) >= self.batch_size:
+                            written += self._write(write, chunk)
+                            chunk = []
+                            watermarks[path.name] = [offset, stat.st_ino]
+                            self._save_state()
+                    if chunk:
+                        written += self._write(write, chunk)
+                    watermarks[path.name] = [offset, stat.st_ino]
+                    self._save_state()
+        except Exception as e:
+            # The watermark stops before the failed chunk, so the next pass replays it
+            logger.error(f"Article store {stream} sync failed, will retry on the next pass: {e}")
+            return written
+        if written:
+            logger.info(f"Article store synced {written} {stream} records.")
+        return written
+
+    def status(self) -> Dict[str, Any]:
+        return {"failures": self.failures, "last_error": self.last_error}
@@ -0,0 +1,171 @@
+import datetime
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from src.ingestion.news_index import Entry, append_to_index, make_entry
+except ImportError:
+    # Fallback for running directly as script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.ingestion.news_index import Entry, append_to_index, make_entry
+
+logger = logging.getLogger(__name__)
+
+# Serialises appends within the process so computed byte offsets match the file
+_APPEND_LOCK = threading.Lock()
+
+
+class JsonlAppender:
+    """
+    Buffered, line-atomic appender for the daily JSONL files.
+
+    Articles are encoded as they arrive and flushed in batches. Each flush is
+    written with as few `os.write` calls on an O_APPEND descriptor as the
+    kernel allows and always ends on a newline, so readers (which skip a
+    trailing line without "\\n") never see a half-written record. After every
+    flush the sidecar index is updated and `on_flush` is told which articles
+    are now on disk.
+
+    A file is repaired before its first append: if it ends with a torn line
+    (a crash mid-write) that line is cut off, since its articles were never
+    indexed or reported as saved and will be fetched again. A failed write is
+    cut back the same way and its batch stays buffered for the next flush.
+
+    fsync policies:
+        "never" - leave durability to the OS page cache
+        "flush" - fsync after every batch (default)
+        "close" - fsync once when the appender is closed
+    """
+    FSYNC_POLICIES = ("never", "flush", "close")
+
+    def __init__(
+        self,
+        data_dir: Path,
+        flush_every: int = 100,
+        max_buffer_bytes: int = 1 << 20,
+        fsync: str = "flush",
+        on_flush: Optional[Callable[[Path, List[Dict[str, Any]]], None]] = None
+    ):
+        """
+        Args:
+            data_dir: Directory holding YYYY-MM-DD.jsonl files.
+            flush_every: Flush after this many buffered articles.
+            max_buffer_bytes: Flush early once the encoded buffer reaches this size.
+            fsync: One of FSYNC_POLICIES.
+            on_flush: Called with (path, articles) after each successful flush.
+        """
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'. Expected one of {self.FSYNC_POLICIES}")
+        self.data_dir = Path(data_dir)
+        self.flush_every = max(1, flush_every)
+        self.max_buffer_bytes = max_buffer_bytes
+        self.fsync = fsync
+        self.on_flush = on_flush
+
+        self._buffer: List[Tuple[Dict[str, Any], bytes]] = []
+        self._buffer_bytes = 0
+        self._fds: Dict[Path, int] = {}
+        self.written = 0
+        self.flushes = 0
+
+    def path_for(self, day: Optional[datetime.date] = None) -> Path:
+        day = day or datetime.date.today()
+        return self.data_dir / f"{day.strftime('%Y-%m-%d')}.jsonl"
+
+    def append(self, article: Dict[str, Any]):
+        line = (json.dumps(article, ensure_ascii=False) + '\n').encode('utf-8')
+        self._buffer.append((article, line))
+        self._buffer_bytes += len(line)
+        if len(self._buffer) >= self.flush_every or self._buffer_bytes >= self.max_buffer_bytes:
+            self.flush()
+
+    def extend(self, articles: Iterable[Dict[str, Any]]):
+        for article in articles:
+            self.append(article)
+
+    def _fd(self, path: Path) -> int:
+        fd = self._fds.get(path)
+        if fd is None:
+            # Read access too, to check the tail before the first append
+            fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                self._repair_tail(fd, path)
+            except OSError:
+                os.close(fd)
+                raise
+            self._fds[path] = fd
+        return fd
+
+    @staticmethod
+    def _repair_tail(fd: int, path: Path, chunk_size: int = 1 << 16):
+        """Cut the file back to its last newline if it ends with a partial line."""
+        size = os.fstat(fd).st_size
+        if size == 0 or os.pread(fd, 1, size - 1) == b"\n":
+            return
+        end = size
+        while end > 0:
+            start = max(0, end - chunk_size)
+            newline = os.pread(fd, end - start, start).rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        os.ftruncate(fd, end)
+        logger.warning(f"Dropped a torn {size - end}-byte line at the end of {path}")
+
+    def flush(self):
+        if not self._buffer:
+            return
+        # Resolve the day at flush time so a run crossing midnight rolls over to the new file
+        path = self.path_for()
+        batch = self._buffer
+
+        payload = b"".join(line for _, line in batch)
+        with _APPEND_LOCK:
+            fd = self._fd(path)
+            offset = os.lseek(fd, 0, os.SEEK_END)
+            try:
+                view = memoryview(payload)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+                if self.fsync == "flush":
+                    os.fsync(fd)
+            except OSError:
+                # e.g. ENOSPC part-way through: drop the partial batch; it stays buffered for a retry
+                os.ftruncate(fd, offset)
+                raise
+            self._buffer, self._buffer_bytes = [], 0
+
+            entries: List[Entry] = []
+            for article, line in batch:
+                entries.append(make_entry(article, offset, len(line)))
+                offset += len(line)
+            append_to_index(path, entries)
+
+        self.written += len(batch)
+        self.flushes += 1
+        if self.on_flush is not None:
+            self.on_flush(path, [article for article, _ in batch])
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            for fd in self._fds.values():
+                if self.fsync == "close":
+                    os.fsync(fd)
+                os.close(fd)
+            self._fds.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Flush whatever was fetched even if the run is failing, so the work is kept
+        self.close()
@@ -0,0 +1,98 @@
+import datetime
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class DedupIndex:
+    """
+    Persistent cross-day set of article ids.
+
+    Stores the 16-byte md5 digest behind each article `id` in an SQLite table
+    keyed on the digest, together with the day it was first stored. Lookups are
+    primary-key probes, so opening the index costs the same no matter how large
+    the JSONL files have grown. Entries older than `retention_days` are pruned.
+    """
+    FILENAME = ".dedup_index.sqlite"
+    # SQLite's default limit on bound parameters is 999
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: Path, retention_days: int = 7):
+        """
+        Args:
+            path: SQLite file to open or create.
+            retention_days: Days an id is remembered after it was first stored.
+        """
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (digest BLOB PRIMARY KEY, day INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_day ON seen (day)")
+        self._conn.commit()
+
+    @staticmethod
+    def _digest(article_id: str) -> bytes:
+        return bytes.fromhex(article_id)
+
+    @staticmethod
+    def _today() -> int:
+        return datetime.date.today().toordinal()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def __contains__(self, article_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM seen WHERE digest = ?", (self._digest(article_id),)
+            ).fetchone()
+        return row is not None
+
+    def filter_seen(self, article_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of `article_ids` already in the index."""
+        ids: List[str] = list(dict.fromkeys(article_ids))
+        seen: Set[str] = set()
+        with self._lock:
+            for start in range(0, len(ids), self.QUERY_CHUNK):
+                chunk = ids[start:start + self.QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT digest FROM seen WHERE digest IN ({placeholders})",
+                    [self._digest(i) for i in chunk]
+                ).fetchall()
+                seen.update(row[0].hex() for row in rows)
+        return seen
+
+    def add_many(self, article_ids: Iterable[str], day: Optional[datetime.date] = None):
+        """Record ids as stored; existing entries keep their original day."""
+        day_ordinal = day.toordinal() if day else self._today()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen (digest, day) VALUES (?, ?)",
+                [(self._digest(i), day_ordinal) for i in article_ids]
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """Drop ids older than the retention window. Returns the number removed."""
+        cutoff = self._today() - self.retention_days
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM seen WHERE day < ?", (cutoff,))
+            self._conn.commit()
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} dedup entries older than {self.retention_days} days.")
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
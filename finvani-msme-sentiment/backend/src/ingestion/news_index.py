@@ -0,0 +1,229 @@
+import bisect
+import datetime
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sidecar record per JSONL line: byte offset, byte length, published epoch seconds, language
+RECORD = struct.Struct("<QIq8s")
+INDEX_SUFFIX = ".idx"
+
+# (published_ts, offset, length, lang)
+Entry = Tuple[int, int, int, str]
+
+# Serialises index writes/rebuilds within the process (ingester thread vs request handlers)
+_WRITE_LOCK = threading.Lock()
+
+
+def index_path_for(data_path: Path) -> Path:
+    """YYYY-MM-DD.jsonl -> YYYY-MM-DD.jsonl.idx (not matched by *.jsonl globs)."""
+    return data_path.with_name(data_path.name + INDEX_SUFFIX)
+
+
+def published_timestamp(article: Dict[str, Any]) -> int:
+    """Epoch seconds of `published`, falling back to `fetched_at`, else 0."""
+    for field in ("published", "fetched_at"):
+        value = article.get(field)
+        if not value:
+            continue
+        try:
+            return int(datetime.datetime.fromisoformat(value).timestamp())
+        except (TypeError, ValueError):
+            continue
+    return 0
+
+
+def make_entry(article: Dict[str, Any], offset: int, length: int) -> Entry:
+    return (published_timestamp(article), offset, length, article.get("language") or "")
+
+
+def _pack(entry: Entry) -> bytes:
+    published, offset, length, lang = entry
+    return RECORD.pack(offset, length, published, lang.encode("ascii", "ignore")[:8])
+
+
+def _read_entries(idx_path: Path, start_byte: int = 0) -> Tuple[List[Entry], int]:
+    """Decode whole records from `start_byte`. Returns (entries, byte position reached)."""
+    with open(idx_path, "rb") as f:
+        f.seek(start_byte)
+        raw = f.read()
+    usable = len(raw) - len(raw) % RECORD.size
+    entries = [
+        (published, offset, length, lang.rstrip(b"\x00").decode("ascii"))
+        for offset, length, published, lang in RECORD.iter_unpack(raw[:usable])
+    ]
+    return entries, start_byte + usable
+
+
+def _indexed_end(idx_path: Path) -> int:
+    """Byte offset in the data file just past the last indexed line."""
+    size = idx_path.stat().st_size
+    if size < RECORD.size:
+        return 0
+    with open(idx_path, "rb") as f:
+        f.seek(size - size % RECORD.size - RECORD.size)
+        offset, length, _, _ = RECORD.unpack(f.read(RECORD.size))
+    return offset + length
+
+
+def scan_jsonl(data_path: Path, start: int = 0) -> Tuple[List[Entry], int]:
+    """
+    Index complete lines of the data file from byte `start`.
+    Returns (entries, end) where `end` is just past the last complete line.
+    """
+    entries: List[Entry] = []
+    with open(data_path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                # A writer is mid-append; the rest is indexed on the next pass
+                break
+            if line.strip():
+                try:
+                    entries.append(make_entry(json.loads(line), offset, len(line)))
+                except json.JSONDecodeError:
+                    pass
+            offset += len(line)
+    return entries, offset
+
+
+def rebuild_index(data_path: Path) -> List[Entry]:
+    """Rewrite the sidecar from the data file (atomic replace)."""
+    with _WRITE_LOCK:
+        entries, _ = scan_jsonl(data_path)
+        idx_path = index_path_for(data_path)
+        tmp_path = idx_path.with_name(idx_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(_pack(e) for e in entries))
+        os.replace(tmp_path, idx_path)
+    logger.info(f"Rebuilt news index for {data_path.name} ({len(entries)} records).")
+    return entries
+
+
+def append_to_index(data_path: Path, entries: List[Entry]):
+    """
+    Called by the ingester right after appending `entries` to the data file.
+    If the sidecar does not end exactly where the new lines start (missing,
+    or lines were appended by something else) it is rebuilt instead.
+    """
+    if not entries:
+        return
+    idx_path = index_path_for(data_path)
+    with _WRITE_LOCK:
+        consistent = idx_path.exists() and _indexed_end(idx_path) == entries[0][1]
+        if consistent:
+            with open(idx_path, "ab") as f:
+                f.write(b"".join(_pack(e) for e in entries))
+            return
+    rebuild_index(data_path)
+
+
+class NewsIndex:
+    """
+    In-memory, incrementally refreshed view of one day's sidecar index.
+
+    Entries are kept sorted by published time per language (and overall), so
+    the newest N records for a language are a slice; only the bytes of those N
+    lines are then read from the data file through mmap.
+    """
+
+    def __init__(self, data_path: Path):
+        self.data_path = Path(data_path)
+        self.idx_path = index_path_for(self.data_path)
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._by_lang: Dict[str, List[Tuple[int, int, int]]] = {}
+        self._all: List[Tuple[int, int, int]] = []
+        self._idx_bytes = 0
+        self._data_end = 0
+
+    def _add(self, entries: List[Entry]):
+        for published, offset, length, lang in entries:
+            # Lines already picked up by an in-memory tail scan
+            if offset < self._data_end:
+                continue
+            key = (published, offset, length)
+            bisect.insort(self._by_lang.setdefault(lang, []), key)
+            bisect.insort(self._all, key)
+            self._data_end = offset + length
+
+    def refresh(self):
+        """Bring the view up to date with the files; cost is proportional to what changed."""
+        with self._lock:
+            if not self.data_path.exists():
+                self._reset()
+                return
+            data_size = self.data_path.stat().st_size
+
+            if not self.idx_path.exists() or self.idx_path.stat().st_size < self._idx_bytes or data_size < self._data_end:
+                # Missing sidecar, or files were replaced/truncated underneath us
+                self._reset()
+                rebuild_index(self.data_path)
+            elif self._idx_bytes == 0 and _indexed_end(self.idx_path) > data_size:
+                # Sidecar describes lines that do not exist: stale
+                rebuild_index(self.data_path)
+
+            entries, self._idx_bytes = _read_entries(self.idx_path, self._idx_bytes)
+            self._add(entries)
+
+            if self._data_end < data_size:
+                # Lines appended without a sidecar update yet: index them in memory only
+                tail, _ = scan_jsonl(self.data_path, self._data_end)
+                self._add(tail)
+
+    def latest(self, lang: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest `limit` articles (by published time), optionally for one language."""
+        self.refresh()
+        with self._lock:
+            source = self._by_lang.get(lang, []) if lang else self._all
+            picked = source[-limit:][::-1] if limit > 0 else []
+        if not picked:
+            return []
+
+        articles = []
+        with open(self.data_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for _, offset, length in picked:
+                    try:
+                        articles.append(json.loads(data[offset:offset + length]))
+                    except json.JSONDecodeError:
+                        continue
+        return articles
+
+    def count(self, lang: Optional[str] = None) -> int:
+        with self._lock:
+            return len(self._by_lang.get(lang, [])) if lang else len(self._all)
+
+
+# Views kept in memory: the newest file, plus the previous one while requests straddle midnight
+MAX_CACHED_INDEXES = 2
+_INDEXES: "OrderedDict[Path, NewsIndex]" = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_news_index(data_path: Path) -> NewsIndex:
+    """
+    Shared NewsIndex per data file, so request handlers reuse the in-memory view.
+    Only the MAX_CACHED_INDEXES most recently used views are kept; older days are dropped.
+    """
+    data_path = Path(data_path)
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(data_path)
+        if index is None:
+            index = NewsIndex(data_path)
+            _INDEXES[data_path] = index
+        _INDEXES.move_to_end(data_path)
+        while len(_INDEXES) > MAX_CACHED_INDEXES:
+            _INDEXES.popitem(last=False)
+        return index
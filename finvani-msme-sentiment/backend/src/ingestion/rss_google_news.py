@@ -4,10 +4,28 @@ import hashlib
 import logging
 import datetime
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from dateutil import parser as date_parser
 import urllib.parse
 from pathlib import Path
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Callable, Set, Optional, Tuple
+
+try:
+    from src.ingestion.appender import JsonlAppender
+    from src.ingestion.dedup_index import DedupIndex
+    from src.preprocess.language_detect import detect_batch
+    from src.preprocess.normalize import normalize_batch, normalize_headline
+except ImportError:
+    # Fallback for running directly as script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.ingestion.appender import JsonlAppender
+    from src.ingestion.dedup_index import DedupIndex
+    from src.preprocess.language_detect import detect_batch
+    from src.preprocess.normalize import normalize_batch, normalize_headline
 
 # Configure logging
 logging.basicConfig(
@@ -18,123 +36,416 @@ logger = logging.getLogger(__name__)
 
 class GoogleNewsIngester:
     BASE_URL = "https://news.google.com/rss/search"
+    # ETag / Last-Modified per feed URL, persisted between runs
+    FEED_STATE_FILE = ".feed_state.json"
+    # HTTP statuses worth retrying with backoff
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
     
-    def __init__(self, data_dir: str = "../../../data/raw"):
+    def __init__(
+        self,
+        data_dir: str = "../../../data/raw",
+        base_url: Optional[str] = None,
+        max_workers: int = 1,
+        per_host_limit: int = 4,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        retention_days: int = 7,
+        flush_every: int = 100,
+        fsync: str = "flush",
+        on_saved: Optional[List[Callable[[List[Dict[str, Any]]], None]]] = None,
+        relevance: Optional[Callable[[List[str]], List[float]]] = None,
+        entities: Optional[Callable[[List[str]], List[Dict[str, List[str]]]]] = None
+    ):
+        """
+        Args:
+            data_dir: Directory for the daily JSONL files.
+            base_url: Override for BASE_URL (e.g. a local stub server in tests/benchmarks).
+            max_workers: Feeds fetched concurrently by run_ingestion (1 = serial).
+            per_host_limit: Maximum in-flight requests to any single host.
+            max_retries: Retries per feed on network errors / 429 / 5xx.
+            backoff_seconds: Base delay for exponential backoff between retries.
+            retention_days: How long an article id is remembered for cross-day dedup.
+            flush_every: Articles buffered before each append to the JSONL file.
+            fsync: JsonlAppender fsync policy ("never", "flush" or "close").
+            on_saved: Callbacks receiving each batch of articles once it is on disk (e.g. the article store).
+            relevance: Batched MSME relevance of normalized headlines, stored as `msme_relevance`
+                (e.g. MSMERelevanceScorer.score_batch).
+            entities: Batched entity extraction over normalized headlines, stored as `entities`
+                (e.g. EntityExtractor.extract_batch).
+        """
         self.data_dir = Path(data_dir).resolve()
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # Ids seen during the current run only; across runs the dedup index answers
         self.seen_hashes: Set[str] = set()
 
+        self.base_url = base_url or self.BASE_URL
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.on_saved = list(on_saved or [])
+        self.relevance = relevance
+        self.entities = entities
+
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._state_lock = threading.Lock()
+        self.feed_state: Dict[str, Dict[str, str]] = self._load_feed_state()
+        # Validators from fetches whose articles are not on disk yet (None = forget the URL's validators)
+        self._pending_state: Dict[str, Optional[Dict[str, str]]] = {}
+
+        # Persistent cross-day dedup; opening it does not depend on JSONL size
+        self.dedup_index = DedupIndex(self.data_dir / DedupIndex.FILENAME, retention_days)
+        if len(self.dedup_index) == 0:
+            self._seed_dedup_index()
+
     def _generate_hash(self, article: Dict[str, Any]) -> str:
         """Generate a unique hash for an article based on URL and title."""
         unique_string = f"{article.get('link', '')}{article.get('title', '')}"
         return hashlib.md5(unique_string.encode('utf-8')).hexdigest()
 
-    def _load_existing_hashes(self, filepath: Path):
-        """Load existing hashes from today's file to avoid duplicates on re-run."""
+    def _generate_dedup_key(self, article: Dict[str, Any], headline: Optional[str] = None) -> str:
+        """
+        Second dedup key over URL and normalized title, so the same article
+        re-served with different Unicode forms, invisible characters or publisher
+        suffix is still caught. `id` keeps the raw-title hash stored ids use.
+        """
+        if headline is None:
+            headline = normalize_headline(article.get('title', ''), article.get('publisher'))
+        unique_string = f"{article.get('link', '')}{headline}"
+        return hashlib.md5(unique_string.encode('utf-8')).hexdigest()
+
+    def _seed_dedup_index(self):
+        """One-off import of ids from JSONL files inside the retention window (e.g. after an upgrade)."""
+        cutoff = datetime.date.today() - datetime.timedelta(days=self.dedup_index.retention_days)
+        for filepath in sorted(self.data_dir.glob("*.jsonl")):
+            try:
+                day = datetime.date.fromisoformat(filepath.stem)
+            except ValueError:
+                continue
+            if day >= cutoff:
+                self._load_existing_hashes(filepath, day)
+
+    def _load_existing_hashes(self, filepath: Path, day: datetime.date):
+        """Load existing ids from a daily file into the dedup index."""
         if not filepath.exists():
             return
         
+        ids = []
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 for line in f:
                     try:
                         record = json.loads(line)
                         if 'id' in record:
-                            self.seen_hashes.add(record['id'])
+                            ids.append(record['id'])
+                        if 'dedup_key' in record:
+                            ids.append(record['dedup_key'])
                     except json.JSONDecodeError:
                         continue
-            logger.info(f"Loaded {len(self.seen_hashes)} existing unique hashes.")
+            self.dedup_index.add_many(ids, day)
+            logger.info(f"Seeded dedup index with {len(ids)} ids from {filepath.name}.")
         except Exception as e:
             logger.error(f"Error loading existing hashes: {e}")
 
-    def fetch_feed(self, query: str, lang: str = "en") -> List[Dict[str, Any]]:
-        """Fetch news entries from Google News RSS feed."""
+    def _load_feed_state(self) -> Dict[str, Dict[str, str]]:
+        state_path = self.data_dir / self.FEED_STATE_FILE
+        if not state_path.exists():
+            return {}
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable feed state {state_path}: {e}")
+            return {}
+
+    def _commit_feed_state(self):
+        """
+        Adopt the validators of every fetch since the last commit and persist
+        them. Called only once the fetched articles are on disk: a validator
+        remembered for articles that were never written would turn the next
+        fetch into a 304 and lose them for good.
+        """
+        with self._state_lock:
+            for url, validators in self._pending_state.items():
+                if validators:
+                    self.feed_state[url] = validators
+                else:
+                    self.feed_state.pop(url, None)
+            self._pending_state.clear()
+        self._save_feed_state()
+
+    def _discard_feed_state(self):
+        """Forget validators of fetches whose articles could not be saved (they are refetched in full)."""
+        with self._state_lock:
+            self._pending_state.clear()
+
+    def _save_feed_state(self):
+        """Persist validators atomically so a crash never leaves a truncated state file."""
+        state_path = self.data_dir / self.FEED_STATE_FILE
+        tmp_path = state_path.with_suffix(".tmp")
+        with self._state_lock:
+            snapshot = dict(self.feed_state)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, state_path)
+        except OSError as e:
+            logger.error(f"Error saving feed state: {e}")
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urllib.parse.urlsplit(url).netloc
+        with self._state_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_semaphores[host]
+
+    def build_url(self, query: str, lang: str) -> str:
         # Clean query and construct URL
         # hl: language, gl: country (IN), ceid: country:language
         encoded_query = urllib.parse.quote_plus(query)
         params = f"q={encoded_query}&hl={lang}-IN&gl=IN&ceid=IN:{lang}"
-        url = f"{self.BASE_URL}?{params}"
-        
-        logger.info(f"Fetching feed for query='{query}', lang='{lang}'")
-        
-        try:
-            feed = feedparser.parse(url)
+        return f"{self.base_url}?{params}"
+
+    def _fetch_parsed(self, url: str):
+        """
+        Conditional GET with retry. Returns the parsed feed, or None if the
+        server answered 304 Not Modified (or every attempt failed).
+        """
+        with self._state_lock:
+            validators = dict(self.feed_state.get(url, {}))
+
+        for attempt in range(self.max_retries + 1):
+            with self._host_semaphore(url):
+                feed = feedparser.parse(
+                    url,
+                    etag=validators.get("etag"),
+                    modified=validators.get("modified")
+                )
+
+            status = feed.get("status")
+            if status == 304:
+                logger.info(f"Not modified: {url}")
+                return None
+
+            # feedparser swallows network errors: no status + bozo means the request itself failed
+            retryable = status in self.RETRY_STATUSES or (status is None and feed.bozo)
+            if not retryable:
+                new_validators = {k: feed[k] for k in ("etag", "modified") if feed.get(k)}
+                with self._state_lock:
+                    # Adopted by _commit_feed_state once the articles are saved
+                    self._pending_state[url] = new_validators or None
+                return feed
+
+            if attempt < self.max_retries:
+                delay = self.backoff_seconds * (2 ** attempt) * (1 + random.random() * 0.1)
+                logger.warning(f"Fetch failed (status={status}) for {url}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        logger.error(f"Giving up on {url} after {self.max_retries + 1} attempts: {feed.get('bozo_exception')}")
+        return None
+
+    def _parse_entries(self, feed, query: str, lang: str) -> List[Dict[str, Any]]:
+        """Turn feed entries into article records (no dedup)."""
+        if feed.bozo:
+            logger.warning(f"Feed malformed or error: {feed.bozo_exception}")
+
+        articles = []
+        for entry in feed.entries:
             
-            if feed.bozo:
-                logger.warning(f"Feed malformed or error: {feed.bozo_exception}")
+            published_dt = None
+            if 'published' in entry:
+                try:
+                    published_dt = str(date_parser.parse(entry.published))
+                except:
+                    published_dt = str(datetime.datetime.now())
             
-            articles = []
-            for entry in feed.entries:
-                
-                published_dt = None
-                if 'published' in entry:
-                    try:
-                        published_dt = str(date_parser.parse(entry.published))
-                    except:
-                        published_dt = str(datetime.datetime.now())
-                
-                article = {
-                    "source": "google_news",
-                    "query": query,
-                    "language": lang,
-                    "title": entry.get("title", ""),
-                    "link": entry.get("link", ""),
-                    "published": published_dt,
-                    "summary": entry.get("summary", ""),
-                    "fetched_at": str(datetime.datetime.now())
-                }
-                
-                # Generate hash ID
-                article_id = self._generate_hash(article)
-                article["id"] = article_id
-                
-                if article_id not in self.seen_hashes:
-                    articles.append(article)
-                    self.seen_hashes.add(article_id)
-                
-            logger.info(f"Found {len(articles)} new unique articles.")
-            return articles
+            article = {
+                "source": "google_news",
+                "query": query,
+                "language": lang,
+                # The feed's `hl`; `language` is re-detected from the title below
+                "feed_language": lang,
+                "title": entry.get("title", ""),
+                # Name in the entry's <source>; Google appends it to the title as " - Publisher"
+                "publisher": (entry.get("source") or {}).get("title"),
+                "link": entry.get("link", ""),
+                "published": published_dt,
+                "summary": entry.get("summary", ""),
+                "fetched_at": str(datetime.datetime.now())
+            }
             
+            articles.append(article)
+
+        # One normalization pass per feed for titles and summaries
+        headlines = normalize_batch([a["title"] for a in articles], [a["publisher"] for a in articles])
+        summaries = normalize_batch([a["summary"] for a in articles], strip_html=True)
+        # Google mixes other-language results into every feed (often English in `hi`);
+        # tag each article with the language of its headline
+        detected = detect_batch(headlines, [lang] * len(headlines))
+        relevance = self.relevance(headlines) if self.relevance is not None else [None] * len(headlines)
+        mentions = self.entities(headlines) if self.entities is not None else [None] * len(headlines)
+        for article, headline, summary, language, score, found in zip(
+            articles, headlines, summaries, detected, relevance, mentions
+        ):
+            article["summary"] = summary
+            article["language"] = language or lang
+            if score is not None:
+                article["msme_relevance"] = score
+            if found is not None:
+                # Only non-empty entity types, to keep the JSONL lines short
+                article["entities"] = {kind: names for kind, names in found.items() if names}
+            # Generate hash ID
+            article["id"] = self._generate_hash(article)
+            article["dedup_key"] = self._generate_dedup_key(article, headline)
+        return articles
+
+    def _fetch_articles(self, query: str, lang: str) -> List[Dict[str, Any]]:
+        """Fetch and parse one feed. Safe to call from worker threads."""
+        url = self.build_url(query, lang)
+        logger.info(f"Fetching feed for query='{query}', lang='{lang}'")
+        try:
+            feed = self._fetch_parsed(url)
+            if feed is None:
+                return []
+            return self._parse_entries(feed, query, lang)
         except Exception as e:
             logger.error(f"Failed to fetch feed: {e}")
             return []
 
-    def save_to_jsonl(self, articles: List[Dict[str, Any]]):
-        """Save deduplicated articles to JSONL file."""
-        if not articles:
-            return
+    def _dedup(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Keep articles not seen in this run or stored on any day in the retention
+        window. Runs on the coordinating thread only.
+        """
+        keys = lambda a: (a["id"], a.get("dedup_key") or a["id"])
+        candidates = [a for a in articles if not self.seen_hashes.intersection(keys(a))]
+        stored = self.dedup_index.filter_seen(key for a in candidates for key in keys(a))
 
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
-        filename = f"{today}.jsonl"
-        filepath = self.data_dir / filename
-        
-        # Load existing hashes if this is the first write/check in this run
-        # (Though we effectively did this by keeping self.seen_hashes in memory, 
-        # but for robustness across multiple runs of the script, we should load first if not loaded)
-        # For this script run, we assume _load_existing_hashes is called at start.
+        unique = []
+        for article in candidates:
+            if stored.intersection(keys(article)) or self.seen_hashes.intersection(keys(article)):
+                continue
+            unique.append(article)
+            self.seen_hashes.update(keys(article))
+        return unique
+
+    def fetch_feed(self, query: str, lang: str = "en") -> List[Dict[str, Any]]:
+        """Fetch news entries from Google News RSS feed."""
+        articles = self._dedup(self._fetch_articles(query, lang))
+        logger.info(f"Found {len(articles)} new unique articles.")
+        return articles
+
+    def _on_flush(self, filepath: Path, articles: List[Dict[str, Any]]):
+        # Only ids that reached disk are remembered across runs
+        self.dedup_index.add_many(
+            key for article in articles for key in (article["id"], article.get("dedup_key")) if key
+        )
+        logger.info(f"Saved {len(articles)} articles to {filepath}")
+        for callback in self.on_saved:
+            try:
+                callback(articles)
+            except Exception as e:
+                # The JSONL file stays the source of truth; mirrors must be able to catch up from it
+                # (the article store's StoreSync replays from its watermark on the next pass)
+                logger.error(f"Saved-articles callback failed: {e}")
+
+    def _open_appender(self) -> JsonlAppender:
+        return JsonlAppender(
+            self.data_dir,
+            flush_every=self.flush_every,
+            fsync=self.fsync,
+            on_flush=self._on_flush
+        )
+
+    def save_to_jsonl(self, articles: List[Dict[str, Any]]) -> bool:
+        """Save deduplicated articles to JSONL file and record them in the dedup index."""
+        if not articles:
+            self._commit_feed_state()
+            return True
         
         try:
-            with open(filepath, 'a', encoding='utf-8') as f:
-                for article in articles:
-                    f.write(json.dumps(article, ensure_ascii=False) + '\n')
-            logger.info(f"Saved {len(articles)} articles to {filepath}")
+            with self._open_appender() as appender:
+                appender.extend(articles)
         except Exception as e:
             logger.error(f"Error writing to file: {e}")
+            self._discard_feed_state()
+            return False
+        self._commit_feed_state()
+        return True
+
+    def _iter_fetched(self, feeds: List[Tuple[str, str]]):
+        """
+        Yield (query, lang, articles) per feed as soon as each one is fetched.
+        At most 2 * max_workers feeds are in flight, so finished-but-unconsumed
+        results never pile up in memory.
+        """
+        if self.max_workers == 1:
+            for query, lang in feeds:
+                yield query, lang, self._fetch_articles(query, lang)
+            return
 
-    def run_ingestion(self, queries: List[str], languages: List[str]):
+        remaining = iter(feeds)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="feed-fetch") as pool:
+            pending = {}
+
+            def submit_next():
+                feed = next(remaining, None)
+                if feed is not None:
+                    pending[pool.submit(self._fetch_articles, *feed)] = feed
+
+            for _ in range(2 * self.max_workers):
+                submit_next()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query, lang = pending.pop(future)
+                    submit_next()
+                    yield query, lang, future.result()
+
+    def run_ingestion(self, queries: List[str], languages: List[str]) -> List[Dict[str, Any]]:
         """Run ingestion for all query and language combinations."""
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
-        filepath = self.data_dir / f"{today}.jsonl"
-        self._load_existing_hashes(filepath)
+        return self.run_feeds([(query, lang) for query in queries for lang in languages])
+
+    def run_feeds(self, feeds: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Run ingestion for the given (query, language) feeds.
+
+        Streams fetch -> dedup -> buffered append, so memory does not grow with
+        the number of feeds and a crash keeps everything flushed so far.
+        Returns per-feed progress: query, language, fetched, new.
+        """
+        self.dedup_index.prune()
+        # Long-lived ingesters (the scheduler's) would otherwise grow this forever
+        self.seen_hashes.clear()
         
-        all_articles = []
-        for query in queries:
-            for lang in languages:
-                articles = self.fetch_feed(query, lang)
-                all_articles.extend(articles)
+        progress = []
+        self._discard_feed_state()
+        try:
+            with self._open_appender() as appender:
+                for i, (query, lang, articles) in enumerate(self._iter_fetched(feeds), 1):
+                    new_articles = self._dedup(articles)
+                    appender.extend(new_articles)
+                    progress.append({
+                        "query": query,
+                        "language": lang,
+                        "fetched": len(articles),
+                        "new": len(new_articles)
+                    })
+                    logger.info(
+                        f"[{i}/{len(feeds)}] query='{query}', lang='{lang}': "
+                        f"{len(articles)} fetched, {len(new_articles)} new, {appender.written} written so far."
+                    )
+        except Exception:
+            # Keep the old validators so these feeds are refetched in full; dedup drops whatever did reach disk
+            self._discard_feed_state()
+            raise
         
-        self.save_to_jsonl(all_articles)
-        logger.info("Ingestion run completed.")
+        # Only remember validators once the articles they cover are on disk
+        self._commit_feed_state()
+        logger.info(f"Ingestion run completed: {sum(p['new'] for p in progress)} new articles from {len(feeds)} feeds.")
+        return progress
 
 # Official languages (22 Scheduled Languages of India)
 # Note: Google News RSS availability varies. Using standard ISO codes.
@@ -1 +1,250 @@
-# Todo: Implement
+import datetime
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FeedSchedule:
+    """Adaptive polling state for one (query, language) feed."""
+
+    def __init__(self, query: str, language: str, interval: float, next_due: float):
+        self.query = query
+        self.language = language
+        self.interval = interval
+        self.next_due = next_due
+        self.runs = 0
+        self.productive_runs = 0
+        self.last_new: Optional[int] = None
+        self.last_run_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.query,
+            "language": self.language,
+            "interval_seconds": round(self.interval, 1),
+            "next_due": _iso(self.next_due),
+            "last_run": _iso(self.last_run_at) if self.last_run_at else None,
+            "last_new": self.last_new,
+            "runs": self.runs,
+            "productive_runs": self.productive_runs
+        }
+
+
+def _iso(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts).isoformat(timespec="seconds")
+
+
+class IngestionScheduler:
+    """
+    In-process ingestion scheduler.
+
+    Every feed has its own polling interval: it shrinks when the feed produced
+    new articles and grows when it did not, within [min_interval, max_interval],
+    and each next-due time gets random jitter so feeds do not synchronise.
+
+    All runs execute on the scheduler thread behind a single-flight lock, so
+    startup, periodic and manual (/news/refresh) triggers never overlap; a
+    refresh requested while a run is in progress merges into that run. Fetch
+    concurrency inside a run is bounded by the ingester's worker pool.
+    """
+
+    def __init__(
+        self,
+        ingester_factory: Callable[[], Any],
+        queries: List[str],
+        languages: List[str],
+        base_interval: float = 1800.0,
+        min_interval: float = 600.0,
+        max_interval: float = 6 * 3600.0,
+        jitter: float = 0.1,
+        history_size: int = 50,
+        on_complete: Optional[List[Callable[[List[Dict[str, Any]]], None]]] = None
+    ):
+        """
+        Args:
+            ingester_factory: Returns a GoogleNewsIngester (created lazily on the scheduler thread).
+            queries, languages: Feeds are their cross product.
+            base_interval: Starting poll interval per feed, in seconds.
+            min_interval, max_interval: Bounds for the adaptive interval.
+            jitter: Fractional +/- jitter applied to every next-due time.
+            history_size: Number of past runs kept for /news/schedule.
+            on_complete: Callbacks receiving per-feed progress after each successful run.
+        """
+        self.ingester_factory = ingester_factory
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.on_complete = list(on_complete or [])
+
+        now = time.time()
+        self.feeds: Dict[Tuple[str, str], FeedSchedule] = {
+            # Everything is due right away and goes out as one run (bounded by the ingester's
+            # worker pool); jitter only applies to the next-due times set after each run
+            (q, l): FeedSchedule(q, l, base_interval, now)
+            for q in queries for l in languages
+        }
+        self.history: deque = deque(maxlen=history_size)
+
+        self._ingester = None
+        self._run_lock = threading.Lock()
+        self._run_finished = threading.Condition()
+        self._current_run: Optional[Dict[str, Any]] = None
+        self._run_counter = 0
+        # Completed runs; bumped after the run lock is released so waiters see the run they waited for
+        self._runs_finished = 0
+        self._refresh_requested = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- lifecycle ---
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="ingestion-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Ingestion scheduler started with {len(self.feeds)} feeds.")
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if self._refresh_requested:
+                self._refresh_requested = False
+                self.run_now(trigger="manual")
+            else:
+                due = self._due_feeds()
+                if due:
+                    self.run_now(due, trigger="schedule")
+
+            self._wake.wait(timeout=self._seconds_until_next_due())
+            self._wake.clear()
+
+    def _due_feeds(self) -> List[Tuple[str, str]]:
+        now = time.time()
+        return [key for key, feed in self.feeds.items() if feed.next_due <= now]
+
+    def _seconds_until_next_due(self) -> float:
+        if not self.feeds:
+            return 60.0
+        soonest = min(feed.next_due for feed in self.feeds.values())
+        return max(1.0, soonest - time.time())
+
+    # --- triggering ---
+
+    def trigger(self) -> Dict[str, Any]:
+        """Request a run of every feed (used by /news/refresh). Never blocks."""
+        if self._current_run is not None:
+            return {"status": "merged", "run": dict(self._current_run)}
+        self._refresh_requested = True
+        self.start()
+        self._wake.set()
+        return {"status": "scheduled"}
+
+    def run_now(self, feeds: Optional[List[Tuple[str, str]]] = None, trigger: str = "manual") -> Optional[Dict[str, Any]]:
+        """
+        Run the given feeds (default: all) on the calling thread.
+        If a run is already in progress, wait for it and return its record instead.
+        """
+        with self._run_finished:
+            generation = self._runs_finished
+        if not self._run_lock.acquire(blocking=False):
+            # The holder bumps _runs_finished only after releasing the lock, so it is still
+            # ahead of `generation` here and this waits for exactly that run
+            with self._run_finished:
+                self._run_finished.wait_for(lambda: self._runs_finished > generation)
+                return self.history[-1] if self.history else None
+
+        try:
+            record = self._execute(feeds or list(self.feeds), trigger)
+        finally:
+            self._run_lock.release()
+            with self._run_finished:
+                self._runs_finished += 1
+                self._run_finished.notify_all()
+        return record
+
+    def _execute(self, feeds: List[Tuple[str, str]], trigger: str) -> Dict[str, Any]:
+        self._run_counter += 1
+        started = time.time()
+        record: Dict[str, Any] = {
+            "run_id": self._run_counter,
+            "trigger": trigger,
+            "started_at": _iso(started),
+            "feeds": len(feeds)
+        }
+        self._current_run = record
+        logger.info(f"Ingestion run {record['run_id']} ({trigger}) started for {len(feeds)} feeds.")
+
+        try:
+            if self._ingester is None:
+                self._ingester = self.ingester_factory()
+            progress = self._ingester.run_feeds(feeds)
+            self._reschedule(progress)
+            record["new_articles"] = sum(p["new"] for p in progress)
+            for callback in self.on_complete:
+                try:
+                    callback(progress)
+                except Exception as e:
+                    logger.error(f"Ingestion completion callback failed: {e}")
+        except Exception as e:
+            logger.error(f"Ingestion run {record['run_id']} failed: {e}")
+            record["error"] = str(e)
+            # Back off the whole batch so a failing upstream is not hammered
+            for key in feeds:
+                self._schedule_next(self.feeds.get(key), productive=False)
+
+        record["duration_seconds"] = round(time.time() - started, 2)
+        record["finished_at"] = _iso(time.time())
+        with self._run_finished:
+            self.history.append(record)
+            self._current_run = None
+        logger.info(f"Ingestion run {record['run_id']} finished in {record['duration_seconds']}s.")
+        return record
+
+    # --- adaptive intervals ---
+
+    def _reschedule(self, progress: List[Dict[str, Any]]):
+        now = time.time()
+        for item in progress:
+            feed = self.feeds.get((item["query"], item["language"]))
+            if feed is None:
+                continue
+            feed.runs += 1
+            feed.last_new = item["new"]
+            feed.last_run_at = now
+            if item["new"] > 0:
+                feed.productive_runs += 1
+            self._schedule_next(feed, productive=item["new"] > 0)
+
+    def _schedule_next(self, feed: Optional[FeedSchedule], productive: bool):
+        if feed is None:
+            return
+        # Poll productive feeds more often, quiet feeds less often
+        factor = 0.5 if productive else 1.5
+        feed.interval = min(self.max_interval, max(self.min_interval, feed.interval * factor))
+        jitter = 1 + random.uniform(-self.jitter, self.jitter)
+        feed.next_due = time.time() + feed.interval * jitter
+
+    # --- introspection ---
+
+    def status(self) -> Dict[str, Any]:
+        feeds = sorted(self.feeds.values(), key=lambda f: f.next_due)
+        return {
+            "running": self._current_run is not None,
+            "current_run": dict(self._current_run) if self._current_run else None,
+            "scheduler_alive": self._thread is not None and self._thread.is_alive(),
+            "history": list(self.history)[::-1],
+            "feeds": [feed.to_dict() for feed in feeds]
+        }
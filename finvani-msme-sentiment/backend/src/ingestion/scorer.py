@@ -0,0 +1,335 @@
+import datetime
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.preprocess.normalize import normalize_batch
+
+logger = logging.getLogger(__name__)
+
+
+class SentimentScorer:
+    """
+    Score-on-ingest stage.
+
+    A background worker tails the raw daily JSONL files from a checkpoint,
+    runs new articles through batched SentimentAnalyzer inference and appends
+    one companion record per article to data/processed/sentiment/<same name>:
+    {id, language, query, published, label, score, model_version, scored_at,
+    states, sectors}.
+
+    The checkpoint stores, per raw file, the byte offset consumed and the size
+    of the companion file at that point. On resume the companion file is cut
+    back to that size before appending, so a crash between the two writes never
+    produces duplicate scores. With no checkpoint the worker backfills every
+    existing file, resuming from wherever it stopped.
+
+    With a relevance threshold set, articles below it (off-topic hits from broad
+    queries such as "Economy") are skipped and never reach the model.
+    """
+    CHECKPOINT_FILE = "scoring_checkpoint.json"
+
+    def __init__(
+        self,
+        raw_dir: Path,
+        scored_dir: Path,
+        predict_batch: Callable[[List[str]], List[Dict[str, Any]]],
+        model_version: str,
+        batch_size: int = 64,
+        poll_interval: float = 300.0,
+        on_scored: Optional[List[Callable[[List[Dict[str, Any]]], None]]] = None,
+        relevance: Optional[Callable[[List[str]], List[float]]] = None,
+        relevance_threshold: float = 0.0,
+        entities: Optional[Callable[[List[str]], List[Dict[str, List[str]]]]] = None,
+        sector_tagger: Optional[Callable[[List[str]], List[List[str]]]] = None
+    ):
+        """
+        Args:
+            raw_dir: Directory of ingested YYYY-MM-DD.jsonl files.
+            scored_dir: Directory for companion sentiment files.
+            predict_batch: Batched inference, e.g. SentimentAnalyzer.predict_batch.
+            model_version: Identifier stored with every score.
+            batch_size: Articles read and scored per chunk.
+            poll_interval: Seconds between checks when nobody calls notify().
+            on_scored: Callbacks receiving each chunk of companion records once it is on disk.
+            relevance: Batched MSME relevance, for records ingested without `msme_relevance`.
+            relevance_threshold: Articles scoring below this are skipped without running
+                the model (0 scores everything).
+            entities: Batched entity extraction, for records ingested without `entities`.
+            sector_tagger: Batched sector labels for headlines with no gazetteer sector
+                (e.g. the zero-shot classifier).
+        """
+        self.raw_dir = Path(raw_dir)
+        self.scored_dir = Path(scored_dir)
+        self.predict_batch = predict_batch
+        self.model_version = model_version
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.on_scored = list(on_scored or [])
+        self.relevance = relevance
+        self.relevance_threshold = relevance_threshold
+        self.entities = entities
+        self.sector_tagger = sector_tagger
+
+        self.checkpoint_path = self.scored_dir.parent / self.CHECKPOINT_FILE
+        self.checkpoint: Dict[str, Dict[str, int]] = self._load_checkpoint()
+        self.scored = 0
+        self.skipped = 0
+
+        self._run_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- checkpoint ---
+
+    def _load_checkpoint(self) -> Dict[str, Dict[str, int]]:
+        if not self.checkpoint_path.exists():
+            return {}
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("files", {})
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable scoring checkpoint {self.checkpoint_path}: {e}")
+            return {}
+
+    def _save_checkpoint(self):
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"model_version": self.model_version, "files": self.checkpoint}, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # --- worker ---
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="sentiment-scorer", daemon=True)
+        self._thread.start()
+        logger.info("Sentiment scoring worker started.")
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def notify(self, *_):
+        """Wake the worker (e.g. after an ingestion run); accepts and ignores callback arguments."""
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Sentiment scoring pass failed: {e}")
+            self._wake.wait(timeout=self.poll_interval)
+            self._wake.clear()
+
+    # --- scoring ---
+
+    def run_once(self) -> int:
+        """Score everything appended since the checkpoint. Returns the number of articles scored."""
+        with self._run_lock:
+            if not self.raw_dir.exists():
+                return 0
+            total = 0
+            for raw_path in sorted(self.raw_dir.glob("*.jsonl")):
+                total += self._score_file(raw_path)
+                if self._stop.is_set():
+                    break
+            if total:
+                logger.info(f"Scored {total} new articles.")
+            return total
+
+    def _read_chunk(self, raw_path: Path, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Up to batch_size complete records from `offset`; returns (records, new offset)."""
+        records = []
+        with open(raw_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("id") and record.get("title"):
+                    records.append(record)
+                if len(records) >= self.batch_size:
+                    break
+        return records, offset
+
+    def _score_file(self, raw_path: Path) -> int:
+        state = self.checkpoint.get(raw_path.name, {"raw_offset": 0, "scored_size": 0})
+        raw_size = raw_path.stat().st_size
+        if raw_size <= state["raw_offset"]:
+            return 0
+
+        self.scored_dir.mkdir(parents=True, exist_ok=True)
+        scored_path = self.scored_dir / raw_path.name
+        scored = 0
+        with open(scored_path, "ab") as out:
+            # Drop anything written after the last checkpoint (crash between write and checkpoint)
+            if out.tell() != state["scored_size"]:
+                out.truncate(state["scored_size"])
+                out.seek(state["scored_size"])
+
+            while state["raw_offset"] < raw_size and not self._stop.is_set():
+                records, next_offset = self._read_chunk(raw_path, state["raw_offset"])
+                if next_offset == state["raw_offset"]:
+                    break
+
+                companions = self._score(records)
+                if companions:
+                    out.write(b"".join(
+                        (json.dumps(c, ensure_ascii=False) + "\n").encode("utf-8") for c in companions
+                    ))
+                    out.flush()
+                    os.fsync(out.fileno())
+
+                state = {"raw_offset": next_offset, "scored_size": out.tell()}
+                self.checkpoint[raw_path.name] = state
+                self._save_checkpoint()
+                scored += len(companions)
+                self.scored += len(companions)
+
+                for callback in self.on_scored:
+                    try:
+                        callback(companions)
+                    except Exception as e:
+                        # The checkpoint has already moved past this chunk, so it is never re-sent:
+                        # callbacks must catch up from the companion files themselves (see StoreSync)
+                        logger.error(f"Scoring callback failed: {e}")
+        return scored
+
+    def _filter_relevant(
+        self, records: List[Dict[str, Any]], headlines: List[str]
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[Optional[float]]]:
+        """
+        Drop off-topic articles before inference; they get no companion record.
+        Returns the kept records and headlines with their relevance (None if unknown).
+        """
+        relevance = [r.get("msme_relevance") for r in records]
+        missing = [i for i, score in enumerate(relevance) if score is None]
+        if missing and self.relevance is not None:
+            for i, score in zip(missing, self.relevance([headlines[i] for i in missing])):
+                relevance[i] = score
+        kept = [
+            i for i, score in enumerate(relevance)
+            if score is None or score >= self.relevance_threshold
+        ]
+        self.skipped += len(records) - len(kept)
+        return [records[i] for i in kept], [headlines[i] for i in kept], [relevance[i] for i in kept]
+
+    def _score(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Score the headline itself, without Google's " - Publisher" suffix
+        headlines = normalize_batch([r["title"] for r in records], [r.get("publisher") for r in records])
+        records, headlines, relevance = self._filter_relevant(records, headlines)
+        if not records:
+            return []
+        results = self.predict_batch(headlines)
+        mentions = [r.get("entities") for r in records]
+        missing = [i for i, found in enumerate(mentions) if found is None]
+        if missing and self.entities is not None:
+            for i, found in zip(missing, self.entities([headlines[i] for i in missing])):
+                mentions[i] = found
+        untagged = [i for i, found in enumerate(mentions) if not (found or {}).get("sectors")]
+        if untagged and self.sector_tagger is not None:
+            for i, sectors in zip(untagged, self.sector_tagger([headlines[i] for i in untagged])):
+                if sectors:
+                    mentions[i] = {**(mentions[i] or {}), "sectors": sectors}
+        scored_at = str(datetime.datetime.now())
+        return [
+            {
+                "id": record["id"],
+                "language": record.get("language"),
+                "query": record.get("query"),
+                "published": record.get("published"),
+                "fetched_at": record.get("fetched_at"),
+                "label": result["label"],
+                "score": result["score"],
+                "model_version": self.model_version,
+                "scored_at": scored_at,
+                # Kept so consumers can apply a stricter cut than the scoring threshold
+                "msme_relevance": score,
+                # Mentioned states and sectors, for the heatmap and sector aggregates
+                "states": (found or {}).get("states", []),
+                "sectors": (found or {}).get("sectors", [])
+            }
+            for record, result, found, score in zip(records, results, mentions, relevance)
+        ]
+
+    def status(self) -> Dict[str, Any]:
+        pending = 0
+        if self.raw_dir.exists():
+            for raw_path in self.raw_dir.glob("*.jsonl"):
+                consumed = self.checkpoint.get(raw_path.name, {}).get("raw_offset", 0)
+                pending += max(0, raw_path.stat().st_size - consumed)
+        return {
+            "worker_alive": self._thread is not None and self._thread.is_alive(),
+            "model_version": self.model_version,
+            "scored_this_process": self.scored,
+            "skipped_off_topic_this_process": self.skipped,
+            "relevance_threshold": self.relevance_threshold,
+            "pending_bytes": pending,
+            "files": dict(self.checkpoint)
+        }
+
+
+class ScoredSentimentReader:
+    """
+    Read-side view of the companion sentiment files: id -> {label, score, model_version}.
+    Each file is tailed incrementally, so serving precomputed sentiment never
+    re-reads what was already loaded and never calls the model.
+    """
+
+    def __init__(self, scored_dir: Path):
+        self.scored_dir = Path(scored_dir)
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._offsets: Dict[str, int] = {}
+
+    def _refresh(self, name: str):
+        path = self.scored_dir / name
+        if not path.exists():
+            return
+        size = path.stat().st_size
+        offset = self._offsets.get(name, 0)
+        if size < offset:
+            # Truncated by a resumed scorer: reload
+            self._files.pop(name, None)
+            offset = 0
+        if size == offset:
+            return
+        entries = self._files.setdefault(name, {})
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entries[record["id"]] = {
+                    "label": record["label"],
+                    "score": record["score"],
+                    "model_version": record.get("model_version")
+                }
+        self._offsets[name] = offset
+
+    def attach(self, data_file_name: str, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Copy of `articles` with a `sentiment` field (None if not scored yet)."""
+        with self._lock:
+            self._refresh(data_file_name)
+            entries = self._files.get(data_file_name, {})
+            return [{**article, "sentiment": entries.get(article.get("id"))} for article in articles]
@@ -1,7 +1,12 @@
 import torch
-from torch.utils.data import Dataset
-from typing import List, Dict
+from torch.utils.data import Dataset, Sampler
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import hashlib
+import json
 import logging
+import os
+import random
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -57,3 +62,238 @@ class SentimentDataset(Dataset):
             'attention_mask': encoding['attention_mask'].flatten(),
             'labels': torch.tensor(label, dtype=torch.long)
         }
+
+
+class TokenizedCorpus:
+    """
+    A corpus tokenized once and cached on disk as memory-mapped arrays.
+
+    All headlines go through the fast tokenizer in one batched call, without
+    padding. Token ids are stored back to back in `ids.npy` with per-example
+    `offsets.npy` and `labels.npy`; later runs (and every DataLoader worker)
+    open them with mmap instead of tokenizing again. The cache directory name
+    is a hash of the texts, labels, tokenizer and max_len, so a changed corpus
+    or tokenizer gets a fresh cache. `labelled` is False when some example had
+    no valid 'sentiment' and was given the NEU default.
+    """
+    FILES = ("ids.npy", "offsets.npy", "labels.npy")
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        with open(os.path.join(cache_dir, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.ids = np.load(os.path.join(cache_dir, "ids.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(cache_dir, "offsets.npy"), mmap_mode="r")
+        self.labels = np.load(os.path.join(cache_dir, "labels.npy"), mmap_mode="r")
+        self.lengths = np.diff(self.offsets)
+        self.labelled = self.meta.get("labelled", True)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def input_ids(self, index: int) -> np.ndarray:
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
+
+    @staticmethod
+    def cache_key(texts: Sequence[str], labels: Sequence[int], tokenizer, max_len: int, labelled: bool = True) -> str:
+        digest = hashlib.blake2b(digest_size=10)
+        digest.update(f"{tokenizer.name_or_path}|{len(tokenizer)}|{max_len}|{labelled}".encode("utf-8"))
+        for text, label in zip(texts, labels):
+            digest.update(f"{label}\x00{text}\x01".encode("utf-8"))
+        return digest.hexdigest()
+
+    @classmethod
+    def build(
+        cls,
+        data: List[Dict],
+        tokenizer,
+        cache_root: str = "data/processed/tokenized",
+        max_len: int = 128,
+        chunk_size: int = 10000,
+        label_map: Optional[Dict[str, int]] = None
+    ) -> "TokenizedCorpus":
+        """
+        Tokenize `data` (dicts with 'headline'/'text' and 'sentiment') or reuse its cache.
+
+        Args:
+            data: Training examples, labelled like SentimentDataset.
+            tokenizer: HuggingFace tokenizer; a fast (Rust) tokenizer is strongly preferred.
+            cache_root: Parent directory of the per-corpus caches.
+            max_len: Truncation length.
+            chunk_size: Examples per tokenizer call (bounds peak memory on big corpora).
+            label_map: 'sentiment' value -> class id (default SentimentDataset.LABEL_MAP);
+                missing or unknown values get the "NEU" id.
+        """
+        label_map = label_map or SentimentDataset.LABEL_MAP
+        texts = [item.get("headline") or item.get("text") or "" for item in data]
+        labels = [label_map.get(item.get("sentiment"), label_map["NEU"]) for item in data]
+        labelled = all(item.get("sentiment") in label_map for item in data)
+        cache_dir = os.path.join(cache_root, cls.cache_key(texts, labels, tokenizer, max_len, labelled))
+        if os.path.exists(os.path.join(cache_dir, "meta.json")):
+            logger.info(f"Using cached tokenization at {cache_dir}")
+            return cls(cache_dir)
+
+        if not getattr(tokenizer, "is_fast", False):
+            logger.warning("Tokenizer is not a fast tokenizer; one-off tokenization will be slow.")
+        os.makedirs(cache_dir, exist_ok=True)
+        ids: List[np.ndarray] = []
+        lengths = np.zeros(len(texts), dtype=np.int64)
+        for start in range(0, len(texts), chunk_size):
+            encoded = tokenizer(
+                texts[start:start + chunk_size],
+                truncation=True,
+                max_length=max_len,
+                return_attention_mask=False,
+                return_token_type_ids=False
+            )["input_ids"]
+            for i, row in enumerate(encoded):
+                ids.append(np.asarray(row, dtype=np.int32))
+                lengths[start + i] = len(row)
+
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Written under temporary names and renamed last, so a half-written cache is never reused
+        arrays = (np.concatenate(ids) if ids else np.zeros(0, dtype=np.int32), offsets, np.asarray(labels, dtype=np.int64))
+        for name, array in zip(cls.FILES, arrays):
+            np.save(os.path.join(cache_dir, f"tmp.{name}"), array)
+            os.replace(os.path.join(cache_dir, f"tmp.{name}"), os.path.join(cache_dir, name))
+        meta = {
+            "tokenizer": tokenizer.name_or_path,
+            "max_len": max_len,
+            "examples": len(texts),
+            "tokens": int(offsets[-1]),
+            "pad_token_id": tokenizer.pad_token_id,
+            "labelled": labelled
+        }
+        with open(os.path.join(cache_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        logger.info(f"Tokenized {len(texts)} examples ({meta['tokens']} tokens) into {cache_dir}")
+        return cls(cache_dir)
+
+
+class PretokenizedDataset(Dataset):
+    """
+    Examples from a TokenizedCorpus as unpadded id tensors; see DynamicPaddingCollator.
+    `teacher_logits` (one row per example) adds soft targets for distillation.
+    """
+
+    def __init__(self, corpus: TokenizedCorpus, teacher_logits: Optional[np.ndarray] = None):
+        if teacher_logits is not None and len(teacher_logits) != len(corpus):
+            raise ValueError("teacher_logits must have one row per example")
+        self.corpus = corpus
+        self.teacher_logits = teacher_logits
+
+    def __len__(self):
+        return len(self.corpus)
+
+    @property
+    def labelled(self) -> bool:
+        return self.corpus.labelled
+
+    def __getitem__(self, index):
+        item = {
+            'input_ids': torch.from_numpy(np.array(self.corpus.input_ids(index), dtype=np.int64)),
+            'labels': int(self.corpus.labels[index])
+        }
+        if self.teacher_logits is not None:
+            item['teacher_logits'] = torch.from_numpy(np.array(self.teacher_logits[index], dtype=np.float32))
+        return item
+
+
+class LengthBucketSampler(Sampler):
+    """
+    Batch sampler that groups examples of similar length.
+
+    Each epoch the indices are shuffled, cut into pools of `batch_size *
+    bucket_size` examples, sorted by length inside each pool and split into
+    batches; the batch order is then shuffled again. Batches therefore pad to
+    nearly the same length while staying random across epochs. Order is a pure
+    function of (seed, epoch), and state_dict() records how many batches of
+    the current epoch were consumed, so training can resume mid-epoch exactly.
+    """
+
+    def __init__(
+        self,
+        lengths: Sequence[int],
+        batch_size: int,
+        bucket_size: int = 50,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        seed: int = 0
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.bucket_size = max(1, bucket_size)
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.seed = seed
+        self.epoch = 0
+        self.start_batch = 0
+
+    def set_epoch(self, epoch: int):
+        self.epoch = epoch
+
+    def _batches(self) -> List[List[int]]:
+        rng = random.Random(self.seed * 1000003 + self.epoch)
+        indices = list(range(len(self.lengths)))
+        if self.shuffle:
+            rng.shuffle(indices)
+        pool = self.batch_size * self.bucket_size
+        batches = []
+        for start in range(0, len(indices), pool):
+            chunk = sorted(indices[start:start + pool], key=lambda i: self.lengths[i])
+            batches += [chunk[i:i + self.batch_size] for i in range(0, len(chunk), self.batch_size)]
+        if self.drop_last:
+            batches = [batch for batch in batches if len(batch) == self.batch_size]
+        if self.shuffle:
+            rng.shuffle(batches)
+        return batches
+
+    def __iter__(self) -> Iterator[List[int]]:
+        batches = self._batches()
+        start, self.start_batch = self.start_batch, 0
+        return iter(batches[start:])
+
+    def __len__(self):
+        n = len(self.lengths)
+        if self.drop_last:
+            return n // self.batch_size
+        # Every pool but the last is a whole number of batches
+        pool = self.batch_size * self.bucket_size
+        full, rest = divmod(n, pool)
+        return full * self.bucket_size + -(-rest // self.batch_size)
+
+    def state_dict(self, batches_done: int) -> Dict[str, Any]:
+        return {"seed": self.seed, "epoch": self.epoch, "batches_done": batches_done}
+
+    def load_state_dict(self, state: Dict[str, Any]):
+        """Resume: the next iteration replays the saved epoch's order from the first unseen batch."""
+        self.seed = state["seed"]
+        self.epoch = state["epoch"]
+        self.start_batch = state["batches_done"]
+
+
+class DynamicPaddingCollator:
+    """Pads a batch only to its own longest sequence and builds the attention mask."""
+
+    def __init__(self, pad_token_id: int):
+        self.pad_token_id = pad_token_id
+
+    def __call__(self, batch: List[Dict[str, Any]]) -> Dict[str, torch.Tensor]:
+        longest = max(len(item['input_ids']) for item in batch)
+        input_ids = torch.full((len(batch), longest), self.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(batch), longest), dtype=torch.long)
+        for row, item in enumerate(batch):
+            n = len(item['input_ids'])
+            input_ids[row, :n] = item['input_ids']
+            attention_mask[row, :n] = 1
+        collated = {
+            'input_ids': input_ids,
+            'attention_mask': attention_mask,
+            'labels': torch.tensor([item['labels'] for item in batch], dtype=torch.long)
+        }
+        if 'teacher_logits' in batch[0]:
+            collated['teacher_logits'] = torch.stack([item['teacher_logits'] for item in batch])
+        return collated
@@ -0,0 +1,204 @@
+import torch
+import torch.nn.functional as F
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+import numpy as np
+
+# Adjust import based on where this script is run from
+try:
+    from src.models.vocab_pruning import embedding_megabytes, prune_model_vocab, prune_tokenizer, used_token_ids
+    from src.preprocess.language_detect import detect_batch
+    from src.preprocess.normalize import normalize_batch
+except ImportError:
+    # Fallback for running directly as script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.models.vocab_pruning import embedding_megabytes, prune_model_vocab, prune_tokenizer, used_token_ids
+    from src.preprocess.language_detect import detect_batch
+    from src.preprocess.normalize import normalize_batch
+
+logger = logging.getLogger(__name__)
+
+# Multilingual sentiment teacher; its label order (0 NEG, 1 NEU, 2 POS) is what SentimentAnalyzer expects
+DEFAULT_TEACHER = "cardiffnlp/twitter-xlm-roberta-base-sentiment"
+ID2LABEL = {0: "NEGATIVE", 1: "NEUTRAL", 2: "POSITIVE"}
+# 'sentiment' values of labelled examples in the same order, for build_dataloader(label_map=...)
+LABEL_IDS = {"NEG": 0, "NEU": 1, "POS": 2}
+
+
+def load_ingested_headlines(raw_dir: str = "data/raw") -> List[str]:
+    """Distinct normalized headlines from the ingested JSONL files, oldest file first."""
+    seen = set()
+    headlines: List[str] = []
+    for path in sorted(Path(raw_dir).glob("*.jsonl")):
+        titles, publishers = [], []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                titles.append(record.get("title") or "")
+                publishers.append(record.get("publisher"))
+        for headline in normalize_batch(titles, publishers):
+            if headline and headline not in seen:
+                seen.add(headline)
+                headlines.append(headline)
+    logger.info(f"Loaded {len(headlines)} distinct headlines from {raw_dir}")
+    return headlines
+
+
+def batched_logits(model, tokenizer, texts: Sequence[str], batch_size: int, max_len: int) -> np.ndarray:
+    """Raw logits for `texts` in input order, from length-sorted, dynamically padded batches."""
+    device = next(model.parameters()).device
+    encodings = tokenizer(list(texts), truncation=True, max_length=max_len)
+    order = sorted(range(len(texts)), key=lambda i: len(encodings["input_ids"][i]))
+    logits = np.zeros((len(texts), model.config.num_labels), dtype=np.float32)
+    model.eval()
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        inputs = tokenizer.pad(
+            [{key: encodings[key][i] for key in encodings.keys()} for i in chunk],
+            padding="longest",
+            return_tensors="pt"
+        ).to(device)
+        with torch.no_grad():
+            logits[chunk] = model(**inputs).logits.float().cpu().numpy()
+    return logits
+
+
+def cache_teacher_logits(
+    teacher,
+    tokenizer,
+    texts: Sequence[str],
+    cache_root: str = "data/processed/teacher_logits",
+    batch_size: int = 64,
+    max_len: int = 128
+) -> np.ndarray:
+    """
+    Teacher logits for `texts`, computed once and memory-mapped from
+    `<cache_root>/<hash>.npy` afterwards (hash of teacher and texts).
+    """
+    digest = hashlib.blake2b(digest_size=10)
+    digest.update(f"{teacher.name_or_path}|{max_len}".encode("utf-8"))
+    for text in texts:
+        digest.update(text.encode("utf-8") + b"\x00")
+    path = os.path.join(cache_root, f"{digest.hexdigest()}.npy")
+    if os.path.exists(path):
+        logger.info(f"Using cached teacher logits at {path}")
+        return np.load(path, mmap_mode="r")
+
+    start = time.perf_counter()
+    logits = batched_logits(teacher, tokenizer, texts, batch_size, max_len)
+    os.makedirs(cache_root, exist_ok=True)
+    np.save(path + ".tmp.npy", logits)
+    os.replace(path + ".tmp.npy", path)
+    logger.info(f"Cached teacher logits for {len(texts)} headlines in {time.perf_counter() - start:.1f}s at {path}")
+    return np.load(path, mmap_mode="r")
+
+
+def build_student(teacher, tokenizer, texts: Sequence[str], num_layers: int = 4) -> Tuple[Any, Any]:
+    """
+    Student initialised from the teacher: `num_layers` evenly spaced encoder
+    layers (first and last included) and only the vocabulary `texts` use.
+    Returns (student model, pruned tokenizer).
+    """
+    student = copy.deepcopy(teacher).cpu()
+    layers = student.base_model.encoder.layer
+    if not 1 <= num_layers <= len(layers):
+        raise ValueError(f"num_layers must be between 1 and {len(layers)}")
+    keep_layers = sorted({round(i * (len(layers) - 1) / max(num_layers - 1, 1)) for i in range(num_layers)})
+    student.base_model.encoder.layer = torch.nn.ModuleList([layers[i] for i in keep_layers])
+    student.config.num_hidden_layers = len(keep_layers)
+
+    keep_ids = used_token_ids(tokenizer, texts)
+    before = embedding_megabytes(student)
+    prune_model_vocab(student, keep_ids)
+    student_tokenizer = prune_tokenizer(tokenizer, keep_ids)
+    student.config.id2label = dict(ID2LABEL)
+    student.config.label2id = {label: i for i, label in ID2LABEL.items()}
+    logger.info(
+        f"Student: layers {keep_layers} of {len(layers)}, vocabulary {tokenizer.vocab_size} -> {len(keep_ids)} "
+        f"(embeddings {before:.0f} MB -> {embedding_megabytes(student):.0f} MB)"
+    )
+    return student, student_tokenizer
+
+
+def distillation_loss(
+    student_logits: torch.Tensor,
+    teacher_logits: torch.Tensor,
+    temperature: float = 2.0
+) -> torch.Tensor:
+    """KL(teacher || student) on temperature-softened distributions, scaled by T^2 (Hinton et al.)."""
+    return F.kl_div(
+        F.log_softmax(student_logits / temperature, dim=-1),
+        F.log_softmax(teacher_logits / temperature, dim=-1),
+        reduction="batchmean",
+        log_target=True
+    ) * temperature ** 2
+
+
+def _model_megabytes(model) -> float:
+    return sum(t.numel() * t.element_size() for t in list(model.parameters()) + list(model.buffers())) / 2 ** 20
+
+
+def evaluation_report(
+    teacher,
+    teacher_tokenizer,
+    student,
+    student_tokenizer,
+    texts: Sequence[str],
+    languages: Optional[Sequence[Optional[str]]] = None,
+    labels: Optional[Sequence[int]] = None,
+    batch_size: int = 32,
+    max_len: int = 128
+) -> Dict[str, Any]:
+    """
+    Teacher vs student on held-out headlines: latency, weight memory, overall and
+    per-language agreement with the teacher, and accuracy if gold `labels`
+    (in teacher order, 0 NEG / 1 NEU / 2 POS) are given.
+    """
+    if languages is None:
+        languages = detect_batch(list(texts))
+    report: Dict[str, Any] = {"examples": len(texts)}
+    predictions = {}
+    for name, model, tokenizer in (("teacher", teacher, teacher_tokenizer), ("student", student, student_tokenizer)):
+        model.cpu()
+        start = time.perf_counter()
+        logits = batched_logits(model, tokenizer, texts, batch_size, max_len)
+        elapsed = time.perf_counter() - start
+        predictions[name] = logits.argmax(axis=-1)
+        report[name] = {
+            "layers": model.config.num_hidden_layers,
+            "vocab_size": model.config.vocab_size,
+            "weights_mb": round(_model_megabytes(model), 1),
+            "ms_per_headline": round(elapsed / max(len(texts), 1) * 1e3, 3)
+        }
+        if labels is not None:
+            report[name]["accuracy"] = round(float((predictions[name] == np.asarray(labels)).mean()), 4)
+
+    agree = predictions["teacher"] == predictions["student"]
+    report["agreement"] = round(float(agree.mean()), 4) if len(texts) else None
+    per_language: Dict[str, List[bool]] = {}
+    for language, same in zip(languages, agree.tolist()):
+        per_language.setdefault(language or "unknown", []).append(same)
+    report["agreement_by_language"] = {
+        language: {"examples": len(rows), "agreement": round(sum(rows) / len(rows), 4)}
+        for language, rows in sorted(per_language.items())
+    }
+    report["speedup"] = round(report["teacher"]["ms_per_headline"] / max(report["student"]["ms_per_headline"], 1e-9), 2)
+    return report
+
+
+def load_teacher(teacher_path: str = DEFAULT_TEACHER):
+    tokenizer = AutoTokenizer.from_pretrained(teacher_path, use_fast=True)
+    model = AutoModelForSequenceClassification.from_pretrained(teacher_path, low_cpu_mem_usage=True)
+    model.eval()
+    return model, tokenizer
@@ -0,0 +1,200 @@
+"""
+Export / quantize CLI for the CPU inference backends of SentimentAnalyzer.
+
+Writes into the model directory:
+    onnx/model.onnx        fp32 ONNX graph (dynamic batch and sequence axes)
+    onnx/model.int8.onnx   onnxruntime dynamic int8 quantization of the above
+    backends.json          parity report against the fp32 torch model
+
+SentimentAnalyzer only uses a non-torch backend if backends.json marks it as passed
+and its model_hash still matches the files in the directory (i.e. the model was
+not retrained or pruned since the check).
+
+Usage (from backend/):
+    python -m src.models.export_backends --model-path model_output --eval-data ../data/raw/2025-01-01.jsonl
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List
+
+import torch
+import torch.nn.functional as F
+
+try:
+    from src.models.infer import SentimentAnalyzer, ort
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.models.infer import SentimentAnalyzer, ort
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Used when no held-out JSONL is given
+DEFAULT_EVAL_HEADLINES = [
+    "RBI increases repo rate by 50 bps, hitting MSME loans.",
+    "Government announces subsidy for small exporters.",
+    "Sensex stays flat ahead of budget announcement.",
+    "SIDBI launches new credit line for women-led micro enterprises.",
+    "Textile units face cash crunch as raw material costs climb.",
+    "GST collections rise 12% year on year.",
+    "एमएसएमई क्षेत्र को सस्ते कर्ज के लिए नई योजना",
+    "छोटे कारोबारियों पर बढ़ती ब्याज दरों की मार",
+    "சிறு தொழில்களுக்கு புதிய கடன் திட்டம்",
+    "ক্ষুদ্র শিল্পে রপ্তানি কমেছে",
+]
+
+
+def load_eval_headlines(path: str | None, limit: int) -> List[str]:
+    if not path:
+        return DEFAULT_EVAL_HEADLINES
+    headlines = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                title = json.loads(line).get("title")
+            except json.JSONDecodeError:
+                continue
+            if title:
+                headlines.append(title)
+            if len(headlines) >= limit:
+                break
+    return headlines or DEFAULT_EVAL_HEADLINES
+
+
+def export_onnx(analyzer: SentimentAnalyzer, output_path: str, opset: int = 17):
+    """Export the fp32 torch model with dynamic batch/sequence axes."""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    sample = analyzer.tokenizer(
+        ["export sample headline", "a second, longer export sample headline"],
+        return_tensors="pt",
+        padding=True
+    )
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "sequence"},
+        "logits": {0: "batch"}
+    }
+    torch.onnx.export(
+        analyzer.model,
+        (sample["input_ids"], sample["attention_mask"]),
+        output_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes=dynamic_axes,
+        opset_version=opset,
+        dynamo=False
+    )
+    logger.info(f"Exported ONNX graph to {output_path}")
+
+
+def quantize_onnx(input_path: str, output_path: str):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(input_path, output_path, weight_type=QuantType.QInt8)
+    logger.info(f"Wrote int8 ONNX graph to {output_path}")
+
+
+def probabilities(analyzer: SentimentAnalyzer, texts: List[str], batch_size: int) -> torch.Tensor:
+    """Class probabilities in input order, using the analyzer's own backend."""
+    rows = []
+    for start in range(0, len(texts), batch_size):
+        inputs = analyzer.tokenizer(
+            texts[start:start + batch_size],
+            return_tensors="pt",
+            truncation=True,
+            max_length=512,
+            padding=True
+        ).to(analyzer.device)
+        with torch.no_grad():
+            rows.append(F.softmax(analyzer._forward(inputs), dim=1))
+    return torch.cat(rows)
+
+
+def parity_report(reference: torch.Tensor, candidate: torch.Tensor, threshold: float) -> Dict[str, Any]:
+    agreement = (reference.argmax(dim=1) == candidate.argmax(dim=1)).float().mean().item()
+    return {
+        "agreement": round(agreement, 4),
+        "max_abs_prob_diff": round((reference - candidate).abs().max().item(), 6),
+        "passed": agreement >= threshold
+    }
+
+
+def throughput(analyzer: SentimentAnalyzer, texts: List[str], batch_size: int) -> float:
+    # Time the backend itself, not the prediction cache
+    analyzer.cache = None
+    start = time.perf_counter()
+    analyzer.predict_batch(texts, batch_size=batch_size)
+    return round(len(texts) / (time.perf_counter() - start), 1)
+
+
+def run(model_path: str, eval_data: str | None, backends: List[str], threshold: float, limit: int, batch_size: int):
+    if not os.path.isdir(model_path):
+        raise FileNotFoundError(f"Model directory '{model_path}' does not exist")
+
+    texts = load_eval_headlines(eval_data, limit)
+    logger.info(f"Evaluating {len(texts)} held-out headlines (agreement threshold {threshold})")
+
+    reference_analyzer = SentimentAnalyzer(model_path=model_path, backend="torch")
+    reference = probabilities(reference_analyzer, texts, batch_size)
+
+    if any(b.startswith("onnx") for b in backends):
+        # torch.onnx.export and onnxruntime.quantization both need the onnx package as well
+        if ort is None or importlib.util.find_spec("onnx") is None:
+            raise RuntimeError("onnx and onnxruntime are required to export ONNX backends (pip install onnx onnxruntime)")
+        fp32_path = os.path.join(model_path, SentimentAnalyzer.ONNX_FILES["onnx"])
+        export_onnx(reference_analyzer, fp32_path)
+        if "onnx_int8" in backends:
+            quantize_onnx(fp32_path, os.path.join(model_path, SentimentAnalyzer.ONNX_FILES["onnx_int8"]))
+
+    report = {
+        "torch": {"passed": True, "headlines_per_sec": throughput(reference_analyzer, texts, batch_size)}
+    }
+    del reference_analyzer
+
+    for backend in backends:
+        candidate = SentimentAnalyzer(model_path=model_path, backend=backend, verify_parity=False)
+        if candidate.backend != backend:
+            report[backend] = {"passed": False, "error": f"could not load (fell back to {candidate.backend})"}
+            continue
+        report[backend] = parity_report(reference, probabilities(candidate, texts, batch_size), threshold)
+        report[backend]["headlines_per_sec"] = throughput(candidate, texts, batch_size)
+        artifact = SentimentAnalyzer.ONNX_FILES.get(backend)
+        if artifact:
+            report[backend]["path"] = artifact
+            report[backend]["size_mb"] = round(os.path.getsize(os.path.join(model_path, artifact)) / 1e6, 1)
+        logger.info(f"{backend}: {report[backend]}")
+        del candidate
+
+    manifest = {
+        "created_at": str(datetime.datetime.now()),
+        "threshold": threshold,
+        "eval_size": len(texts),
+        # Parity only holds for these exact files; SentimentAnalyzer compares it at load time
+        "model_hash": SentimentAnalyzer.model_files_hash(model_path),
+        "backends": report
+    }
+    manifest_path = os.path.join(model_path, SentimentAnalyzer.BACKENDS_MANIFEST)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Wrote parity report to {manifest_path}")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export and parity-check CPU inference backends.")
+    parser.add_argument("--model-path", default="model_output")
+    parser.add_argument("--eval-data", default=None, help="Held-out JSONL file with a 'title' field per line")
+    parser.add_argument(
+        "--backends", nargs="+", default=["torch_int8", "onnx", "onnx_int8"],
+        choices=[b for b in SentimentAnalyzer.BACKENDS if b != "torch"]
+    )
+    parser.add_argument("--threshold", type=float, default=0.99, help="Minimum top-label agreement with fp32")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+    run(args.model_path, args.eval_data, args.backends, args.threshold, args.limit, args.batch_size)
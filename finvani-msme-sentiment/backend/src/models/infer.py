@@ -1,10 +1,31 @@
 import torch
 import torch.nn.functional as F
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+import hashlib
+import json
 import logging
 import os
 
+# Adjust import based on where this script is run from
+try:
+    from src.config import settings
+    from src.models.prediction_cache import PredictionCache
+    from src.preprocess.normalize import normalize_batch, normalize_text
+except ImportError:
+    # Fallback for running directly as script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.config import settings
+    from src.models.prediction_cache import PredictionCache
+    from src.preprocess.normalize import normalize_batch, normalize_text
+
+# onnxruntime is optional: only needed for the "onnx"/"onnx_int8" backends
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -21,10 +42,32 @@ class SentimentAnalyzer:
         2: "POSITIVE"
     }
 
-    def __init__(self, model_path: str = "model_output"):
+    # Inference backends selectable via settings.INFERENCE_BACKEND
+    BACKENDS = ("torch", "torch_int8", "onnx", "onnx_int8")
+    # Files written by src/models/export_backends.py inside the model directory
+    BACKENDS_MANIFEST = "backends.json"
+    # Files whose contents the parity manifest is tied to (weights, config, tokenizer)
+    MODEL_FILE_SUFFIXES = (".safetensors", ".bin", "config.json", "tokenizer.json", ".model")
+    ONNX_FILES = {
+        "onnx": os.path.join("onnx", "model.onnx"),
+        "onnx_int8": os.path.join("onnx", "model.int8.onnx")
+    }
+
+    def __init__(
+        self,
+        model_path: str = "model_output",
+        backend: Optional[str] = None,
+        verify_parity: bool = True,
+        cache: Optional[PredictionCache] = None
+    ):
         """
         Args:
             model_path: HuggingFace model ID or local path.
+            backend: One of BACKENDS. Defaults to settings.INFERENCE_BACKEND.
+            verify_parity: Only use a non-torch backend if the export CLI recorded
+                that it agrees with the fp32 model; otherwise fall back to "torch".
+            cache: Prediction cache to consult before running the model. Defaults to
+                one built from settings (PREDICTION_CACHE_SIZE=0 disables it).
         """
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         
@@ -34,23 +77,140 @@ class SentimentAnalyzer:
             self.model_path = "distilbert-base-uncased-finetuned-sst-2-english"
         else:
             self.model_path = model_path
+
+        self.backend = self._resolve_backend(backend or settings.INFERENCE_BACKEND, verify_parity)
+        self.model = None
+        self.session = None
         
-        logger.info(f"Loading multilingual model {self.model_path} on {self.device}...")
+        logger.info(f"Loading multilingual model {self.model_path} on {self.device} (backend={self.backend})...")
         try:
             self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
-            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
-            self.model.to(self.device)
-            self.model.eval()
+            if self.backend.startswith("onnx"):
+                # The ONNX graph carries its own weights; the torch model is never materialised
+                onnx_path = os.path.join(self.model_path, self.ONNX_FILES[self.backend])
+                self.session = ort.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+                self._onnx_inputs = [i.name for i in self.session.get_inputs()]
+            else:
+                self.model = AutoModelForSequenceClassification.from_pretrained(
+                    self.model_path,
+                    # safetensors are memory-mapped and copied straight into the (not pre-initialised)
+                    # model, instead of unpickling a second full copy of the weights
+                    use_safetensors=True if self._has_safetensors() else None,
+                    low_cpu_mem_usage=True
+                )
+                if self.backend == "torch_int8":
+                    self.model = torch.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                self.model.to(self.device)
+                self.model.eval()
             logger.info("Model loaded successfully.")
         except Exception as e:
             logger.error(f"Failed to load model from {self.model_path}: {e}")
             raise e
 
+        self.model_version = self._fingerprint()
+        if cache is None and settings.PREDICTION_CACHE_SIZE > 0:
+            cache = PredictionCache(settings.PREDICTION_CACHE_SIZE, settings.PREDICTION_CACHE_PATH or None)
+        self.cache = cache
+
+    def _has_safetensors(self) -> bool:
+        """Whether a local model directory has safetensors weights (hub models are resolved by transformers)."""
+        return os.path.isdir(self.model_path) and any(
+            name.endswith(".safetensors") for name in os.listdir(self.model_path)
+        )
+
+    def _fingerprint(self) -> str:
+        """
+        Identifier of the loaded weights + backend, used to key cached predictions.
+        For a local directory it changes whenever the saved files change.
+        """
+        parts = [self.model_path, self.backend]
+        if os.path.isdir(self.model_path):
+            for name in sorted(os.listdir(self.model_path)):
+                path = os.path.join(self.model_path, name)
+                if os.path.isfile(path):
+                    stat = os.stat(path)
+                    parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+        digest = hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=6).hexdigest()
+        return f"{os.path.basename(os.path.normpath(self.model_path))}:{self.backend}:{digest}"
+
+    def _resolve_backend(self, backend: str, verify_parity: bool) -> str:
+        """Return the backend to actually use, falling back to eager torch when unsafe."""
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown inference backend '{backend}'. Expected one of {self.BACKENDS}")
+        if backend == "torch":
+            return backend
+
+        if backend == "torch_int8" and self.device.type != "cpu":
+            logger.warning("torch_int8 dynamic quantization is CPU-only. Falling back to torch.")
+            return "torch"
+        if backend.startswith("onnx"):
+            if ort is None:
+                logger.warning("onnxruntime is not installed. Falling back to torch.")
+                return "torch"
+            if not os.path.exists(os.path.join(self.model_path, self.ONNX_FILES[backend])):
+                logger.warning(f"No exported {backend} graph under '{self.model_path}'. Falling back to torch.")
+                return "torch"
+
+        if verify_parity:
+            manifest = self.load_backends_manifest(self.model_path)
+            report = manifest.get("backends", {}).get(backend)
+            if not report or not report.get("passed"):
+                logger.warning(f"Backend '{backend}' has no passing parity check against fp32. Falling back to torch.")
+                return "torch"
+            if manifest.get("model_hash") != self.model_files_hash(self.model_path):
+                # Retrained or pruned since the check: the recorded parity says nothing about these weights
+                logger.warning(f"Parity manifest for '{backend}' was measured on different model files. Falling back to torch.")
+                return "torch"
+        return backend
+
+    @classmethod
+    def model_files_hash(cls, model_path: str) -> Optional[str]:
+        """Content hash of the model's weight, config and tokenizer files (None if not a local directory)."""
+        if not os.path.isdir(model_path):
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for name in sorted(os.listdir(model_path)):
+            path = os.path.join(model_path, name)
+            if not os.path.isfile(path) or not name.endswith(cls.MODEL_FILE_SUFFIXES):
+                continue
+            digest.update(name.encode("utf-8") + b"\x00")
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def load_backends_manifest(cls, model_path: str) -> Dict[str, Any]:
+        """Read the parity report written by the export CLI (empty if absent)."""
+        manifest_path = os.path.join(model_path, cls.BACKENDS_MANIFEST)
+        if not os.path.exists(manifest_path):
+            return {}
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _forward(self, inputs) -> torch.Tensor:
+        """Run the configured backend and return raw logits."""
+        if self.session is not None:
+            feeds = {name: inputs[name].cpu().numpy() for name in self._onnx_inputs}
+            return torch.from_numpy(self.session.run(None, feeds)[0])
+        return self.model(**inputs).logits
+
     def predict(self, text: str) -> Dict[str, Any]:
         """
         Predict sentiment for a given text.
         Returns: {'label': str, 'score': float}
         """
+        # Same canonical text for the model and the cache key
+        text = normalize_text(text)
+        key = None
+        if self.cache is not None:
+            key = PredictionCache.make_key(text, self.model_version, normalized=True)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         inputs = self.tokenizer(
             text, 
             return_tensors="pt", 
@@ -60,17 +220,101 @@ class SentimentAnalyzer:
         ).to(self.device)
 
         with torch.no_grad():
-            outputs = self.model(**inputs)
-            probabilities = F.softmax(outputs.logits, dim=1)
-        
-        # Get the highest probability label
-        top_prob, top_idx = torch.max(probabilities, dim=1)
-        label_id = top_idx.item()
+            probabilities = F.softmax(self._forward(inputs), dim=1)
         
-        return {
-            "label": self.ID2LABEL.get(label_id, "UNKNOWN"),
-            "score": round(top_prob.item(), 4) # Return 4 decimal places
-        }
+        result = self._to_results(probabilities)[0]
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    def predict_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Predict sentiment for many texts with one forward pass per chunk.
+
+        Inputs are sorted by token length so each chunk is padded only to the
+        longest sequence inside it, instead of every headline paying for the
+        longest one in the whole request.
+
+        Args:
+            texts: Headlines to score.
+            batch_size: Maximum number of sequences per forward pass.
+        Returns: list of {'label': str, 'score': float} in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+
+        texts = normalize_batch(texts)
+        if self.cache is None:
+            return self._predict_uncached(texts, batch_size)
+
+        # Serve repeats from the cache; run the model once per distinct missing key
+        keys = [PredictionCache.make_key(text, self.model_version, normalized=True) for text in texts]
+        results: List[Dict[str, Any]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            if key in pending:
+                pending[key].append(i)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[key] = [i]
+
+        if pending:
+            missing_keys = list(pending)
+            fresh = self._predict_uncached([texts[pending[key][0]] for key in missing_keys], batch_size)
+            self.cache.put_many(zip(missing_keys, fresh))
+            for key, result in zip(missing_keys, fresh):
+                for i in pending[key]:
+                    results[i] = dict(result)
+        return results
+
+    def _predict_uncached(self, texts: List[str], batch_size: int) -> List[Dict[str, Any]]:
+        """Length-sorted chunked inference behind predict_batch (no cache)."""
+        # Tokenize once without padding; padding happens per chunk below
+        encodings = self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=512,
+        )
+        input_ids = encodings["input_ids"]
+        order = sorted(range(len(texts)), key=lambda i: len(input_ids[i]))
+
+        results: List[Dict[str, Any]] = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            features = [
+                {key: encodings[key][i] for key in encodings.keys()}
+                for i in chunk
+            ]
+            inputs = self.tokenizer.pad(
+                features,
+                padding="longest",
+                return_tensors="pt"
+            ).to(self.device)
+
+            with torch.no_grad():
+                probabilities = F.softmax(self._forward(inputs), dim=1)
+
+            for i, result in zip(chunk, self._to_results(probabilities)):
+                results[i] = result
+
+        return results
+
+    def _to_results(self, probabilities: torch.Tensor) -> List[Dict[str, Any]]:
+        """Map a (batch, num_labels) probability tensor to label/score dicts."""
+        # Get the highest probability label per row
+        top_probs, top_idxs = torch.max(probabilities, dim=1)
+        return [
+            {
+                "label": self.ID2LABEL.get(label_id, "UNKNOWN"),
+                "score": round(prob, 4) # Return 4 decimal places
+            }
+            for prob, label_id in zip(top_probs.tolist(), top_idxs.tolist())
+        ]
 
 if __name__ == "__main__":
     # Test with dummy data
@@ -86,8 +330,7 @@ if __name__ == "__main__":
         ]
         
         print("\n--- Inference Test ---")
-        for headline in test_headlines:
-            result = analyzer.predict(headline)
+        for headline, result in zip(test_headlines, analyzer.predict_batch(test_headlines)):
             print(f"Text: {headline}")
             print(f"Prediction: {result}\n")
             
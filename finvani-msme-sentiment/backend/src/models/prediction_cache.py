@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.preprocess.normalize import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_for_key(text: str) -> str:
+    """Canonical form used for cache keys (see src.preprocess.normalize)."""
+    return normalize_text(text)
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of sentiment predictions with an optional SQLite tier.
+
+    Keys are content hashes of the normalized headline plus the model identifier,
+    so a retrained model or a different backend never serves stale predictions.
+    The disk tier survives restarts; entries found there are promoted to memory.
+    """
+
+    def __init__(self, max_size: int = 10000, disk_path: Optional[str] = None):
+        """
+        Args:
+            max_size: Maximum number of in-memory entries before LRU eviction.
+            disk_path: Optional SQLite file for the persistent tier.
+        """
+        self.max_size = max_size
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Predictions come from the micro-batcher thread and from request handlers
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, label TEXT NOT NULL, score REAL NOT NULL)"
+            )
+            self._db.commit()
+            logger.info(f"Prediction cache disk tier at {disk_path}")
+
+    @staticmethod
+    def make_key(text: str, model_id: str, normalized: bool = False) -> str:
+        """Cache key for `text` under `model_id`; pass normalized=True if `text` is already normalized."""
+        payload = f"{model_id}\x00{text if normalized else normalize_for_key(text)}"
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(value)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT label, score FROM predictions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = {"label": row[0], "score": row[1]}
+                    self._insert(key, value)
+                    self.disk_hits += 1
+                    return dict(value)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]):
+        items = list(items)
+        with self._lock:
+            for key, value in items:
+                self._insert(key, {"label": value["label"], "score": value["score"]})
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO predictions (key, label, score) VALUES (?, ?, ?)",
+                    [(key, value["label"], value["score"]) for key, value in items]
+                )
+                self._db.commit()
+
+    def _insert(self, key: str, value: Dict[str, Any]):
+        """Insert into the memory tier; caller holds the lock."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM predictions")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "disk_path": self.disk_path
+        }
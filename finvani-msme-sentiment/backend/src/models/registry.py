@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# resource is POSIX-only; peak RSS is simply not reported elsewhere
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    # ru_maxrss is in KB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class ModelUnavailable(RuntimeError):
+    """Raised by ModelRegistry.get when the model failed to load."""
+
+
+class ModelRegistry:
+    """
+    Loads one model on first use or in a background warmup thread.
+
+    Nothing heavy happens at construction, so importing the API never pulls in
+    torch/transformers: `factory` (which does the imports) runs either when
+    warmup() is called at startup or when the first request needs the model.
+    Concurrent callers wait for the same load. Import and load timings and the
+    peak RSS around the load are kept for /ready.
+    """
+    IDLE, LOADING, READY, FAILED = "idle", "loading", "ready", "failed"
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[["ModelRegistry"], Any],
+        on_ready: Optional[List[Callable[[Any], None]]] = None
+    ):
+        """
+        Args:
+            name: Label for logs and status.
+            factory: Builds the model; receives the registry so it can record timings with timed().
+            on_ready: Callbacks receiving the model once it has loaded (e.g. starting background workers).
+        """
+        self.name = name
+        self.factory = factory
+        self.on_ready = list(on_ready or [])
+        self.state = self.IDLE
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self.rss_mb: Dict[str, Optional[float]] = {}
+
+        self._model: Any = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == self.READY
+
+    @contextmanager
+    def timed(self, step: str) -> Iterator[None]:
+        """Record the wall time of one loading step (e.g. "import", "load") in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[step] = round(time.perf_counter() - start, 3)
+
+    def _begin(self) -> bool:
+        """Claim the load; False if another caller already did or the model is ready."""
+        with self._lock:
+            if self.state in (self.LOADING, self.READY):
+                return False
+            self.state = self.LOADING
+            self.error = None
+            self._done.clear()
+            return True
+
+    def _load(self):
+        self.rss_mb["before"] = peak_rss_mb()
+        start = time.perf_counter()
+        try:
+            model = self.factory(self)
+        except Exception as e:
+            logger.error(f"Loading {self.name} model failed: {e}")
+            self.error = str(e)
+            self.state = self.FAILED
+            self._done.set()
+            return
+
+        self.timings["total"] = round(time.perf_counter() - start, 3)
+        self.rss_mb["after"] = peak_rss_mb()
+        self._model = model
+        self.state = self.READY
+        self._done.set()
+        logger.info(f"{self.name} model ready in {self.timings['total']:.1f}s ({self.timings}, peak RSS {self.rss_mb['after']} MB)")
+        for callback in self.on_ready:
+            try:
+                callback(model)
+            except Exception as e:
+                logger.error(f"{self.name} on_ready callback failed: {e}")
+
+    def warmup(self):
+        """Start loading on a background thread (no-op if already loading or loaded)."""
+        if self._begin():
+            self._thread = threading.Thread(target=self._load, name=f"{self.name}-warmup", daemon=True)
+            self._thread.start()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """The model, loading it on this thread if nobody has started yet."""
+        if self.state == self.READY:
+            return self._model
+        if self._begin():
+            self._load()
+        elif not self._done.wait(timeout):
+            raise TimeoutError(f"{self.name} model is still loading")
+        if self.state != self.READY:
+            raise ModelUnavailable(f"{self.name} model failed to load: {self.error}")
+        return self._model
+
+    def peek(self) -> Any:
+        """The model if it is loaded, else None (never triggers a load)."""
+        return self._model if self.state == self.READY else None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "error": self.error,
+            "timings_seconds": dict(self.timings),
+            "peak_rss_mb": dict(self.rss_mb)
+        }
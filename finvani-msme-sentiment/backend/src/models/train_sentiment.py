@@ -1,67 +1,284 @@
+import argparse
 import os
+import math
+import random
+import time
 import torch
 import logging
 import json
 import numpy as np
 from torch.utils.data import DataLoader
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, get_linear_schedule_with_warmup
 from torch.optim import AdamW
 from sklearn.metrics import accuracy_score, f1_score
-from typing import List, Dict
+from typing import Dict, List, Optional
 
 # Adjust import based on where this script is run from
 try:
-    from src.models.dataset import SentimentDataset
+    from src.models.dataset import (
+        DynamicPaddingCollator, LengthBucketSampler, PretokenizedDataset, TokenizedCorpus
+    )
+    from src.models.distill import (
+        DEFAULT_TEACHER, LABEL_IDS, build_student, cache_teacher_logits, distillation_loss, evaluation_report,
+        load_ingested_headlines, load_teacher
+    )
 except ImportError:
     # Fallback for running directly as script
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
-    from src.models.dataset import SentimentDataset
+    from src.models.dataset import (
+        DynamicPaddingCollator, LengthBucketSampler, PretokenizedDataset, TokenizedCorpus
+    )
+    from src.models.distill import (
+        DEFAULT_TEACHER, LABEL_IDS, build_student, cache_teacher_logits, distillation_loss, evaluation_report,
+        load_ingested_headlines, load_teacher
+    )
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class SentimentTrainer:
-    def __init__(self, model_name: str = "distilbert-base-uncased", num_labels: int = 3, learning_rate: float = 2e-5):
+    CHECKPOINT_FILE = "checkpoint-latest.pt"
+
+    def __init__(
+        self,
+        model_name: str = "distilbert-base-uncased",
+        num_labels: int = 3,
+        learning_rate: float = 2e-5,
+        grad_accum_steps: int = 1,
+        bf16: bool = False,
+        compile_model: bool = False,
+        num_threads: Optional[int] = None,
+        warmup_ratio: float = 0.06,
+        max_grad_norm: float = 1.0,
+        checkpoint_dir: Optional[str] = None,
+        checkpoint_every: int = 200,
+        log_every: int = 10,
+        model=None,
+        tokenizer=None,
+        distill_temperature: float = 2.0,
+        distill_alpha: float = 1.0
+    ):
+        """
+        Args:
+            model_name: HuggingFace model ID or local path.
+            num_labels: Output classes.
+            learning_rate: Peak AdamW learning rate (linear warmup, then linear decay).
+            grad_accum_steps: Batches accumulated per optimizer step.
+            bf16: Run forward/backward under CPU (or CUDA) bfloat16 autocast; weights stay fp32.
+            compile_model: Wrap the model in torch.compile for training.
+            num_threads: torch intra-op threads (None = torch default, usually all cores).
+            warmup_ratio: Share of optimizer steps spent warming up the learning rate.
+            max_grad_norm: Gradient clipping norm (0 disables).
+            checkpoint_dir: Where periodic checkpoints go (None disables checkpointing).
+            checkpoint_every: Optimizer steps between checkpoints.
+            log_every: Optimizer steps between timing/throughput log lines.
+            model: Already-built model to train instead of loading `model_name` (e.g. a distillation student).
+            tokenizer: Tokenizer matching `model` (required with it).
+            distill_temperature: Softmax temperature for the distillation loss.
+            distill_alpha: Weight of the distillation loss against cross-entropy on
+                the labels, for batches that carry 'teacher_logits'. Below 1 the
+                distillation data must be labelled, in the teacher's label order
+                (build_dataloader(label_map=LABEL_IDS)).
+        """
+        if grad_accum_steps < 1:
+            raise ValueError("grad_accum_steps must be >= 1")
+        if num_threads:
+            torch.set_num_threads(num_threads)
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model_name = model_name
+        self.learning_rate = learning_rate
+        self.grad_accum_steps = grad_accum_steps
+        self.bf16 = bf16
+        self.warmup_ratio = warmup_ratio
+        self.max_grad_norm = max_grad_norm
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.log_every = log_every
+        self.distill_temperature = distill_temperature
+        self.distill_alpha = distill_alpha
         
-        logger.info(f"Loading tokenizer and model: {model_name}")
-        self.tokenizer = DistilBertTokenizer.from_pretrained(model_name)
-        self.model = DistilBertForSequenceClassification.from_pretrained(model_name, num_labels=num_labels)
+        if model is not None:
+            if tokenizer is None:
+                raise ValueError("tokenizer is required when passing a model")
+            logger.info(f"Training provided model (threads={torch.get_num_threads()}, bf16={bf16})")
+            self.tokenizer, self.model = tokenizer, model
+        else:
+            logger.info(f"Loading tokenizer and model: {model_name} (threads={torch.get_num_threads()}, bf16={bf16})")
+            # Fast (Rust) tokenizer: the corpus is tokenized once, in batch, by build_dataloader
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+            self.model = AutoModelForSequenceClassification.from_pretrained(model_name, num_labels=num_labels)
         self.model.to(self.device)
+        # Compiled wrapper shares parameters with self.model, which is what gets saved
+        self.train_model = torch.compile(self.model) if compile_model else self.model
         
         self.optimizer = AdamW(self.model.parameters(), lr=learning_rate)
+        self.scheduler = None
         self.loss_fn = torch.nn.CrossEntropyLoss()
 
-    def train(self, train_loader: DataLoader, epochs: int = 3):
-        self.model.train()
-        for epoch in range(epochs):
-            total_loss = 0
+        # Progress, restored by load_checkpoint
+        self.global_step = 0
+        self.epoch = 0
+        self.batches_done = 0
+
+    def _autocast(self):
+        return torch.autocast(device_type=self.device.type, dtype=torch.bfloat16, enabled=self.bf16)
+
+    # --- checkpoints ---
+
+    def checkpoint_path(self) -> Optional[str]:
+        return os.path.join(self.checkpoint_dir, self.CHECKPOINT_FILE) if self.checkpoint_dir else None
+
+    def save_checkpoint(self, sampler=None):
+        """Model, optimizer, scheduler, sampler position and RNG states, written atomically."""
+        path = self.checkpoint_path()
+        if path is None:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        state = {
+            "model": self.model.state_dict(),
+            "optimizer": self.optimizer.state_dict(),
+            "scheduler": self.scheduler.state_dict() if self.scheduler is not None else None,
+            "sampler": sampler.state_dict(self.batches_done) if hasattr(sampler, "state_dict") else None,
+            "global_step": self.global_step,
+            "epoch": self.epoch,
+            "batches_done": self.batches_done,
+            "rng": {
+                "torch": torch.get_rng_state(),
+                "python": random.getstate(),
+                "numpy": np.random.get_state()
+            }
+        }
+        tmp_path = path + ".tmp"
+        torch.save(state, tmp_path)
+        os.replace(tmp_path, path)
+        logger.info(f"Checkpoint saved at step {self.global_step} (epoch {self.epoch + 1}, batch {self.batches_done}).")
+
+    def load_checkpoint(self, sampler=None) -> bool:
+        """Restore the latest checkpoint if there is one. Returns whether training resumes."""
+        path = self.checkpoint_path()
+        if path is None or not os.path.exists(path):
+            return False
+        state = torch.load(path, map_location=self.device, weights_only=False)
+        self.model.load_state_dict(state["model"])
+        self.optimizer.load_state_dict(state["optimizer"])
+        if self.scheduler is not None and state["scheduler"] is not None:
+            self.scheduler.load_state_dict(state["scheduler"])
+        if state["sampler"] is not None and hasattr(sampler, "load_state_dict"):
+            sampler.load_state_dict(state["sampler"])
+        self.global_step = state["global_step"]
+        self.epoch = state["epoch"]
+        self.batches_done = state["batches_done"]
+        torch.set_rng_state(state["rng"]["torch"])
+        random.setstate(state["rng"]["python"])
+        np.random.set_state(state["rng"]["numpy"])
+        logger.info(f"Resuming from step {self.global_step} (epoch {self.epoch + 1}, batch {self.batches_done}).")
+        return True
+
+    # --- training ---
+
+    def train(self, train_loader: DataLoader, epochs: int = 3, resume: bool = True, max_steps: Optional[int] = None):
+        """
+        Train for `epochs`, resuming from checkpoint_dir when a checkpoint exists.
+        `max_steps` stops (with a checkpoint) after that many optimizer steps in
+        total, e.g. to fit a run into a time-boxed CPU job and continue later.
+
+        Checkpoints are taken only on optimizer-step boundaries, so no partial
+        gradient is ever lost. With a LengthBucketSampler the data order is
+        replayed exactly from the first unseen batch.
+        """
+        dataset = train_loader.dataset
+        if self.distill_alpha < 1 and getattr(dataset, "teacher_logits", None) is not None \
+                and not getattr(dataset, "labelled", True):
+            raise ValueError(
+                "distill_alpha < 1 mixes in cross-entropy on gold labels, but some distillation "
+                "examples have no 'sentiment' label; label them or use distill_alpha=1"
+            )
+        sampler = train_loader.batch_sampler
+        batches_per_epoch = len(train_loader)
+        steps_per_epoch = math.ceil(batches_per_epoch / self.grad_accum_steps)
+        total_steps = steps_per_epoch * epochs
+        self.scheduler = get_linear_schedule_with_warmup(
+            self.optimizer, int(total_steps * self.warmup_ratio), total_steps
+        )
+        if not (resume and self.load_checkpoint(sampler)):
+            self.global_step, self.epoch, self.batches_done = 0, 0, 0
+
+        self.train_model.train()
+        while self.epoch < epochs:
+            epoch = self.epoch
+            total_loss, loss_batches = 0.0, 0
             logger.info(f"Epoch {epoch + 1}/{epochs} started.")
-            
+            if hasattr(sampler, "set_epoch") and self.batches_done == 0:
+                # New bucketed order every epoch (a resumed epoch keeps the order restored from the checkpoint)
+                sampler.set_epoch(epoch)
+
+            window_start = time.perf_counter()
+            window_examples = window_tokens = 0
+            self.optimizer.zero_grad()
             for batch in train_loader:
                 input_ids = batch['input_ids'].to(self.device)
                 attention_mask = batch['attention_mask'].to(self.device)
                 labels = batch['labels'].to(self.device)
 
-                self.optimizer.zero_grad()
-
-                outputs = self.model(
-                    input_ids=input_ids,
-                    attention_mask=attention_mask,
-                    labels=labels
-                )
-                
-                loss = outputs.loss
+                with self._autocast():
+                    outputs = self.train_model(
+                        input_ids=input_ids,
+                        attention_mask=attention_mask
+                    )
+                logits = outputs.logits.float()
+                if 'teacher_logits' in batch:
+                    loss = self.distill_alpha * distillation_loss(
+                        logits, batch['teacher_logits'].to(self.device), self.distill_temperature
+                    )
+                    if self.distill_alpha < 1:
+                        loss = loss + (1 - self.distill_alpha) * self.loss_fn(logits, labels)
+                else:
+                    loss = self.loss_fn(logits, labels)
+                # Average over the batches actually in this window; the last one of an epoch can be short
+                accum_start = self.batches_done - self.batches_done % self.grad_accum_steps
+                (loss / min(self.grad_accum_steps, batches_per_epoch - accum_start)).backward()
                 total_loss += loss.item()
+                loss_batches += 1
+                window_examples += labels.shape[0]
+                window_tokens += int(attention_mask.sum())
+                self.batches_done += 1
 
-                loss.backward()
+                # Step at every accumulation boundary and at the end of the epoch
+                if self.batches_done % self.grad_accum_steps and self.batches_done < batches_per_epoch:
+                    continue
+                if self.max_grad_norm:
+                    torch.nn.utils.clip_grad_norm_(self.model.parameters(), self.max_grad_norm)
                 self.optimizer.step()
+                self.scheduler.step()
+                self.optimizer.zero_grad()
+                self.global_step += 1
+
+                if self.global_step % self.log_every == 0:
+                    elapsed = time.perf_counter() - window_start
+                    logger.info(
+                        f"step {self.global_step}/{total_steps} loss={loss.item():.4f} "
+                        f"lr={self.scheduler.get_last_lr()[0]:.2e} {elapsed / self.log_every:.3f}s/step "
+                        f"{window_examples / elapsed:.1f} examples/s {window_tokens / elapsed:.0f} tokens/s"
+                    )
+                    window_start = time.perf_counter()
+                    window_examples = window_tokens = 0
+                if max_steps is not None and self.global_step >= max_steps:
+                    if self.batches_done == batches_per_epoch:
+                        self.epoch += 1
+                        self.batches_done = 0
+                    self.save_checkpoint(sampler)
+                    logger.info(f"Stopped at max_steps={max_steps}.")
+                    return
+                if self.checkpoint_dir and self.global_step % self.checkpoint_every == 0:
+                    self.save_checkpoint(sampler)
 
-            avg_loss = total_loss / len(train_loader)
+            avg_loss = total_loss / max(loss_batches, 1)
             logger.info(f"Epoch {epoch + 1} completed. Average Loss: {avg_loss:.4f}")
+            self.epoch += 1
+            self.batches_done = 0
+            self.save_checkpoint(sampler)
 
     def evaluate(self, val_loader: DataLoader) -> Dict[str, float]:
         self.model.eval()
@@ -94,43 +311,180 @@ class SentimentTrainer:
         
         logger.info(f"Saving model to {output_dir}")
         
-        # Save model state dict
-        model_path = os.path.join(output_dir, "model_state.bin")
-        torch.save(self.model.state_dict(), model_path)
+        # Weights + config as model.safetensors, so the API can memory-map them at load time
+        self.model.save_pretrained(output_dir, safe_serialization=True)
         
         # Save tokenizer
         self.tokenizer.save_pretrained(output_dir)
-        
-        # Save config (optional, but good for loading)
-        self.model.config.save_pretrained(output_dir)
         logger.info("Model saved successfully.")
 
+def build_dataloader(
+    data: List[Dict],
+    tokenizer,
+    batch_size: int = 32,
+    num_workers: int = 2,
+    shuffle: bool = True,
+    max_len: int = 128,
+    cache_root: str = "data/processed/tokenized",
+    seed: int = 0,
+    teacher_logits: Optional[np.ndarray] = None,
+    label_map: Optional[Dict[str, int]] = None
+) -> DataLoader:
+    """
+    DataLoader over a pre-tokenized, memory-mapped copy of `data`.
+
+    Batches come from a LengthBucketSampler and are padded per batch by the
+    DynamicPaddingCollator, so attention never runs over padding up to max_len.
+    Workers only slice the mmapped arrays; nothing is tokenized per epoch.
+    `teacher_logits` (one row per example of `data`) turns batches into distillation batches;
+    pass `label_map=LABEL_IDS` with them so any gold labels are in the teacher's order.
+    """
+    corpus = TokenizedCorpus.build(data, tokenizer, cache_root=cache_root, max_len=max_len, label_map=label_map)
+    sampler = LengthBucketSampler(corpus.lengths, batch_size, shuffle=shuffle, seed=seed)
+    return DataLoader(
+        PretokenizedDataset(corpus, teacher_logits),
+        batch_sampler=sampler,
+        collate_fn=DynamicPaddingCollator(tokenizer.pad_token_id),
+        num_workers=num_workers,
+        persistent_workers=num_workers > 0,
+        # Own generator: creating loader iterators must not draw from the global RNG (exact resume)
+        generator=torch.Generator().manual_seed(seed)
+    )
+
+def distill_student(args):
+    """
+    Distil the multilingual teacher into a smaller student on the ingested headlines.
+
+    The teacher's logits are computed once and cached; the student keeps
+    `--student-layers` of the teacher's encoder layers and only the vocabulary
+    the headlines use. It is saved like any fine-tuned model (safetensors +
+    tokenizer) so SentimentAnalyzer loads it from --output-dir unchanged, next to
+    distill_report.json comparing it with the teacher on held-out headlines.
+    """
+    headlines = load_ingested_headlines(args.raw_dir)
+    if len(headlines) < 10:
+        raise SystemExit(f"Need ingested headlines in {args.raw_dir} to distil on (found {len(headlines)})")
+    random.Random(args.seed).shuffle(headlines)
+    held_out = max(1, int(len(headlines) * args.eval_fraction))
+    train_texts, eval_texts = headlines[held_out:], headlines[:held_out]
+
+    teacher, teacher_tokenizer = load_teacher(args.distill_from)
+    teacher_logits = cache_teacher_logits(teacher, teacher_tokenizer, train_texts, batch_size=args.batch_size * 4)
+    student, student_tokenizer = build_student(teacher, teacher_tokenizer, train_texts, num_layers=args.student_layers)
+
+    trainer = SentimentTrainer(
+        model=student,
+        tokenizer=student_tokenizer,
+        learning_rate=args.lr,
+        grad_accum_steps=args.grad_accum,
+        bf16=args.bf16,
+        compile_model=args.compile,
+        num_threads=args.threads,
+        checkpoint_dir=args.checkpoint_dir,
+        checkpoint_every=args.checkpoint_every,
+        distill_temperature=args.temperature
+    )
+    dataloader = build_dataloader(
+        [{"headline": text} for text in train_texts],
+        student_tokenizer,
+        batch_size=args.batch_size,
+        num_workers=args.workers,
+        seed=args.seed,
+        teacher_logits=teacher_logits,
+        label_map=LABEL_IDS
+    )
+    trainer.train(dataloader, epochs=args.epochs, max_steps=args.max_steps)
+    if trainer.epoch < args.epochs:
+        return
+    trainer.save_model(args.output_dir)
+
+    labels = None
+    if args.eval_data:
+        # Gold labels in the teacher's order (0 NEG / 1 NEU / 2 POS)
+        with open(args.eval_data, "r", encoding="utf-8") as f:
+            examples = json.load(f)
+        examples = [item for item in examples if item.get("sentiment") in LABEL_IDS]
+        eval_texts = [item.get("headline") or item.get("text") or "" for item in examples]
+        labels = [LABEL_IDS[item["sentiment"]] for item in examples]
+    report = evaluation_report(teacher, teacher_tokenizer, trainer.model, student_tokenizer, eval_texts, labels=labels)
+    report["train_headlines"] = len(train_texts)
+    with open(os.path.join(args.output_dir, "distill_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    logger.info(
+        f"Student: {report['speedup']}x faster, {report['student']['weights_mb']} MB vs "
+        f"{report['teacher']['weights_mb']} MB, agreement with teacher {report['agreement']}"
+    )
+
 def main():
-    # Dummy Data for Testing
-    dummy_data = [
-        {"headline": "Profits soar for MSME sector", "sentiment": "POS"},
-        {"headline": "Severe losses reported due to inflation", "sentiment": "NEG"},
-        {"headline": "Market remains stable today", "sentiment": "NEU"},
-        {"headline": "Government announces new loan scheme", "sentiment": "POS"},
-        {"headline": "Restrictions imposed on exports", "sentiment": "NEG"},
-    ] * 10  # Duplicate to simulate batch
+    parser = argparse.ArgumentParser(description="Fine-tune the sentiment model on CPU or GPU.")
+    parser.add_argument("--model", default="distilbert-base-uncased")
+    parser.add_argument("--data", help="JSON list of {'headline', 'sentiment'} examples (default: built-in dummy data)")
+    parser.add_argument("--output-dir", default="model_output")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--grad-accum", type=int, default=1)
+    parser.add_argument("--lr", type=float, default=2e-5)
+    parser.add_argument("--bf16", action="store_true", help="bfloat16 autocast (CPU or GPU)")
+    parser.add_argument("--compile", action="store_true", help="torch.compile the model")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads")
+    parser.add_argument("--workers", type=int, default=2, help="DataLoader workers")
+    parser.add_argument("--checkpoint-dir", help="Periodic checkpoints; training resumes from here if present")
+    parser.add_argument("--checkpoint-every", type=int, default=200)
+    parser.add_argument("--max-steps", type=int, help="Stop (with a checkpoint) after this many optimizer steps")
+    parser.add_argument("--distill-from", nargs="?", const=DEFAULT_TEACHER,
+                        help="Distil this teacher (default: the multilingual sentiment model) into a smaller student")
+    parser.add_argument("--student-layers", type=int, default=4, help="Encoder layers kept in the student")
+    parser.add_argument("--temperature", type=float, default=2.0, help="Distillation softmax temperature")
+    parser.add_argument("--raw-dir", default="data/raw", help="Ingested JSONL headlines to distil on")
+    parser.add_argument("--eval-fraction", type=float, default=0.1, help="Headlines held out for the report")
+    parser.add_argument("--eval-data", help="Labelled JSON examples for the report (adds accuracy)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.distill_from:
+        distill_student(args)
+        return
+
+    if args.data:
+        with open(args.data, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        # Dummy Data for Testing
+        data = [
+            {"headline": "Profits soar for MSME sector", "sentiment": "POS"},
+            {"headline": "Severe losses reported due to inflation", "sentiment": "NEG"},
+            {"headline": "Market remains stable today", "sentiment": "NEU"},
+            {"headline": "Government announces new loan scheme", "sentiment": "POS"},
+            {"headline": "Restrictions imposed on exports", "sentiment": "NEG"},
+        ] * 10  # Duplicate to simulate batch
 
     logger.info("Initializing Trainer...")
-    trainer = SentimentTrainer()
+    trainer = SentimentTrainer(
+        args.model,
+        learning_rate=args.lr,
+        grad_accum_steps=args.grad_accum,
+        bf16=args.bf16,
+        compile_model=args.compile,
+        num_threads=args.threads,
+        checkpoint_dir=args.checkpoint_dir,
+        checkpoint_every=args.checkpoint_every
+    )
     
     logger.info("Preparing Dataset...")
-    dataset = SentimentDataset(dummy_data, trainer.tokenizer)
-    dataloader = DataLoader(dataset, batch_size=2, shuffle=True)
+    dataloader = build_dataloader(data, trainer.tokenizer, batch_size=args.batch_size, num_workers=args.workers)
     
     logger.info("Starting Training...")
-    trainer.train(dataloader, epochs=1)
+    trainer.train(dataloader, epochs=args.epochs, max_steps=args.max_steps)
+    if trainer.epoch < args.epochs:
+        # Stopped early by --max-steps; rerun with the same --checkpoint-dir to continue
+        return
     
     logger.info("Evaluating...")
     metrics = trainer.evaluate(dataloader)
     logger.info(f"Validation Metrics: {metrics}")
     
     logger.info("Saving Model...")
-    trainer.save_model("model_output")
+    trainer.save_model(args.output_dir)
 
 if __name__ == "__main__":
     main()
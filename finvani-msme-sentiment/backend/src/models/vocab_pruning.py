@@ -0,0 +1,307 @@
+"""
+Vocabulary pruning for SentencePiece-Unigram models (XLM-R and friends).
+
+Most of XLM-R's weights are its ~250k-row embedding matrix, while our traffic
+is Indian languages plus English. Run from backend/ to shrink a model to the
+pieces our ingested headlines and training data use, plus a safety margin:
+
+    python -m src.models.vocab_pruning --model model_output --output-dir model_output_pruned \
+        --data data/processed/train.json
+
+The pruned model directory loads in SentimentAnalyzer as is. The tool reports
+the memory saved and refuses to save unless predictions on held-out headlines
+are identical to the original model's.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import time
+import torch
+import numpy as np
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, PreTrainedTokenizerFast
+from tokenizers import Tokenizer
+from typing import Any, Dict, Iterable, List, Sequence
+
+# Adjust import based on where this script is run from
+try:
+    from src.preprocess.language_detect import script_counts
+except ImportError:
+    # Fallback for running directly as script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.preprocess.language_detect import script_counts
+
+logger = logging.getLogger(__name__)
+
+# SentencePiece word-boundary marker
+WORD_START = "\u2581"
+
+
+def used_token_ids(tokenizer, texts: Sequence[str], batch_size: int = 10000) -> List[int]:
+    """Sorted ids the tokenizer produces for `texts`, plus every special and added token."""
+    used = set(tokenizer.all_special_ids) | set(tokenizer.get_added_vocab().values())
+    for start in range(0, len(texts), batch_size):
+        for ids in tokenizer(list(texts[start:start + batch_size]), add_special_tokens=False)["input_ids"]:
+            used.update(ids)
+    return sorted(used)
+
+
+def prune_tokenizer(tokenizer, keep_ids: Sequence[int]) -> PreTrainedTokenizerFast:
+    """
+    Fast tokenizer restricted to `keep_ids` (ascending), renumbered 0..len-1.
+
+    Only SentencePiece-Unigram tokenizers (XLM-R, mT5, ...) are supported. A
+    text keeps its segmentation only if its best (Viterbi) path used nothing but
+    kept pieces: that path is still available and still scores highest. If the
+    path used a removed piece, the text is re-segmented with the remaining
+    pieces (a different, lower-scoring split, or <unk> if none covers it), so
+    its token ids and logits can change.
+    """
+    if not getattr(tokenizer, "is_fast", False):
+        raise ValueError("Vocabulary pruning needs a fast tokenizer")
+    spec = json.loads(tokenizer.backend_tokenizer.to_str())
+    if spec["model"]["type"] != "Unigram":
+        raise ValueError(f"Unsupported tokenizer model {spec['model']['type']}; only Unigram is supported")
+
+    keep_ids = sorted(keep_ids)
+    remap: Dict[int, int] = {old: new for new, old in enumerate(keep_ids)}
+    vocab = spec["model"]["vocab"]
+    spec["model"]["vocab"] = [vocab[old] for old in keep_ids]
+    if spec["model"].get("unk_id") is not None:
+        spec["model"]["unk_id"] = remap[spec["model"]["unk_id"]]
+    for token in spec.get("added_tokens", []):
+        token["id"] = remap[token["id"]]
+    _remap_post_processor(spec.get("post_processor"), remap)
+
+    pruned = PreTrainedTokenizerFast(
+        tokenizer_object=Tokenizer.from_str(json.dumps(spec)),
+        model_max_length=tokenizer.model_max_length,
+        padding_side=tokenizer.padding_side,
+        **{name: value for name, value in tokenizer.special_tokens_map.items() if isinstance(value, str)}
+    )
+    return pruned
+
+
+def _remap_post_processor(processor, remap: Dict[int, int]):
+    """Rewrite the special-token ids a post-processor inserts (RobertaProcessing, TemplateProcessing)."""
+    if not processor:
+        return
+    for key in ("cls", "sep"):
+        if key in processor:
+            processor[key][1] = remap[processor[key][1]]
+    for token in processor.get("special_tokens", {}).values():
+        token["ids"] = [remap[i] for i in token["ids"]]
+    for child in processor.get("processors", []):
+        _remap_post_processor(child, remap)
+
+
+def _slice_embedding(embedding: torch.nn.Embedding, index: torch.Tensor, padding_idx) -> torch.nn.Embedding:
+    pruned = torch.nn.Embedding(len(index), embedding.embedding_dim, padding_idx=padding_idx)
+    pruned.weight.data = embedding.weight.data.index_select(0, index).clone()
+    return pruned
+
+
+def prune_model_vocab(model, keep_ids: Sequence[int]):
+    """
+    Keep only the `keep_ids` rows of the input embedding matrix (and of an LM
+    output head, if the model has one), in place. Returns the model.
+    """
+    keep_ids = sorted(keep_ids)
+    remap = {old: new for new, old in enumerate(keep_ids)}
+    index = torch.tensor(keep_ids, dtype=torch.long)
+    config = model.config
+
+    pad = config.pad_token_id
+    model.set_input_embeddings(_slice_embedding(model.get_input_embeddings(), index, remap.get(pad)))
+    output = model.get_output_embeddings()
+    if output is not None:
+        pruned = torch.nn.Linear(output.in_features, len(keep_ids), bias=output.bias is not None)
+        pruned.weight.data = output.weight.data.index_select(0, index).clone()
+        if output.bias is not None:
+            pruned.bias.data = output.bias.data.index_select(0, index).clone()
+        model.set_output_embeddings(pruned)
+
+    config.vocab_size = len(keep_ids)
+    for name in ("pad_token_id", "bos_token_id", "eos_token_id"):
+        old = getattr(config, name, None)
+        if old is not None:
+            setattr(config, name, remap[old])
+    return model
+
+
+def embedding_megabytes(model) -> float:
+    """Size of the input embedding matrix (plus an untied output head) in MB."""
+    params = {id(p): p for p in model.get_input_embeddings().parameters()}
+    output = model.get_output_embeddings()
+    if output is not None:
+        params.update({id(p): p for p in output.parameters()})
+    return sum(p.numel() * p.element_size() for p in params.values()) / 2 ** 20
+
+
+def _served_piece(piece: str) -> bool:
+    """True if every character of `piece` is ASCII or in a script language_detect knows (Indic, Arabic)."""
+    return all(ord(ch) < 0x80 or ch == WORD_START or script_counts(ch) for ch in piece)
+
+
+def margin_token_ids(tokenizer, used: Iterable[int], margin: float = 0.25) -> List[int]:
+    """
+    Safety margin on top of the observed ids, so unseen headlines still segment
+    the way the full vocabulary would in most cases:
+
+    - every single-character piece of the served scripts (a word can always be
+      spelled out instead of becoming <unk>), and
+    - the `margin` * len(used) most probable remaining pieces of those scripts
+      (highest Unigram log-probability).
+    """
+    spec = json.loads(tokenizer.backend_tokenizer.to_str())
+    vocab = spec["model"]["vocab"]
+    used = set(used)
+    extra = set()
+    candidates = []
+    for i, (piece, score) in enumerate(vocab):
+        if i in used or not _served_piece(piece):
+            continue
+        if len(piece.lstrip(WORD_START)) <= 1:
+            extra.add(i)
+        else:
+            candidates.append((score, i))
+    candidates.sort(reverse=True)
+    extra.update(i for _, i in candidates[:int(len(used) * margin)])
+    return sorted(extra)
+
+
+def parameter_megabytes(model) -> float:
+    """Size of all (distinct) parameters and buffers in MB."""
+    tensors = {id(t): t for t in list(model.parameters()) + list(model.buffers())}
+    return sum(t.numel() * t.element_size() for t in tensors.values()) / 2 ** 20
+
+
+def verify_predictions(
+    reference_logits: np.ndarray,
+    reference_ids: List[List[int]],
+    model,
+    tokenizer,
+    keep_ids: Sequence[int],
+    texts: Sequence[str],
+    batch_size: int = 32,
+    max_len: int = 128
+) -> Dict[str, Any]:
+    """Compare the pruned model/tokenizer with the original's logits and token ids on `texts`."""
+    # Imported here: distill imports this module
+    from src.models.distill import batched_logits
+    logits = batched_logits(model, tokenizer, texts, batch_size, max_len)
+    pruned_ids = tokenizer(list(texts), truncation=True, max_length=max_len)["input_ids"]
+    same_tokens = sum(
+        [keep_ids[i] for i in row] == original
+        for row, original in zip(pruned_ids, reference_ids)
+    )
+    mismatches = np.nonzero(logits.argmax(axis=-1) != reference_logits.argmax(axis=-1))[0]
+    return {
+        "examples": len(texts),
+        "identical_tokenization": same_tokens,
+        "identical_predictions": len(texts) - len(mismatches),
+        "max_abs_logit_diff": float(np.abs(logits - reference_logits).max()) if len(texts) else 0.0,
+        "mismatched_headlines": [texts[i] for i in mismatches[:20]]
+    }
+
+
+def _load_texts(raw_dir: str, data_files: Sequence[str]) -> List[str]:
+    # Imported here: distill imports this module
+    from src.models.distill import load_ingested_headlines
+    texts = load_ingested_headlines(raw_dir)
+    seen = set(texts)
+    for path in data_files:
+        with open(path, "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                text = item.get("headline") or item.get("text") or ""
+                if text and text not in seen:
+                    seen.add(text)
+                    texts.append(text)
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune a Unigram model's vocabulary to the tokens our corpus uses.")
+    parser.add_argument("--model", default="model_output", help="Model directory or HuggingFace ID to prune")
+    parser.add_argument("--output-dir", default="model_output_pruned")
+    parser.add_argument("--raw-dir", default="data/raw", help="Ingested JSONL headlines")
+    parser.add_argument("--data", nargs="*", default=[], help="Training JSON files ({'headline', ...} lists)")
+    parser.add_argument("--margin", type=float, default=0.25,
+                        help="Extra most-probable served-script pieces, as a share of the observed ones")
+    parser.add_argument("--eval-fraction", type=float, default=0.1, help="Headlines held out for verification")
+    parser.add_argument("--max-len", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--allow-mismatch", action="store_true", help="Save even if held-out predictions differ")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # Imported here: distill imports this module
+    from src.models.distill import batched_logits
+
+    texts = _load_texts(args.raw_dir, args.data)
+    if len(texts) < 10:
+        raise SystemExit(f"Need headlines to prune against (found {len(texts)})")
+    random.Random(args.seed).shuffle(texts)
+    held_out = max(1, int(len(texts) * args.eval_fraction))
+    select_texts, eval_texts = texts[held_out:], texts[:held_out]
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model, use_fast=True)
+    model = AutoModelForSequenceClassification.from_pretrained(args.model)
+    model.eval()
+    before = {"vocab_size": model.config.vocab_size, "embedding_mb": embedding_megabytes(model),
+              "weights_mb": parameter_megabytes(model)}
+
+    # Reference outputs first: the model is pruned in place
+    reference_logits = batched_logits(model, tokenizer, eval_texts, args.batch_size, args.max_len)
+    reference_ids = tokenizer(eval_texts, truncation=True, max_length=args.max_len)["input_ids"]
+
+    start = time.perf_counter()
+    used = used_token_ids(tokenizer, select_texts)
+    margin = margin_token_ids(tokenizer, used, args.margin)
+    keep_ids = sorted(set(used) | set(margin))
+    pruned_tokenizer = prune_tokenizer(tokenizer, keep_ids)
+    prune_model_vocab(model, keep_ids)
+    logger.info(
+        f"Kept {len(keep_ids)} of {before['vocab_size']} tokens ({len(used)} observed + {len(margin)} margin) "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+    verification = verify_predictions(
+        reference_logits, reference_ids, model, pruned_tokenizer, keep_ids, eval_texts,
+        batch_size=args.batch_size, max_len=args.max_len
+    )
+    after = {"vocab_size": model.config.vocab_size, "embedding_mb": embedding_megabytes(model),
+             "weights_mb": parameter_megabytes(model)}
+    report = {
+        "source": args.model,
+        "select_headlines": len(select_texts),
+        "observed_tokens": len(used),
+        "margin_tokens": len(margin),
+        "before": {k: round(v, 1) for k, v in before.items()},
+        "after": {k: round(v, 1) for k, v in after.items()},
+        "saved_mb": round(before["weights_mb"] - after["weights_mb"], 1),
+        "verification": verification
+    }
+    logger.info(
+        f"Weights {before['weights_mb']:.0f} MB -> {after['weights_mb']:.0f} MB "
+        f"(embeddings {before['embedding_mb']:.0f} -> {after['embedding_mb']:.0f} MB); held-out predictions identical "
+        f"{verification['identical_predictions']}/{verification['examples']}, "
+        f"tokenization identical {verification['identical_tokenization']}/{verification['examples']}"
+    )
+    if verification["identical_predictions"] < verification["examples"] and not args.allow_mismatch:
+        logger.error(f"Held-out predictions changed, not saving: {verification['mismatched_headlines']}")
+        raise SystemExit(1)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    model.save_pretrained(args.output_dir, safe_serialization=True)
+    pruned_tokenizer.save_pretrained(args.output_dir)
+    with open(os.path.join(args.output_dir, "vocab_pruning_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    logger.info(f"Pruned model saved to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
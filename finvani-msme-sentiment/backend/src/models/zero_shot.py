@@ -1 +1,234 @@
-# Todo: Implement
+import torch
+import torch.nn.functional as F
+from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+import os
+
+# Adjust import based on where this script is run from
+try:
+    from src.config import settings
+    from src.preprocess.normalize import normalize_batch
+    from src.services.ner_entities import SECTORS
+except ImportError:
+    # Fallback for running directly as script
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+    from src.config import settings
+    from src.preprocess.normalize import normalize_batch
+    from src.services.ner_entities import SECTORS
+
+logger = logging.getLogger(__name__)
+
+# Sector labels shared with the gazetteer, so zero-shot and matched sectors line up
+DEFAULT_LABELS = list(SECTORS)
+
+
+class ZeroShotClassifier:
+    """
+    Zero-shot topic/sector labels for headlines in any language.
+
+    Two modes:
+      - "nli": a multilingual NLI model scores (headline, "This news is about {label}.")
+        pairs. Hypotheses are tokenized once when the label set is set, and each
+        headline is tokenized once; the pairs are assembled from those ids and run
+        in length-sorted batches across all headlines, so a call makes
+        ceil(headlines x labels / batch_size) forward passes instead of one per pair.
+      - "embedding": a multilingual sentence encoder embeds each headline once and
+        compares it with label embeddings computed when the label set is set, so
+        the cost grows with the number of headlines only.
+    """
+    MODES = ("nli", "embedding")
+    DEFAULT_MODELS = {
+        "nli": "MoritzLaurer/mDeBERTa-v3-base-xnli-multilingual-nli-2mil7",
+        "embedding": "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    }
+    DEFAULT_TEMPLATE = "This news is about {}."
+
+    def __init__(
+        self,
+        labels: Optional[Sequence[str]] = None,
+        mode: Optional[str] = None,
+        model_path: Optional[str] = None,
+        template: str = DEFAULT_TEMPLATE,
+        max_length: int = 128
+    ):
+        """
+        Args:
+            labels: Candidate labels. Defaults to the gazetteer sectors.
+            mode: "nli" or "embedding". Defaults to settings.ZERO_SHOT_MODE.
+            model_path: HuggingFace model ID or local path. Defaults to settings.ZERO_SHOT_MODEL,
+                then to DEFAULT_MODELS[mode].
+            template: Hypothesis / label description template with one `{}` for the label.
+            max_length: Token limit per headline (pairs get this plus the hypothesis).
+        """
+        self.mode = mode or settings.ZERO_SHOT_MODE
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown zero-shot mode '{self.mode}'; expected one of {self.MODES}")
+        self.model_path = model_path or settings.ZERO_SHOT_MODEL or self.DEFAULT_MODELS[self.mode]
+        self.template = template
+        self.max_length = max_length
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+        logger.info(f"Loading zero-shot {self.mode} model {self.model_path} on {self.device}...")
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+        if self.mode == "nli":
+            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
+            self.entailment_id = self._label_id("entail")
+            self.contradiction_id = self._label_id("contradict")
+        else:
+            self.model = AutoModel.from_pretrained(self.model_path)
+        self.model.to(self.device)
+        self.model.eval()
+
+        self.labels: List[str] = []
+        self.set_labels(labels or DEFAULT_LABELS)
+
+    def _label_id(self, prefix: str) -> int:
+        for label, idx in self.model.config.label2id.items():
+            if label.lower().startswith(prefix):
+                return idx
+        raise ValueError(f"NLI model {self.model_path} has no '{prefix}*' label: {self.model.config.label2id}")
+
+    def set_labels(self, labels: Sequence[str]):
+        """Replace the candidate labels and precompute their hypotheses or embeddings."""
+        if not labels:
+            raise ValueError("labels must not be empty")
+        self.labels = list(labels)
+        hypotheses = [self.template.format(label) for label in self.labels]
+        if self.mode == "nli":
+            # Bare ids; special tokens are added per pair in _pair_features
+            self._hypothesis_ids = self.tokenizer(hypotheses, add_special_tokens=False)["input_ids"]
+        else:
+            self._label_embeddings = self._embed(hypotheses, batch_size=64)
+
+    # --- embedding mode ---
+
+    def _embed(self, texts: List[str], batch_size: int) -> torch.Tensor:
+        """L2-normalised mean-pooled sentence embeddings, in input order."""
+        encodings = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        order = sorted(range(len(texts)), key=lambda i: len(encodings["input_ids"][i]))
+        embeddings: List[torch.Tensor] = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            inputs = self.tokenizer.pad(
+                [{key: encodings[key][i] for key in encodings.keys()} for i in chunk],
+                padding="longest",
+                return_tensors="pt"
+            ).to(self.device)
+            with torch.no_grad():
+                hidden = self.model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = F.normalize((hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9), dim=-1)
+            for i, row in zip(chunk, pooled):
+                embeddings[i] = row
+        return torch.stack(embeddings)
+
+    def _scores_embedding(self, texts: List[str], batch_size: int, multi_label: bool) -> torch.Tensor:
+        similarity = self._embed(texts, batch_size) @ self._label_embeddings.T
+        if multi_label:
+            # Cosine similarity in [-1, 1] mapped to [0, 1] per label
+            return (similarity + 1) / 2
+        # Sharpened softmax across labels; raw cosines are too close together to read as probabilities
+        return F.softmax(similarity / 0.05, dim=-1)
+
+    # --- NLI mode ---
+
+    def _pair_features(self, premise_ids: List[int], hypothesis_ids: List[int]) -> Dict[str, List[int]]:
+        input_ids = self.tokenizer.build_inputs_with_special_tokens(premise_ids, hypothesis_ids)
+        features = {"input_ids": input_ids, "attention_mask": [1] * len(input_ids)}
+        if "token_type_ids" in self.tokenizer.model_input_names:
+            features["token_type_ids"] = self.tokenizer.create_token_type_ids_from_sequences(
+                premise_ids, hypothesis_ids
+            )
+        return features
+
+    def _scores_nli(self, texts: List[str], batch_size: int, multi_label: bool) -> torch.Tensor:
+        premises = self.tokenizer(
+            texts, add_special_tokens=False, truncation=True, max_length=self.max_length
+        )["input_ids"]
+        n_labels = len(self.labels)
+        pairs = [(t, l) for t in range(len(texts)) for l in range(n_labels)]
+        # Premise length dominates the pair length; sort so each batch pads to a similar size
+        pairs.sort(key=lambda pair: len(premises[pair[0]]) + len(self._hypothesis_ids[pair[1]]))
+
+        logits = torch.empty(len(texts), n_labels, 2, device=self.device)
+        keep = [self.contradiction_id, self.entailment_id]
+        for start in range(0, len(pairs), batch_size):
+            chunk = pairs[start:start + batch_size]
+            inputs = self.tokenizer.pad(
+                [self._pair_features(premises[t], self._hypothesis_ids[l]) for t, l in chunk],
+                padding="longest",
+                return_tensors="pt"
+            ).to(self.device)
+            with torch.no_grad():
+                out = self.model(**inputs).logits[:, keep]
+            rows = torch.tensor([t for t, _ in chunk], device=self.device)
+            cols = torch.tensor([l for _, l in chunk], device=self.device)
+            logits[rows, cols] = out
+
+        if multi_label:
+            # Entailment vs contradiction for each label independently
+            return F.softmax(logits, dim=-1)[..., 1]
+        # Entailment logits compete across labels
+        return F.softmax(logits[..., 1], dim=-1)
+
+    # --- public API ---
+
+    def classify_batch(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        multi_label: bool = False,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank the candidate labels for each headline.
+
+        Args:
+            texts: Headlines, in any language the model covers.
+            batch_size: Sequences per forward pass (pairs in "nli" mode, headlines in "embedding").
+            multi_label: Score labels independently instead of as one distribution.
+            top_k: Keep only the best k labels per headline.
+        Returns: list of {'labels': [str], 'scores': [float]} (best first), in input order.
+        """
+        if not texts:
+            return []
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        texts = normalize_batch(texts)
+        if self.mode == "nli":
+            scores = self._scores_nli(texts, batch_size, multi_label)
+        else:
+            scores = self._scores_embedding(texts, batch_size, multi_label)
+
+        k = min(top_k or len(self.labels), len(self.labels))
+        top_scores, top_idxs = torch.topk(scores, k, dim=-1)
+        return [
+            {
+                "labels": [self.labels[i] for i in idxs],
+                "scores": [round(score, 4) for score in row]
+            }
+            for idxs, row in zip(top_idxs.tolist(), top_scores.tolist())
+        ]
+
+    def classify(self, text: str, multi_label: bool = False, top_k: Optional[int] = None) -> Dict[str, Any]:
+        return self.classify_batch([text], multi_label=multi_label, top_k=top_k)[0]
+
+    def tag_batch(self, texts: List[str], min_score: float = 0.5, batch_size: int = 32) -> List[List[str]]:
+        """Best label per headline as a one-item list, or [] where its score is below `min_score`."""
+        return [
+            result["labels"][:1] if result["scores"][0] >= min_score else []
+            for result in self.classify_batch(texts, batch_size=batch_size, top_k=1)
+        ]
+
+
+if __name__ == "__main__":
+    classifier = ZeroShotClassifier()
+    headlines = [
+        "Tiruppur garment exporters seek credit relief as US orders slow",
+        "सूरत के हीरा कारीगरों को मुद्रा लोन",
+        "சென்னை ஜவுளி ஏற்றுமதி சரிவு",
+    ]
+    for headline, result in zip(headlines, classifier.classify_batch(headlines, top_k=3)):
+        print(f"{headline}\n  {list(zip(result['labels'], result['scores']))}")
@@ -2,7 +2,7 @@ import random
 import json
 import time
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 try:
     from googletrans import Translator
 except ImportError:
@@ -50,18 +50,22 @@ class SyntheticHeadlineGenerator:
         if not self.translator:
             logger.warning("googletrans not installed or failed to import. Back-translation disabled.")
 
-    def generate_by_template(self, num_samples: int = 10) -> List[str]:
-        """Generates headlines by filling random slots in templates."""
+    def generate_by_template(self, num_samples: int = 10, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Generates headlines by filling random slots in templates.
+        Pass a seeded `rng` for a reproducible set (default: the global random module).
+        """
+        rng = rng or random
         headlines = []
         for _ in range(num_samples):
-            template = random.choice(self.TEMPLATES)
+            template = rng.choice(self.TEMPLATES)
             
             # Simple slot filling
             generated = template
             for key, values in self.SLOTS.items():
                 placeholder = "{" + key + "}"
                 if placeholder in generated:
-                    generated = generated.replace(placeholder, random.choice(values))
+                    generated = generated.replace(placeholder, rng.choice(values))
             
             headlines.append(generated)
         return headlines
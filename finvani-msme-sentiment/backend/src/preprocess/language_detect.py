@@ -1 +1,157 @@
-# Todo: Implement
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Unicode blocks are 128-code-point aligned for every Indic script, so `ord(ch) >> 7`
+# identifies the block with a single dict lookup per character.
+_BLOCK_SCRIPTS: Dict[int, str] = {
+    0x0000 >> 7: "Latin", 0x0080 >> 7: "Latin", 0x0100 >> 7: "Latin",
+    0x0180 >> 7: "Latin", 0x0200 >> 7: "Latin",
+    0x0600 >> 7: "Arabic", 0x0680 >> 7: "Arabic",
+    0x0900 >> 7: "Devanagari",
+    0x0980 >> 7: "Bengali",
+    0x0A00 >> 7: "Gurmukhi",
+    0x0A80 >> 7: "Gujarati",
+    0x0B00 >> 7: "Odia",
+    0x0B80 >> 7: "Tamil",
+    0x0C00 >> 7: "Telugu",
+    0x0C80 >> 7: "Kannada",
+    0x0D00 >> 7: "Malayalam",
+    0x1C00 >> 7: "OlChiki",
+    0xAB80 >> 7: "MeeteiMayek",
+    # Arabic presentation forms
+    **{block: "Arabic" for block in range(0xFB50 >> 7, (0xFEFF >> 7) + 1)},
+}
+
+# Script -> language when the script is used by one scheduled language only
+SCRIPT_LANGUAGES: Dict[str, str] = {
+    "Latin": "en",
+    "Gurmukhi": "pa",
+    "Gujarati": "gu",
+    "Odia": "or",
+    "Tamil": "ta",
+    "Telugu": "te",
+    "Kannada": "kn",
+    "Malayalam": "ml",
+    "OlChiki": "sat",
+    "MeeteiMayek": "mni",
+}
+
+# Languages written in each shared script; a hint from this set is trusted when the text is ambiguous
+SHARED_SCRIPTS: Dict[str, Tuple[str, ...]] = {
+    "Devanagari": ("hi", "mr", "ne", "mai", "sa", "doi", "gom", "ks", "sd"),
+    "Bengali": ("bn", "as", "mni"),
+    "Arabic": ("ur", "ks", "sd"),
+}
+
+# Characters that only occur in one language of a shared script
+_BENGALI_ASSAMESE = ("ৰ", "ৱ")  # ৰ ৱ
+_ARABIC_SINDHI = ("ڄ", "ڃ", "ٻ", "ڀ", "ڊ", "ڍ", "ڙ", "ڪ")
+
+# Compact weighted n-gram profiles for same-script Devanagari languages. Entries
+# padded with spaces are whole-word n-grams; the rest match anywhere (e.g. the
+# Marathi genitive "च्या" or Nepali plural "हरू").
+DEVANAGARI_PROFILES: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    "hi": (
+        (" है ", 2.0), (" हैं ", 2.0), (" में ", 2.0), (" और ", 2.0), (" नहीं ", 2.0), (" लिए ", 2.0),
+        (" की ", 1.0), (" के ", 1.0), (" का ", 1.0), (" से ", 1.0), (" को ", 0.5), (" पर ", 1.0),
+        (" गया ", 1.5), (" रहा ", 1.5), (" रही ", 1.5), (" सरकार ", 0.5),
+    ),
+    "mr": (
+        (" आहे ", 3.0), (" आहेत ", 3.0), (" आणि ", 3.0), (" मध्ये ", 3.0), (" नाही ", 2.0),
+        ("च्या ", 2.0), ("साठी ", 2.0), (" झाले ", 2.0), ("करण्यात ", 2.0), (" होते ", 1.0),
+        ("ळ", 1.5), (" व ", 1.0), ("ांना ", 1.5), ("ाची ", 1.0), ("ाचे ", 1.0),
+    ),
+    "ne": (
+        (" छ ", 2.0), (" छन् ", 3.0), ("हरू", 3.0), ("लाई ", 3.0), (" भएको ", 3.0), (" गरेको ", 3.0),
+        (" पनि ", 2.0), (" गर्न ", 2.0), (" मा ", 1.0), (" र ", 0.5), ("को ", 0.3), (" नेपाल", 1.5),
+    ),
+    "mai": (
+        (" अछि ", 3.0), (" छथि ", 3.0), (" छल ", 2.0), (" एहि ", 3.0), (" कऽ ", 3.0), ("केँ ", 3.0),
+        ("सँ ", 2.0), (" मे ", 1.0), (" ओ ", 1.0), (" सभ ", 2.0), (" मिथिला", 1.5),
+    ),
+}
+
+# Evidence needed before a profile overrides the feed's own language
+MIN_PROFILE_SCORE = 1.5
+
+
+def script_counts(text: str) -> Dict[str, int]:
+    """Letters per script (ASCII digits and punctuation are not counted as Latin)."""
+    counts: Dict[str, int] = {}
+    get = _BLOCK_SCRIPTS.get
+    for ch in text:
+        script = get(ord(ch) >> 7)
+        if script is None or (script == "Latin" and not ch.isalpha()):
+            continue
+        counts[script] = counts.get(script, 0) + 1
+    return counts
+
+
+def detect_script(text: str) -> Tuple[Optional[str], float]:
+    """Dominant script and its share of the counted letters, or (None, 0.0)."""
+    counts = script_counts(text)
+    if not counts:
+        return None, 0.0
+    script = max(counts, key=counts.get)
+    return script, counts[script] / sum(counts.values())
+
+
+def _score_devanagari(text: str) -> Dict[str, float]:
+    padded = f" {' '.join(text.split())} "
+    return {
+        lang: sum(weight for ngram, weight in profile if ngram in padded)
+        for lang, profile in DEVANAGARI_PROFILES.items()
+    }
+
+
+def _resolve_shared(script: str, text: str, hint: Optional[str]) -> str:
+    candidates = SHARED_SCRIPTS[script]
+    if script == "Bengali":
+        if any(ch in text for ch in _BENGALI_ASSAMESE):
+            return "as"
+        return hint if hint in candidates else "bn"
+    if script == "Arabic":
+        if any(ch in text for ch in _ARABIC_SINDHI):
+            return "sd"
+        return hint if hint in candidates else "ur"
+
+    scores = _score_devanagari(text)
+    best = max(scores, key=scores.get)
+    if scores[best] >= MIN_PROFILE_SCORE and (hint not in scores or scores[best] > scores[hint]):
+        return best
+    return hint if hint in candidates else "hi"
+
+
+def detect_language(text: str, hint: Optional[str] = None) -> Optional[str]:
+    """
+    Language code of a headline.
+
+    The Unicode block decides the script; scripts used by several languages
+    are resolved with script-specific letters (Assamese, Sindhi) or the
+    Devanagari n-gram profiles, falling back to `hint` (the feed language)
+    and then to the script's most common language.
+
+    Args:
+        text: Headline or short text.
+        hint: Language the text is expected to be in, e.g. the Google News `hl` of its feed.
+
+    Returns:
+        Language code, or `hint` if the text has no letters at all.
+    """
+    script, _ = detect_script(text)
+    if script is None:
+        return hint
+    if script in SHARED_SCRIPTS:
+        return _resolve_shared(script, text, hint)
+    return SCRIPT_LANGUAGES[script]
+
+
+def detect_batch(texts: Sequence[str], hints: Optional[Sequence[Optional[str]]] = None) -> List[Optional[str]]:
+    """detect_language over a list; `hints` is either None or one hint per text."""
+    if hints is None:
+        return [detect_language(text) for text in texts]
+    if len(hints) != len(texts):
+        raise ValueError("hints must have the same length as texts")
+    return [detect_language(text, hint) for text, hint in zip(texts, hints)]
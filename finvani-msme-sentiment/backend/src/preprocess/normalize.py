@@ -1 +1,165 @@
-# Todo: Implement
+import html
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Zero of each decimal digit block folded to ASCII 0-9
+_DIGIT_ZEROS = (
+    0x0660,  # Arabic-Indic
+    0x06F0,  # Extended Arabic-Indic (Urdu, Sindhi, Kashmiri)
+    0x0966,  # Devanagari
+    0x09E6,  # Bengali / Assamese
+    0x0A66,  # Gurmukhi
+    0x0AE6,  # Gujarati
+    0x0B66,  # Odia
+    0x0BE6,  # Tamil
+    0x0C66,  # Telugu
+    0x0CE6,  # Kannada
+    0x0D66,  # Malayalam
+    0x1C50,  # Ol Chiki
+    0xABF0,  # Meetei Mayek
+    0xFF10,  # Fullwidth
+)
+
+# Invisible characters that only change rendering: zero-width (non-)joiners and
+# spaces, word joiner, BOM, soft hyphen and bidi controls
+_DELETE = (
+    [0x00AD, 0x200B, 0x200C, 0x200D, 0x200E, 0x200F, 0x2060, 0xFEFF]
+    + list(range(0x202A, 0x202F))
+    + list(range(0x2066, 0x206A))
+)
+
+# Every kind of space becomes a plain space; runs are collapsed by the regex.
+# "\n" is left alone: it separates batch items and is folded before joining.
+_SPACES = [0x0009, 0x000B, 0x000C, 0x000D, 0x0085, 0x00A0, 0x1680, 0x202F, 0x205F, 0x3000, 0x2028, 0x2029] \
+    + list(range(0x2000, 0x200B))
+
+_PUNCTUATION = {
+    "‘": "'", "’": "'", "‚": "'", "‛": "'", "′": "'",
+    "“": '"', "”": '"', "„": '"', "‟": '"', "″": '"',
+    "‐": "-", "‑": "-", "‒": "-", "–": "-", "—": "-", "―": "-", "−": "-",
+    "…": "...",
+}
+
+
+def _build_table() -> Dict[int, Optional[str]]:
+    table: Dict[int, Optional[str]] = {}
+    for zero in _DIGIT_ZEROS:
+        for i in range(10):
+            table[zero + i] = str(i)
+    # Fullwidth ASCII letters and punctuation (U+FF01..U+FF5E)
+    for cp in range(0xFF01, 0xFF5F):
+        table.setdefault(cp, chr(cp - 0xFEE0))
+    for cp in _DELETE:
+        table[cp] = None
+    for cp in _SPACES:
+        table[cp] = " "
+    for src, dst in _PUNCTUATION.items():
+        table[ord(src)] = dst
+    return table
+
+
+TRANSLATE_TABLE = _build_table()
+# Most text contains only a handful of characters from the table, so find those with a
+# character class instead of a dict lookup per character (str.translate)
+_TRANSLATABLE = re.compile("[" + "".join(re.escape(chr(cp)) for cp in sorted(TRANSLATE_TABLE)) + "]")
+
+
+def _translate_match(match: "re.Match") -> str:
+    return TRANSLATE_TABLE[ord(match.group())] or ""
+
+# Batches are joined on "\n" (items never contain one once folded), so every
+# pattern avoids crossing it and `^`/`$` work per headline in MULTILINE mode.
+# After translation all other whitespace is a plain space, so only runs need replacing.
+_CLEANUP = re.compile(r" {2,}")
+# Runs of tags and spaces around them collapse together into one space
+_TAG = r"<[^<>\n]*>"
+_CLEANUP_HTML = re.compile(rf"(?:{_TAG}| )*{_TAG}(?:{_TAG}| )*| {{2,}}")
+_TRIM = re.compile(r"^ | $", re.MULTILINE)
+
+
+def _fold_newlines(text: str) -> str:
+    return text.replace("\n", " ") if "\n" in text else text
+
+
+def _pipeline(text: str, strip_html: bool) -> str:
+    """Run the whole pipeline once over `text` (a single headline or a "\\n"-joined batch)."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFC", text)
+    text = _TRANSLATABLE.sub(_translate_match, text)
+    if "&" in text:
+        unescaped = html.unescape(text)
+        if unescaped.count("\n") != text.count("\n"):
+            # An entity decoded to a newline; redo per line so batch items stay aligned
+            unescaped = "\n".join(_fold_newlines(html.unescape(line)) for line in text.split("\n"))
+        text = _TRANSLATABLE.sub(_translate_match, unescaped)
+    text = (_CLEANUP_HTML if strip_html else _CLEANUP).sub(" ", text)
+    return _TRIM.sub("", text)
+
+
+def _strip_publishers(texts: List[str], publishers: Sequence[Optional[str]]) -> List[str]:
+    """
+    Drop the " - Publisher" tail Google News appends to titles. Only the
+    publisher the feed named in the entry's <source> is removed, so a headline
+    that merely ends in " - something" keeps it.
+    """
+    names = _pipeline("\n".join(_fold_newlines(p or "") for p in publishers), False).split("\n")
+    stripped = []
+    for text, name in zip(texts, names):
+        suffix = f" - {name}"
+        if name and text.endswith(suffix):
+            text = text[:-len(suffix)]
+        stripped.append(text)
+    return stripped
+
+
+def normalize_text(text: str, publisher: Optional[str] = None, strip_html: bool = False) -> str:
+    """
+    Canonical form of a headline for the model, cache keys and dedup hashes.
+
+    NFC, Indic/Arabic/fullwidth digits as ASCII, zero-width and bidi
+    characters removed, typographic quotes and dashes folded, HTML entities
+    decoded and whitespace collapsed.
+
+    Args:
+        text: Raw text.
+        publisher: Google News <source> of the entry; a trailing " - publisher" is dropped.
+        strip_html: Remove HTML tags (for feed summaries).
+    """
+    if not text:
+        return ""
+    text = _pipeline(_fold_newlines(text), strip_html)
+    return _strip_publishers([text], [publisher])[0] if publisher else text
+
+
+def normalize_batch(
+    texts: Sequence[str],
+    publishers: Optional[Sequence[Optional[str]]] = None,
+    strip_html: bool = False
+) -> List[str]:
+    """
+    normalize_text over a list in one pass: the batch is joined on newlines, run
+    through the translate table and regexes once, and split again.
+    `publishers` is aligned with `texts` (None where an entry named none).
+    """
+    if not texts:
+        return []
+    # Line breaks inside an item would shift the split; fold them before joining
+    joined = "\n".join(_fold_newlines(text) for text in texts)
+    normalized = _pipeline(joined, strip_html).split("\n")
+    if publishers is not None and any(publishers):
+        normalized = _strip_publishers(normalized, publishers)
+    return normalized
+
+
+def normalize_headline(text: str, publisher: Optional[str] = None) -> str:
+    """normalize_text for Google News titles (the entry's publisher suffix removed)."""
+    return normalize_text(text, publisher=publisher)
+
+
+def clean_summary(summary: str) -> str:
+    """Plain text of an RSS summary (tags stripped, entities decoded)."""
+    return normalize_text(summary, strip_html=True)
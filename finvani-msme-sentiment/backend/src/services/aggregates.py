@@ -0,0 +1,403 @@
+import bisect
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LABELS = ("POSITIVE", "NEUTRAL", "NEGATIVE")
+GRANULARITIES = ("hour", "day")
+
+# (language, query, label) -> [count, score_sum]
+Cell = Dict[Tuple[str, str, str], List[float]]
+# Entity dimensions counted per mention (an article naming two states counts for both)
+MENTION_DIMENSIONS = ("state", "sector")
+
+
+def _bucket_start(ts: datetime.datetime, granularity: str) -> str:
+    if granularity == "hour":
+        return ts.strftime("%Y-%m-%dT%H:00")
+    return ts.strftime("%Y-%m-%d")
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    try:
+        ts = datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    # Buckets are in UTC so hourly series line up across sources
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+class SentimentAggregates:
+    """
+    Running per-bucket sentiment counts and score sums.
+
+    Cells are keyed by (granularity, bucket) -> (language, query, label) and are
+    updated incrementally from the scored-article stream
+    (data/processed/sentiment/YYYY-MM-DD.jsonl): each refresh reads only the
+    bytes appended since the stored watermark. Buckets are kept in sorted
+    order so a time-range query touches only the buckets in range, and
+    all-time totals are maintained alongside, so query latency does not depend
+    on how much history is stored. State and watermarks are snapshotted to
+    disk at most every `snapshot_interval` seconds and on close(), so restarts
+    only re-read what was appended after the last snapshot. A scored file that
+    was truncated or replaced (smaller than its watermark, or a new inode)
+    cannot be un-counted, so it triggers a full rebuild from all files.
+
+    Daily buckets also keep (dimension, value, label) cells for the states and
+    sectors found by the entity extractor; an article that names no state is
+    left off the state map rather than guessed from its language.
+    """
+    SNAPSHOT_VERSION = 3
+
+    def __init__(
+        self,
+        scored_dir: Path,
+        snapshot_path: Optional[Path] = None,
+        hourly_retention_days: int = 14,
+        refresh_interval: float = 5.0,
+        snapshot_interval: float = 60.0
+    ):
+        """
+        Args:
+            scored_dir: Directory of scored-article JSONL files to tail.
+            snapshot_path: Where counters and watermarks are persisted (None = memory only).
+            hourly_retention_days: Hourly buckets older than this are dropped; daily ones are kept.
+            refresh_interval: Minimum seconds between filesystem checks triggered by queries.
+            snapshot_interval: Minimum seconds between snapshot writes (0 = after every update).
+        """
+        self.scored_dir = Path(scored_dir)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.hourly_retention_days = hourly_retention_days
+        self.refresh_interval = refresh_interval
+        self.snapshot_interval = snapshot_interval
+
+        self._lock = threading.Lock()
+        # Serialises refreshes from request handlers and the scoring worker
+        self._refresh_lock = threading.Lock()
+        self._buckets: Dict[str, Dict[str, Cell]] = {g: {} for g in GRANULARITIES}
+        self._bucket_order: Dict[str, List[str]] = {g: [] for g in GRANULARITIES}
+        self._totals: Cell = {}
+        # Day bucket -> (dimension, value, label) -> [count, score_sum]
+        self._mentions: Dict[str, Cell] = {}
+        self._mention_totals: Cell = {}
+        self._offsets: Dict[str, int] = {}
+        # Inode each watermark belongs to; a different one means the file was replaced
+        self._inodes: Dict[str, int] = {}
+        self._last_refresh = 0.0
+        self._last_snapshot = time.monotonic()
+        self._dirty = False
+        self.records = 0
+        self._load_snapshot()
+
+    # --- updates ---
+
+    def observe(self, record: Dict[str, Any]):
+        """Add one scored article to every granularity and the totals."""
+        label = record.get("label")
+        if label not in LABELS:
+            return
+        ts = _parse_time(record.get("published")) or _parse_time(record.get("fetched_at"))
+        if ts is None:
+            return
+        key = (record.get("language") or "unknown", record.get("query") or "", label)
+        score = float(record.get("score") or 0.0)
+
+        with self._lock:
+            for granularity in GRANULARITIES:
+                bucket = _bucket_start(ts, granularity)
+                cells = self._buckets[granularity].get(bucket)
+                if cells is None:
+                    cells = self._buckets[granularity][bucket] = {}
+                    bisect.insort(self._bucket_order[granularity], bucket)
+                cell = cells.setdefault(key, [0, 0.0])
+                cell[0] += 1
+                cell[1] += score
+            total = self._totals.setdefault(key, [0, 0.0])
+            total[0] += 1
+            total[1] += score
+
+            mentions = self._mentions.setdefault(_bucket_start(ts, "day"), {})
+            for mention in self._mention_keys(record, label):
+                for target in (mentions, self._mention_totals):
+                    cell = target.setdefault(mention, [0, 0.0])
+                    cell[0] += 1
+                    cell[1] += score
+            self.records += 1
+
+    @staticmethod
+    def _mention_keys(record: Dict[str, Any], label: str) -> List[Tuple[str, str, str]]:
+        return [("state", state, label) for state in record.get("states") or []] + \
+            [("sector", sector, label) for sector in record.get("sectors") or []]
+
+    def refresh(self, force: bool = False) -> int:
+        """Consume lines appended to the scored files since the last watermark. Returns records added."""
+        now = time.monotonic()
+        if not force and now - self._last_refresh < self.refresh_interval:
+            return 0
+        with self._refresh_lock:
+            self._last_refresh = now
+            return self._consume()
+
+    def _reset(self):
+        with self._lock:
+            self._buckets = {g: {} for g in GRANULARITIES}
+            self._bucket_order = {g: [] for g in GRANULARITIES}
+            self._totals = {}
+            self._mentions = {}
+            self._mention_totals = {}
+            self._offsets = {}
+            self._inodes = {}
+            self.records = 0
+
+    def _rewritten(self, files: List[Tuple[Path, os.stat_result]]) -> Optional[str]:
+        """Name of a scored file that shrank below its watermark, was replaced or vanished (None if none)."""
+        seen = set()
+        for path, stat in files:
+            seen.add(path.name)
+            offset = self._offsets.get(path.name)
+            if offset is None:
+                continue
+            inode = self._inodes.get(path.name)
+            if stat.st_size < offset or (inode is not None and inode != stat.st_ino):
+                return path.name
+        missing = [name for name, offset in self._offsets.items() if offset and name not in seen]
+        return missing[0] if missing else None
+
+    def _consume(self) -> int:
+        if not self.scored_dir.exists():
+            return 0
+
+        files = [(path, path.stat()) for path in sorted(self.scored_dir.glob("*.jsonl"))]
+        rewritten = self._rewritten(files)
+        if rewritten:
+            logger.warning(f"Scored file {rewritten} was truncated or replaced; rebuilding aggregates from scratch.")
+            self._reset()
+
+        added = 0
+        for path, stat in files:
+            size = stat.st_size
+            start = self._offsets.get(path.name, 0)
+            self._inodes[path.name] = stat.st_ino
+            if size <= start:
+                continue
+            with open(path, "rb") as f:
+                f.seek(start)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Partially written line; picked up next time
+                        break
+                    start += len(line)
+                    try:
+                        self.observe(json.loads(line))
+                        added += 1
+                    except json.JSONDecodeError:
+                        continue
+            self._offsets[path.name] = start
+
+        if added or rewritten:
+            self._prune_hourly()
+            self._dirty = True
+            logger.info(f"Aggregates updated with {added} scored articles.")
+        if self._dirty and time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self._save_snapshot()
+        return added
+
+    def close(self):
+        """Write a final snapshot if anything changed since the last one (call at shutdown)."""
+        with self._refresh_lock:
+            if self._dirty:
+                self._save_snapshot()
+
+    def _prune_hourly(self):
+        cutoff = (datetime.datetime.utcnow() - datetime.timedelta(days=self.hourly_retention_days)).strftime("%Y-%m-%dT%H:00")
+        with self._lock:
+            order = self._bucket_order["hour"]
+            drop = bisect.bisect_left(order, cutoff)
+            for bucket in order[:drop]:
+                del self._buckets["hour"][bucket]
+            del order[:drop]
+
+    # --- queries ---
+
+    @staticmethod
+    def _summarise(cells: List[List[float]]) -> Dict[str, Any]:
+        counts = {label: 0 for label in LABELS}
+        score_sum = 0.0
+        for label, count, total in cells:
+            counts[label] += count
+            score_sum += total
+        n = sum(counts.values())
+        return {
+            "count": n,
+            "counts": counts,
+            # Share of positive minus share of negative, in [-1, 1]
+            "net_sentiment": round((counts["POSITIVE"] - counts["NEGATIVE"]) / n, 4) if n else 0.0,
+            "avg_score": round(score_sum / n, 4) if n else 0.0
+        }
+
+    @staticmethod
+    def _matches(key: Tuple[str, str, str], language: Optional[str], query: Optional[str]) -> bool:
+        return (language is None or key[0] == language) and (query is None or key[1] == query)
+
+    def timeseries(
+        self,
+        granularity: str = "day",
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        language: Optional[str] = None,
+        query: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """One summary per bucket in [since, until], oldest first."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {GRANULARITIES}")
+        self.refresh()
+        with self._lock:
+            order = self._bucket_order[granularity]
+            lo = bisect.bisect_left(order, since) if since else 0
+            hi = bisect.bisect_right(order, until) if until else len(order)
+            series = []
+            for bucket in order[lo:hi]:
+                cells = [
+                    [key[2], cell[0], cell[1]]
+                    for key, cell in self._buckets[granularity][bucket].items()
+                    if self._matches(key, language, query)
+                ]
+                if cells:
+                    series.append({"bucket": bucket, **self._summarise(cells)})
+        return series
+
+    def _group(self, source: Cell, dim: int) -> Dict[str, List[List[float]]]:
+        groups: Dict[str, List[List[float]]] = {}
+        for key, cell in source.items():
+            groups.setdefault(key[dim], []).append([key[2], cell[0], cell[1]])
+        return groups
+
+    def _window(self, since: Optional[str]) -> Cell:
+        """Totals for all time, or summed daily buckets from `since` onwards."""
+        if since is None:
+            return dict(self._totals)
+        order = self._bucket_order["day"]
+        window: Cell = {}
+        for bucket in order[bisect.bisect_left(order, since):]:
+            for key, cell in self._buckets["day"][bucket].items():
+                acc = window.setdefault(key, [0, 0.0])
+                acc[0] += cell[0]
+                acc[1] += cell[1]
+        return window
+
+    def by_language(self, since: Optional[str] = None, query: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            source = {k: v for k, v in self._window(since).items() if self._matches(k, None, query)}
+            groups = self._group(source, 0)
+        return sorted(
+            ({"language": lang, **self._summarise(cells)} for lang, cells in groups.items()),
+            key=lambda row: row["count"],
+            reverse=True
+        )
+
+    def by_query(self, since: Optional[str] = None, language: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.refresh()
+        with self._lock:
+            source = {k: v for k, v in self._window(since).items() if self._matches(k, language, None)}
+            groups = self._group(source, 1)
+        return sorted(
+            ({"query": query, **self._summarise(cells)} for query, cells in groups.items()),
+            key=lambda row: row["count"],
+            reverse=True
+        )
+
+    def _by_mention(self, dimension: str, since: Optional[str]) -> Dict[str, List[List[float]]]:
+        self.refresh()
+        with self._lock:
+            if since is None:
+                sources = [self._mention_totals]
+            else:
+                order = self._bucket_order["day"]
+                sources = [self._mentions.get(b, {}) for b in order[bisect.bisect_left(order, since):]]
+            groups: Dict[str, List[List[float]]] = {}
+            for source in sources:
+                for (dim, value, label), cell in source.items():
+                    if dim == dimension:
+                        groups.setdefault(value, []).append([label, cell[0], cell[1]])
+        return groups
+
+    def by_sector(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Sentiment per sector mentioned in the headlines."""
+        return sorted(
+            ({"sector": sector, **self._summarise(cells)} for sector, cells in self._by_mention("sector", since).items()),
+            key=lambda row: row["count"],
+            reverse=True
+        )
+
+    def heatmap(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Sentiment per Indian state mentioned in the headlines."""
+        return [
+            {"region": region, **self._summarise(cells)}
+            for region, cells in sorted(self._by_mention("state", since).items())
+        ]
+
+    # --- persistence ---
+
+    def _save_snapshot(self):
+        if self.snapshot_path is None:
+            return
+        with self._lock:
+            snapshot = {
+                "version": self.SNAPSHOT_VERSION,
+                "offsets": dict(self._offsets),
+                "inodes": dict(self._inodes),
+                "records": self.records,
+                "buckets": {
+                    g: {b: [[*k, *c] for k, c in cells.items()] for b, cells in self._buckets[g].items()}
+                    for g in GRANULARITIES
+                },
+                "totals": [[*k, *c] for k, c in self._totals.items()],
+                "mentions": {b: [[*k, *c] for k, c in cells.items()] for b, cells in self._mentions.items()},
+                "mention_totals": [[*k, *c] for k, c in self._mention_totals.items()]
+            }
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+        self._last_snapshot = time.monotonic()
+        self._dirty = False
+
+    def _load_snapshot(self):
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable aggregates snapshot {self.snapshot_path}: {e}")
+            return
+        if snapshot.get("version") != self.SNAPSHOT_VERSION:
+            return
+
+        self._offsets = snapshot.get("offsets", {})
+        self._inodes = snapshot.get("inodes", {})
+        self.records = snapshot.get("records", 0)
+        for g in GRANULARITIES:
+            for bucket, rows in snapshot.get("buckets", {}).get(g, {}).items():
+                self._buckets[g][bucket] = {(r[0], r[1], r[2]): [r[3], r[4]] for r in rows}
+            self._bucket_order[g] = sorted(self._buckets[g])
+        self._totals = {(r[0], r[1], r[2]): [r[3], r[4]] for r in snapshot.get("totals", [])}
+        self._mentions = {
+            bucket: {(r[0], r[1], r[2]): [r[3], r[4]] for r in rows}
+            for bucket, rows in snapshot.get("mentions", {}).items()
+        }
+        self._mention_totals = {(r[0], r[1], r[2]): [r[3], r[4]] for r in snapshot.get("mention_totals", [])}
+        logger.info(f"Loaded aggregates snapshot ({self.records} records).")
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching in front of a batched predict function.
+
+    Concurrent callers `await submit(text)`. A single worker task collects
+    queued requests until either `max_batch_size` is reached or `max_wait_ms`
+    has passed since the first one arrived, then runs one batched forward pass
+    in a dedicated worker thread so the event loop (and /health) stays responsive.
+    """
+    # Upper edges of the batch-size histogram buckets
+    HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[str]], List[Dict[str, Any]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Args:
+            predict_batch: Function mapping a list of texts to a list of results (same order).
+            max_batch_size: Maximum number of requests per forward pass.
+            max_wait_ms: How long to keep gathering after the first queued request.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        # One thread: batches run back to back and never compete for the CPU
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batcher")
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Stats
+        self._batch_histogram: Dict[str, int] = {self._bucket_label(b): 0 for b in self.HISTOGRAM_BUCKETS}
+        self._batches = 0
+        self._requests = 0
+        self._errors = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+
+    def _bucket_label(self, upper: int) -> str:
+        return f"<={upper}"
+
+    def _ensure_started(self):
+        """Start the worker on the running loop (lazily, so import never needs a loop)."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+            logger.info(
+                f"Micro-batcher started (max_batch_size={self.max_batch_size}, max_wait_ms={self.max_wait_ms})"
+            )
+
+    async def submit(self, text: str) -> Dict[str, Any]:
+        """Queue a single text and wait for its result."""
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def submit_many(self, texts: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """Run an already-batched request on the batcher's thread, serialised with micro-batches."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: self.predict_batch(texts, **kwargs))
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future, float]]:
+        """Block for the first request, then gather more until the size or time limit."""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without yielding
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+
+            # Drop callers that went away while queued
+            batch = [item for item in batch if not item[1].cancelled()]
+            if not batch:
+                continue
+
+            self._record_batch(batch)
+            texts = [text for text, _, _ in batch]
+            try:
+                results = await self._loop.run_in_executor(self.executor, self.predict_batch, texts)
+            except Exception as e:
+                logger.error(f"Micro-batch of {len(texts)} failed: {e}")
+                self._errors += 1
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _record_batch(self, batch: List[Tuple[str, asyncio.Future, float]]):
+        now = time.perf_counter()
+        size = len(batch)
+        self._batches += 1
+        self._requests += size
+        for _, _, enqueued_at in batch:
+            wait_ms = (now - enqueued_at) * 1000.0
+            self._wait_total_ms += wait_ms
+            self._wait_max_ms = max(self._wait_max_ms, wait_ms)
+
+        for upper in self.HISTOGRAM_BUCKETS:
+            if size <= upper:
+                self._batch_histogram[self._bucket_label(upper)] += 1
+                break
+        else:
+            label = f">{self.HISTOGRAM_BUCKETS[-1]}"
+            self._batch_histogram[label] = self._batch_histogram.get(label, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for tuning max_batch_size / max_wait_ms under load."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "requests": self._requests,
+            "batches": self._batches,
+            "errors": self._errors,
+            "avg_batch_size": round(self._requests / self._batches, 2) if self._batches else 0.0,
+            "batch_size_histogram": dict(self._batch_histogram),
+            "avg_wait_ms": round(self._wait_total_ms / self._requests, 3) if self._requests else 0.0,
+            "max_wait_ms_observed": round(self._wait_max_ms, 3),
+        }
+
+    async def stop(self):
+        """Cancel the worker task; queued callers are cancelled with it."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
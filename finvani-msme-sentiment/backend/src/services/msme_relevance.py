@@ -1 +1,216 @@
-# Todo: Implement
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.preprocess.normalize import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# concept -> (weight, surface forms). A concept counts once per text however many of
+# its forms match; weights are combined as a noisy-OR, so one core term is enough
+# and several context terms are needed before an article counts as MSME news.
+LEXICON: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    # --- core: the article is about MSMEs ---
+    "msme": (0.9, (
+        "msme", "sme", "micro, small and medium", "micro small and medium",
+        "small and medium enterprises", "small businesses", "small business", "small industries",
+        "एमएसएमई", "सूक्ष्म, लघु और मध्यम", "सूक्ष्म, लघु एवं मध्यम", "लघु उद्योग", "छोटे उद्योग",
+        "लघु व मध्यम", "सूक्ष्म, लघु आणि मध्यम",
+        "எம்எஸ்எம்இ", "குறு, சிறு", "சிறு தொழில்", "சிறு, குறு",
+        "এমএসএমই", "ক্ষুদ্র শিল্প", "ক্ষুদ্র ও মাঝারি",
+        "ఎంఎస్ఎంఈ", "చిన్న పరిశ్రమ", "సూక్ష్మ, చిన్న",
+        "એમએસએમઈ", "લઘુ ઉદ્યોગ",
+        "ಎಂಎಸ್ಎಂಇ", "ಸಣ್ಣ ಕೈಗಾರಿಕೆ",
+        "എംഎസ്എംഇ", "ചെറുകിട",
+        "ਐਮਐਸਐਮਈ", "ਛੋਟੇ ਉਦਯੋਗ",
+        "ଏମଏସଏମଇ", "କ୍ଷୁଦ୍ର ଶିଳ୍ପ",
+        "ایم ایس ایم ای", "چھوٹی صنعت",
+    )),
+    "udyam": (0.9, ("udyam", "udyam registration", "उद्यम पंजीकरण", "उद्यम रजिस्ट्रेशन", "உத்யம்")),
+    "cgtmse": (0.9, ("cgtmse", "credit guarantee fund trust", "सीजीटीएमएसई")),
+    "sidbi": (0.9, ("sidbi", "small industries development bank", "सिडबी", "சிட்பி", "সিডবি")),
+    "mudra": (0.8, (
+        "mudra", "pmmy", "mudra loan", "मुद्रा योजना", "मुद्रा लोन", "मुद्रा ऋण",
+        "முத்ரா", "মুদ্রা যোজনা", "ముద్ర", "મુદ્રા યોજના",
+    )),
+    "schemes": (0.8, (
+        "pm vishwakarma", "pmegp", "zed certification", "ramp scheme", "emergency credit line",
+        "eclgs", "samadhaan", "treds", "gem portal", "startup india", "stand-up india",
+        "पीएम विश्वकर्मा", "स्टार्टअप इंडिया",
+    )),
+    "artisans": (0.6, (
+        "artisans", "artisan", "weavers", "handloom", "khadi", "cottage industry", "kirana",
+        "कारीगर", "बुनकर", "हथकरघा", "खादी", "कुटीर उद्योग", "கைத்தறி",
+    )),
+    # --- context: common in MSME news, but also everywhere else ---
+    "gst": (0.4, ("gst", "goods and services tax", "जीएसटी", "ஜிஎஸ்டி", "জিএসটি", "జీఎస్టీ", "જીએસટી", "ಜಿಎಸ್ಟಿ")),
+    "credit": (0.3, (
+        "business loan", "working capital", "collateral-free", "collateral free", "credit guarantee",
+        "loan", "loans", "lending", "credit", "कर्ज", "ऋण", "लोन", "கடன்", "ঋণ", "రుణ", "લોન",
+    )),
+    "enterprise": (0.35, (
+        "entrepreneurs", "entrepreneur", "startups", "startup", "exporters", "manufacturers",
+        "traders", "industrial cluster", "udyog", "उद्यमी", "उद्योग", "व्यापारी", "निर्यातक",
+        "தொழில்முனைவோர்", "উদ্যোক্তা", "పారిశ్రామిక",
+    )),
+    "payments": (0.3, ("delayed payments", "msme payments", "43b(h)", "payment dues", "बकाया भुगतान")),
+}
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def on_word_boundary(text: str, start: int, term: str) -> bool:
+    """
+    Whether a match of `term` at `start` stands on its own: Latin-script terms
+    must start and end on a word boundary (a trailing plural "s" is allowed),
+    Indic terms may sit inside a word because case endings attach directly.
+    """
+    if _is_word_char(term[0]) and start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if _is_word_char(term[-1]):
+        end = start + len(term)
+        if end < len(text) and text[end] == "s":
+            end += 1
+        if end < len(text) and _is_word_char(text[end]):
+            return False
+    return True
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over a fixed set of patterns.
+
+    Goto transitions are one dict per state; failure links are resolved when
+    the automaton is built and every state's output list already includes the
+    outputs of its failure chain, so matching is a single pass over the text
+    with amortized O(1) work per character plus one step per match.
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("patterns must be non-empty")
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (index,)
+
+        # Breadth-first so a state's failure target is finished before the state itself
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(start, pattern index) of every occurrence, overlapping ones included."""
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                yield end - len(patterns[index]), index
+
+
+class MSMERelevanceScorer:
+    """
+    Weighted MSME relevance of headlines from a multilingual lexicon.
+
+    All surface forms of every concept are compiled into one Aho-Corasick
+    automaton, so a headline is scanned once regardless of lexicon size.
+    Matches are kept only on word boundaries (see on_word_boundary), which
+    keeps "sme" from matching "assessment".
+    The score is 1 - prod(1 - weight) over the distinct concepts found.
+    """
+
+    def __init__(self, lexicon: Optional[Dict[str, Tuple[float, Tuple[str, ...]]]] = None):
+        lexicon = LEXICON if lexicon is None else lexicon
+        self.weights: Dict[str, float] = {}
+        patterns: List[str] = []
+        self._concepts: List[str] = []
+        seen = set()
+        for concept, (weight, terms) in lexicon.items():
+            if not 0.0 <= weight <= 1.0:
+                raise ValueError(f"Weight for '{concept}' must be in [0, 1]")
+            self.weights[concept] = weight
+            for term in terms:
+                # Same canonical form as the headlines (NFC, no zero-width joiners)
+                term = normalize_text(term).lower()
+                if term and term not in seen:
+                    seen.add(term)
+                    patterns.append(term)
+                    self._concepts.append(concept)
+        self.automaton = AhoCorasick(patterns)
+        logger.info(f"MSME relevance automaton: {len(patterns)} terms, {len(self.automaton)} states")
+
+    def matches(self, text: str) -> Dict[str, List[str]]:
+        """concept -> matched terms (in order of first occurrence)."""
+        # Match on lowercased, space-collapsed text (callers usually pass normalized headlines)
+        text = " ".join(text.lower().split())
+        found: Dict[str, List[str]] = {}
+        patterns = self.automaton.patterns
+        for start, index in self.automaton.iter_matches(text):
+            term = patterns[index]
+            if on_word_boundary(text, start, term):
+                terms = found.setdefault(self._concepts[index], [])
+                if term not in terms:
+                    terms.append(term)
+        return found
+
+    def _combine(self, concepts) -> float:
+        miss = 1.0
+        for concept in concepts:
+            miss *= 1.0 - self.weights[concept]
+        return round(1.0 - miss, 4)
+
+    def score(self, text: str) -> float:
+        """Relevance in [0, 1]; 0.0 when no term matches."""
+        return self._combine(self.matches(text))
+
+    def score_batch(self, texts: Sequence[str]) -> List[float]:
+        return [self.score(text) for text in texts]
+
+    def explain(self, text: str) -> Dict[str, object]:
+        """Score plus the concepts and terms behind it (for debugging the lexicon)."""
+        found = self.matches(text)
+        return {"score": self._combine(found), "matches": found}
+
+
+_SHARED: Optional[MSMERelevanceScorer] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_relevance_scorer() -> MSMERelevanceScorer:
+    """The process-wide scorer, built on first use from LEXICON."""
+    global _SHARED
+    if _SHARED is None:
+        with _SHARED_LOCK:
+            if _SHARED is None:
+                _SHARED = MSMERelevanceScorer()
+    return _SHARED
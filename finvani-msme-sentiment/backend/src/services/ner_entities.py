@@ -1 +1,254 @@
-# Todo: Implement
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.preprocess.normalize import normalize_text
+from src.services.msme_relevance import AhoCorasick, on_word_boundary
+
+logger = logging.getLogger(__name__)
+
+ENTITY_TYPES = ("states", "cities", "banks", "schemes", "sectors")
+
+# Canonical state / UT name -> aliases (old names, abbreviations and native-script spellings).
+# Two-letter abbreviations such as "UP" are left out: lowercased they collide with English words.
+STATES: Dict[str, Tuple[str, ...]] = {
+    "Andhra Pradesh": ("andhra", "आंध्र प्रदेश", "ఆంధ్రప్రదేశ్", "ఆంధ్ర ప్రదేశ్"),
+    "Arunachal Pradesh": ("arunachal", "अरुणाचल प्रदेश"),
+    "Assam": ("असम", "অসম", "আসাম"),
+    "Bihar": ("बिहार", "বিহার"),
+    "Chhattisgarh": ("chattisgarh", "छत्तीसगढ़"),
+    "Goa": ("गोवा",),
+    "Gujarat": ("गुजरात", "ગુજરાત"),
+    "Haryana": ("हरियाणा",),
+    "Himachal Pradesh": ("himachal", "हिमाचल प्रदेश", "हिमाचल"),
+    "Jharkhand": ("झारखंड", "झारखण्ड"),
+    "Karnataka": ("कर्नाटक", "ಕರ್ನಾಟಕ"),
+    "Kerala": ("केरल", "കേരളം", "കേരള"),
+    "Madhya Pradesh": ("मध्य प्रदेश", "मध्यप्रदेश"),
+    "Maharashtra": ("महाराष्ट्र",),
+    "Manipur": ("मणिपुर",),
+    "Meghalaya": ("मेघालय",),
+    "Mizoram": ("मिजोरम",),
+    "Nagaland": ("नागालैंड",),
+    "Odisha": ("orissa", "ओडिशा", "ଓଡ଼ିଶା"),
+    "Punjab": ("पंजाब", "ਪੰਜਾਬ"),
+    "Rajasthan": ("राजस्थान",),
+    "Sikkim": ("सिक्किम",),
+    "Tamil Nadu": ("tamilnadu", "तमिलनाडु", "தமிழ்நாடு", "தமிழகம்"),
+    "Telangana": ("तेलंगाना", "తెలంగాణ"),
+    "Tripura": ("त्रिपुरा",),
+    "Uttar Pradesh": ("उत्तर प्रदेश", "यूपी"),
+    "Uttarakhand": ("uttaranchal", "उत्तराखंड", "उत्तराखण्ड"),
+    "West Bengal": ("bengal", "पश्चिम बंगाल", "পশ্চিমবঙ্গ"),
+    "Delhi": ("new delhi", "ncr", "दिल्ली", "नई दिल्ली"),
+    "Jammu and Kashmir": ("jammu & kashmir", "j&k", "जम्मू-कश्मीर", "जम्मू कश्मीर", "جموں و کشمیر"),
+    "Ladakh": ("लद्दाख",),
+    "Puducherry": ("pondicherry", "पुडुचेरी", "புதுச்சேரி"),
+    "Chandigarh": ("चंडीगढ़",),
+}
+
+# Canonical city -> (state, aliases). A city mention also counts as a mention of its state.
+CITIES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "Mumbai": ("Maharashtra", ("bombay", "मुंबई", "मुम्बई")),
+    "Pune": ("Maharashtra", ("poona", "पुणे")),
+    "Nagpur": ("Maharashtra", ("नागपुर", "नागपूर")),
+    "Nashik": ("Maharashtra", ("nasik", "नाशिक")),
+    "Bengaluru": ("Karnataka", ("bangalore", "बेंगलुरु", "ಬೆಂಗಳೂರು")),
+    "Mysuru": ("Karnataka", ("mysore", "ಮೈಸೂರು")),
+    "Chennai": ("Tamil Nadu", ("madras", "चेन्नई", "சென்னை")),
+    "Coimbatore": ("Tamil Nadu", ("कोयंबटूर", "கோவை", "கோயம்புத்தூர்")),
+    "Tiruppur": ("Tamil Nadu", ("tirupur", "திருப்பூர்")),
+    "Madurai": ("Tamil Nadu", ("மதுரை",)),
+    "Hyderabad": ("Telangana", ("हैदराबाद", "హైదరాబాద్")),
+    "Visakhapatnam": ("Andhra Pradesh", ("vizag", "విశాఖపట్నం", "విశాఖ")),
+    "Vijayawada": ("Andhra Pradesh", ("విజయవాడ",)),
+    "Kolkata": ("West Bengal", ("calcutta", "कोलकाता", "কলকাতা")),
+    "Ahmedabad": ("Gujarat", ("अहमदाबाद", "અમદાવાદ")),
+    "Surat": ("Gujarat", ("सूरत", "સુરત")),
+    "Rajkot": ("Gujarat", ("રાજકોટ",)),
+    "Vadodara": ("Gujarat", ("baroda", "વડોદરા")),
+    "Jaipur": ("Rajasthan", ("जयपुर",)),
+    "Jodhpur": ("Rajasthan", ("जोधपुर",)),
+    "Lucknow": ("Uttar Pradesh", ("लखनऊ",)),
+    "Kanpur": ("Uttar Pradesh", ("कानपुर",)),
+    "Noida": ("Uttar Pradesh", ("नोएडा",)),
+    "Agra": ("Uttar Pradesh", ("आगरा",)),
+    "Varanasi": ("Uttar Pradesh", ("banaras", "वाराणसी", "बनारस")),
+    "Moradabad": ("Uttar Pradesh", ("मुरादाबाद",)),
+    "Gurugram": ("Haryana", ("gurgaon", "गुरुग्राम", "गुड़गांव")),
+    "Faridabad": ("Haryana", ("फरीदाबाद",)),
+    "Panipat": ("Haryana", ("पानीपत",)),
+    "Ludhiana": ("Punjab", ("लुधियाना", "ਲੁਧਿਆਣਾ")),
+    "Jalandhar": ("Punjab", ("ਜਲੰਧਰ",)),
+    "Indore": ("Madhya Pradesh", ("इंदौर",)),
+    "Bhopal": ("Madhya Pradesh", ("भोपाल",)),
+    "Patna": ("Bihar", ("पटना",)),
+    "Ranchi": ("Jharkhand", ("रांची",)),
+    "Jamshedpur": ("Jharkhand", ("जमशेदपुर",)),
+    "Bhubaneswar": ("Odisha", ("भुवनेश्वर", "ଭୁବନେଶ୍ୱର")),
+    "Guwahati": ("Assam", ("गुवाहाटी", "গুৱাহাটী", "গুয়াহাটি")),
+    "Kochi": ("Kerala", ("cochin", "കൊച്ചി")),
+    "Thiruvananthapuram": ("Kerala", ("trivandrum", "തിരുവനന്തപുരം")),
+    "Dehradun": ("Uttarakhand", ("देहरादून",)),
+    "Raipur": ("Chhattisgarh", ("रायपुर",)),
+    "Srinagar": ("Jammu and Kashmir", ("श्रीनगर", "سری نگر")),
+}
+
+# Banks, NBFCs and regulators -> aliases
+BANKS: Dict[str, Tuple[str, ...]] = {
+    "RBI": ("reserve bank of india", "reserve bank", "आरबीआई", "रिजर्व बैंक", "रिज़र्व बैंक", "ரிசர்வ் வங்கி",
+            "রিজার্ভ ব্যাংক", "రిజర్వ్ బ్యాంక్", "રિઝર્વ બેંક", "റിസർവ് ബാങ്ക്", "ریزرو بینک"),
+    "SBI": ("state bank of india", "एसबीआई", "भारतीय स्टेट बैंक", "स्टेट बैंक"),
+    "SIDBI": ("small industries development bank", "सिडबी"),
+    "NABARD": ("नाबार्ड",),
+    "HDFC Bank": ("hdfc", "एचडीएफसी"),
+    "ICICI Bank": ("icici", "आईसीआईसीआई"),
+    "Axis Bank": ("एक्सिस बैंक",),
+    "Kotak Mahindra Bank": ("kotak", "कोटक"),
+    "Punjab National Bank": ("pnb", "पंजाब नेशनल बैंक"),
+    "Bank of Baroda": ("बैंक ऑफ बड़ौदा",),
+    "Canara Bank": ("केनरा बैंक",),
+    "Union Bank of India": ("union bank", "यूनियन बैंक"),
+    "Bank of India": ("बैंक ऑफ इंडिया",),
+    "Indian Bank": ("इंडियन बैंक",),
+    "IndusInd Bank": ("indusind",),
+    "Yes Bank": ("यस बैंक",),
+    "IDFC First Bank": ("idfc first", "idfc"),
+    "Bajaj Finance": ("bajaj finserv", "बजाज फाइनेंस"),
+    "Shriram Finance": ("shriram",),
+    "Muthoot Finance": ("muthoot",),
+    "Mahindra Finance": ("mahindra & mahindra financial",),
+    "Tata Capital": (),
+    "Lendingkart": (),
+}
+
+SCHEMES: Dict[str, Tuple[str, ...]] = {
+    "Mudra": ("pmmy", "pradhan mantri mudra yojana", "mudra loan", "mudra yojana", "मुद्रा योजना", "मुद्रा लोन",
+              "முத்ரா"),
+    "CGTMSE": ("credit guarantee fund trust", "सीजीटीएमएसई"),
+    "Udyam": ("udyam registration", "udyam portal", "उद्यम पंजीकरण", "उद्यम रजिस्ट्रेशन"),
+    "PMEGP": ("prime minister's employment generation programme",),
+    "PM Vishwakarma": ("vishwakarma yojana", "पीएम विश्वकर्मा", "विश्वकर्मा योजना"),
+    "ECLGS": ("emergency credit line guarantee scheme", "emergency credit line"),
+    "Stand-Up India": ("stand up india", "standup india", "स्टैंड-अप इंडिया"),
+    "Startup India": ("start-up india", "स्टार्टअप इंडिया"),
+    "PLI": ("production linked incentive", "production-linked incentive", "पीएलआई"),
+    "RAMP": ("raising and accelerating msme performance",),
+    "ZED": ("zed certification", "zero defect zero effect"),
+    "TReDS": ("trade receivables discounting system",),
+    "GeM": ("government e-marketplace", "gem portal"),
+    "Make in India": ("मेक इन इंडिया",),
+}
+
+SECTORS: Dict[str, Tuple[str, ...]] = {
+    "Textiles": ("textile", "garment", "apparel", "handloom", "powerloom", "weavers", "कपड़ा", "वस्त्र",
+                 "ஜவுளி", "கைத்தறி", "টেক্সটাইল", "કાપડ"),
+    "Auto Components": ("auto component", "auto parts", "automobile", "auto ancillary", "ऑटो पार्ट्स"),
+    "Pharmaceuticals": ("pharma", "pharmaceutical", "drug makers", "फार्मा", "दवा"),
+    "Food Processing": ("food processing", "dairy", "agro processing", "खाद्य प्रसंस्करण", "डेयरी"),
+    "Agriculture": ("farm", "farmers", "agri", "agriculture", "kisan", "कृषि", "किसान", "விவசாய", "কৃষি",
+                    "వ్యవసాయ", "ખેડૂત"),
+    "Leather": ("leather", "footwear", "चमड़ा"),
+    "Gems & Jewellery": ("gems and jewellery", "jewellery", "jewelry", "diamond", "gold jewellery", "आभूषण",
+                         "हीरा"),
+    "Handicrafts": ("handicraft", "artisans", "artisan", "khadi", "हस्तशिल्प", "कारीगर", "खादी"),
+    "IT & Services": ("it services", "software", "saas", "आईटी"),
+    "Logistics": ("logistics", "freight", "warehousing", "transport", "लॉजिस्टिक्स"),
+    "Manufacturing": ("manufacturing", "factory", "factories", "विनिर्माण", "फैक्ट्री", "उत्पादन"),
+    "Retail & Trade": ("retail", "kirana", "traders", "e-commerce", "ecommerce", "खुदरा", "व्यापारी"),
+    "Construction & Real Estate": ("construction", "real estate", "cement", "infrastructure", "निर्माण"),
+    "Renewable Energy": ("solar", "renewable", "electric vehicle", "ev makers", "सौर"),
+    "Chemicals": ("chemical", "chemicals", "रसायन"),
+    "Steel & Metals": ("steel", "metal", "metals", "aluminium", "इस्पात", "स्टील"),
+    "Electronics": ("electronics", "semiconductor", "mobile manufacturing", "इलेक्ट्रॉनिक्स"),
+    "Tourism & Hospitality": ("tourism", "hotel", "hotels", "restaurant", "hospitality", "पर्यटन"),
+    "Exports": ("exports", "exporters", "export", "निर्यात", "ஏற்றுமதி"),
+}
+
+
+def _gazetteer() -> List[Tuple[str, str, str]]:
+    """(alias, entity type, canonical name) for every entry; canonical names are their own aliases."""
+    entries: List[Tuple[str, str, str]] = []
+    for name, aliases in STATES.items():
+        entries += [(alias, "states", name) for alias in (name, *aliases)]
+    for name, (_, aliases) in CITIES.items():
+        entries += [(alias, "cities", name) for alias in (name, *aliases)]
+    for kind, table in (("banks", BANKS), ("schemes", SCHEMES), ("sectors", SECTORS)):
+        for name, aliases in table.items():
+            entries += [(alias, kind, name) for alias in (name, *aliases)]
+    return entries
+
+
+class EntityExtractor:
+    """
+    Gazetteer entity extraction without a model.
+
+    Every alias of every state, city, bank/NBFC, scheme and sector (English,
+    transliterated and native-script spellings) is compiled into one
+    Aho-Corasick automaton, built with the same AhoCorasick class and
+    word-boundary rule as the relevance scorer but separate from its lexicon
+    automaton. A headline is scanned once; overlapping matches
+    are resolved leftmost-longest, so "Bank of India" is not also reported
+    inside "State Bank of India", and a city mention adds its state.
+    """
+
+    def __init__(self):
+        patterns: List[str] = []
+        self._targets: List[List[Tuple[str, str]]] = []
+        index: Dict[str, int] = {}
+        for alias, kind, name in _gazetteer():
+            alias = normalize_text(alias).lower()
+            if alias not in index:
+                index[alias] = len(patterns)
+                patterns.append(alias)
+                self._targets.append([])
+            # The same alias can name several entities (e.g. "handloom" is a sector and a craft)
+            if (kind, name) not in self._targets[index[alias]]:
+                self._targets[index[alias]].append((kind, name))
+        self.automaton = AhoCorasick(patterns)
+        self.city_states = {city: state for city, (state, _) in CITIES.items()}
+        logger.info(f"Entity gazetteer: {len(patterns)} aliases, {len(self.automaton)} states")
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        """Canonical entity names per type, in order of first mention."""
+        text = " ".join(text.lower().split())
+        patterns = self.automaton.patterns
+        spans = [
+            (start, start + len(patterns[i]), i)
+            for start, i in self.automaton.iter_matches(text)
+            if on_word_boundary(text, start, patterns[i])
+        ]
+        # Leftmost-longest: earliest start first, longer match first at the same start
+        spans.sort(key=lambda span: (span[0], -span[1]))
+
+        entities: Dict[str, List[str]] = {kind: [] for kind in ENTITY_TYPES}
+        covered = 0
+        for start, end, i in spans:
+            if start < covered:
+                continue
+            covered = end
+            for kind, name in self._targets[i]:
+                if name not in entities[kind]:
+                    entities[kind].append(name)
+                if kind == "cities":
+                    state = self.city_states[name]
+                    if state not in entities["states"]:
+                        entities["states"].append(state)
+        return entities
+
+    def extract_batch(self, texts: Sequence[str]) -> List[Dict[str, List[str]]]:
+        return [self.extract(text) for text in texts]
+
+
+_SHARED: Optional[EntityExtractor] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_entity_extractor() -> EntityExtractor:
+    """The process-wide extractor, built on first use."""
+    global _SHARED
+    if _SHARED is None:
+        with _SHARED_LOCK:
+            if _SHARED is None:
+                _SHARED = EntityExtractor()
+    return _SHARED
@@ -0,0 +1,17 @@
+import os
+import sys
+
+# Tests run from backend/ (or the repo root); make `src` and `benchmarks` importable either way
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """Randomly initialised XLM-R-shaped model from benchmarks/tiny_model.py (no download)."""
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    pytest.importorskip("tokenizers")
+    from benchmarks.tiny_model import build_tiny_model
+    return build_tiny_model(str(tmp_path_factory.mktemp("tiny_model")))
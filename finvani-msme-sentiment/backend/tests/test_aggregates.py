@@ -0,0 +1,81 @@
+import json
+import os
+
+from src.services.aggregates import SentimentAggregates
+
+
+def _record(label, language="en"):
+    return {"label": label, "score": 0.9, "language": language, "query": "MSME",
+            "published": "2025-01-01T10:00:00"}
+
+
+def _append(path, *records):
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def _counts(aggregates):
+    return {row["language"]: row["count"] for row in aggregates.by_language()}
+
+
+def test_refresh_reads_only_appended_lines(tmp_path):
+    scored = tmp_path / "sentiment"
+    scored.mkdir()
+    _append(scored / "2025-01-01.jsonl", _record("POSITIVE"), _record("NEGATIVE"))
+    aggregates = SentimentAggregates(scored, refresh_interval=0)
+
+    assert _counts(aggregates) == {"en": 2}
+    _append(scored / "2025-01-01.jsonl", _record("NEUTRAL", "hi"))
+    assert _counts(aggregates) == {"en": 2, "hi": 1}
+
+
+def test_truncated_or_replaced_file_is_rebuilt(tmp_path):
+    scored = tmp_path / "sentiment"
+    scored.mkdir()
+    path = scored / "2025-01-01.jsonl"
+    _append(path, _record("POSITIVE"), _record("NEGATIVE"), _record("NEUTRAL"))
+    aggregates = SentimentAggregates(scored, refresh_interval=0)
+    assert _counts(aggregates) == {"en": 3}
+
+    # Truncated below the watermark
+    path.write_text(json.dumps(_record("POSITIVE", "ta")) + "\n", encoding="utf-8")
+    assert _counts(aggregates) == {"ta": 1}
+
+    # Replaced by a new file that is at least as large
+    replacement = scored / "replacement.tmp"
+    _append(replacement, *[_record("NEGATIVE", "bn")] * 3)
+    os.replace(replacement, path)
+    assert _counts(aggregates) == {"bn": 3}
+
+
+def test_snapshot_is_throttled_and_flushed_on_close(tmp_path):
+    scored = tmp_path / "sentiment"
+    scored.mkdir()
+    snapshot = tmp_path / "aggregates.json"
+    _append(scored / "2025-01-01.jsonl", _record("POSITIVE"))
+    aggregates = SentimentAggregates(scored, snapshot, refresh_interval=0, snapshot_interval=3600)
+
+    assert _counts(aggregates) == {"en": 1}
+    assert not snapshot.exists()
+    aggregates.close()
+    assert snapshot.exists()
+
+    # A restart resumes from the snapshot's watermark instead of recounting
+    _append(scored / "2025-01-01.jsonl", _record("NEGATIVE"))
+    restarted = SentimentAggregates(scored, snapshot, refresh_interval=0)
+    assert _counts(restarted) == {"en": 2}
+
+
+def test_headlines_without_a_state_stay_off_the_map(tmp_path):
+    scored = tmp_path / "sentiment"
+    scored.mkdir()
+    _append(
+        scored / "2025-01-01.jsonl",
+        dict(_record("POSITIVE", "hi"), states=[], sectors=["Textiles"]),
+        dict(_record("NEGATIVE", "ta"), states=["Tamil Nadu"])
+    )
+    aggregates = SentimentAggregates(scored, refresh_interval=0)
+
+    assert [row["region"] for row in aggregates.heatmap()] == ["Tamil Nadu"]
+    assert [row["sector"] for row in aggregates.by_sector()] == ["Textiles"]
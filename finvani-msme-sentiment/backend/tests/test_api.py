@@ -1 +1,214 @@
-# Todo: Implement
+import datetime
+import importlib
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("feedparser")
+
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def main(tmp_path_factory):
+    """The app, imported with data/ (and the SQLite store) under a temporary working directory."""
+    root = tmp_path_factory.mktemp("app")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(root)
+        yield importlib.import_module("src.api.main")
+
+
+@pytest.fixture
+def offline(main, monkeypatch):
+    """No model load, no store migration, no ingestion thread and no scorer during a test."""
+    monkeypatch.setattr(main.settings, "MODEL_WARMUP", "lazy")
+    monkeypatch.setattr(main.database, "init_db", lambda: None)
+    monkeypatch.setattr(main.news.SCHEDULER, "start", lambda: None)
+    monkeypatch.setattr(main.news, "store_ready", lambda migrated=True: None)
+    monkeypatch.setattr(main.news, "catch_up_store", lambda: None)
+    monkeypatch.setattr(main.analyze.ANALYZER, "state", main.analyze.ANALYZER.READY)
+    return main
+
+
+@pytest.fixture
+def store(main, monkeypatch, tmp_path, request):
+    """
+    /news/latest served from an empty, migrated SQLite article store under
+    tmp_path, on an offline app. Returns a function that upserts articles.
+    """
+    engine = main.database.make_engine(f"sqlite:///{tmp_path / 'finvani.db'}")
+    # Before `offline` turns the migration into a no-op
+    main.database.init_db(engine)
+    request.getfixturevalue("offline")
+    previous = main.database.SessionLocal.kw.get("bind")
+    main.database.SessionLocal.configure(bind=engine)
+    monkeypatch.setattr(main.settings, "ARTICLE_STORE_ENABLED", True)
+    main.news.NEWS_CACHE.invalidate()
+    yield lambda articles: main.news.crud.upsert_articles(engine, articles)
+    main.database.SessionLocal.configure(bind=previous)
+    main.news.NEWS_CACHE.invalidate()
+    engine.dispose()
+
+
+def _articles(count, language="en", start=0):
+    published = datetime.datetime(2026, 1, 1)
+    return [
+        {"id": f"{language}-{i}", "source": "google_news", "query": "MSME", "language": language,
+         "title": f"Headline {i}", "link": f"https://example.com/{language}/{i}",
+         "published": str(published + datetime.timedelta(minutes=i))}
+        for i in range(start, start + count)
+    ]
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_ready_waits_for_the_store_migration(offline, monkeypatch):
+    main = offline
+    release = threading.Event()
+    monkeypatch.setattr(main.settings, "ARTICLE_STORE_ENABLED", True)
+    monkeypatch.setattr(main.database, "init_db", lambda: release.wait(5))
+    monkeypatch.setitem(main.STORE, "state", "idle")
+
+    # Startup returns while the migration is still running
+    with TestClient(main.app) as client:
+        assert client.get("/health").json() == {"status": "ok"}
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "store_migrating"
+
+        release.set()
+        _wait_for(lambda: main.STORE["state"] == "ready")
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+
+def test_failed_migration_is_not_ready(offline, monkeypatch):
+    main = offline
+
+    def fail():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(main.settings, "ARTICLE_STORE_ENABLED", True)
+    monkeypatch.setattr(main.database, "init_db", fail)
+    monkeypatch.setitem(main.STORE, "state", "idle")
+    monkeypatch.setitem(main.STORE, "error", None)
+
+    with TestClient(main.app) as client:
+        _wait_for(lambda: main.STORE["state"] == "failed")
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["article_store"]["error"] == "database is locked"
+
+
+def test_health(offline):
+    with TestClient(offline.app) as client:
+        assert client.get("/health").json() == {"status": "ok"}
+
+
+def test_latest_pages_through_the_store_with_cursors(main, store):
+    store(_articles(5) + _articles(2, language="hi"))
+    with TestClient(main.app) as client:
+        ids, cursor = [], None
+        while True:
+            response = client.get("/news/latest", params={"lang": "en", "limit": 2, "cursor": cursor})
+            assert response.status_code == 200
+            ids += [article["id"] for article in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert ids == [f"en-{i}" for i in range(4, -1, -1)]
+
+        assert client.get("/news/latest", params={"cursor": "not-a-cursor"}).status_code == 400
+        assert client.get("/news/latest", params={"limit": 0}).status_code == 422
+
+
+def test_first_page_is_cached_until_invalidated(main, store):
+    store(_articles(3))
+    with TestClient(main.app) as client:
+        first = client.get("/news/latest")
+        etag = first.headers["ETag"]
+        assert [a["id"] for a in first.json()] == ["en-2", "en-1", "en-0"]
+        assert client.get("/news/latest", headers={"If-None-Match": etag}).status_code == 304
+
+        # A write alone is not visible on the cached first page...
+        store(_articles(1, start=3))
+        assert client.get("/news/latest").headers["ETag"] == etag
+        # ...filtered queries always read the store...
+        assert client.get("/news/latest", params={"source": "google_news"}).json()[0]["id"] == "en-3"
+        # ...and the ingester's invalidation after a flush publishes it
+        main.news.NEWS_CACHE.invalidate()
+        response = client.get("/news/latest", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()[0]["id"] == "en-3"
+
+
+def test_filters_need_the_article_store(offline, monkeypatch):
+    monkeypatch.setattr(offline.settings, "ARTICLE_STORE_ENABLED", False)
+    with TestClient(offline.app) as client:
+        assert client.get("/news/latest", params={"source": "google_news"}).status_code == 400
+
+
+def test_aggregates_do_not_block_the_event_loop(offline, monkeypatch, tmp_path):
+    main = offline
+    aggregates = main.aggregates.SentimentAggregates(tmp_path / "sentiment", refresh_interval=0)
+    entered, release = threading.Event(), threading.Event()
+    refresh = aggregates.refresh
+
+    def stuck(force=False):
+        # A refresh waiting on the scorer's (or rebuilding) must only hold up its own request
+        entered.set()
+        release.wait(5)
+        return refresh(force)
+
+    monkeypatch.setattr(aggregates, "refresh", stuck)
+    monkeypatch.setattr(main.aggregates, "AGGREGATES", aggregates)
+
+    with TestClient(main.app) as client:
+        responses = []
+        slow = threading.Thread(target=lambda: responses.append(client.get("/aggregates/by-language")))
+        slow.start()
+        assert entered.wait(5)
+        assert client.get("/health").status_code == 200
+        assert not responses
+        release.set()
+        slow.join(5)
+        assert responses[0].status_code == 200 and responses[0].json() == []
+
+
+@pytest.mark.parametrize("days", [0, 366, 10 ** 9])
+def test_aggregate_windows_are_bounded(offline, days):
+    with TestClient(offline.app) as client:
+        assert client.get("/aggregates/heatmap", params={"days": days}).status_code == 422
+        assert client.get("/aggregates/timeseries", params={"days": days}).status_code == 422
+
+
+@pytest.mark.parametrize("params", [
+    {"source": "google_news"}, {"sentiment": "positive"}, {"since": "2026-01-01"}, {"cursor": "abc"}
+])
+def test_randomize_rejects_filters_and_cursors(store, main, params):
+    with TestClient(main.app) as client:
+        assert client.get("/news/latest", params={"randomize": True, **params}).status_code == 400
+
+
+def test_randomize_samples_the_newest_file_by_language(offline, monkeypatch, tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    with open(raw / "2026-01-01.jsonl", "w", encoding="utf-8") as f:
+        for article in _articles(3) + _articles(3, language="hi"):
+            f.write(json.dumps(article) + "\n")
+    monkeypatch.setattr(offline.news, "get_data_dir", lambda: raw)
+    monkeypatch.setattr(offline.settings, "ARTICLE_STORE_ENABLED", False)
+
+    with TestClient(offline.app) as client:
+        response = client.get("/news/latest", params={"randomize": True, "lang": "hi"})
+        assert response.status_code == 200
+        assert sorted(article["id"] for article in response.json()) == ["hi-0", "hi-1", "hi-2"]
@@ -0,0 +1,92 @@
+import errno
+import json
+import os
+
+import pytest
+
+from src.ingestion import appender as appender_module
+from src.ingestion.appender import JsonlAppender
+from src.ingestion.news_index import _read_entries, index_path_for
+
+
+def _article(i, language="en"):
+    return {"id": f"a{i}", "title": f"Headline {i}", "language": language, "published": f"2026-01-01 10:{i:02d}:00"}
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def _indexed(path):
+    """Each sidecar entry resolved to the record its offset and length point at."""
+    data = path.read_bytes()
+    entries, _ = _read_entries(index_path_for(path))
+    return [(lang, json.loads(data[offset:offset + length])) for _, offset, length, lang in entries]
+
+
+def test_sidecar_offsets_point_at_each_record(tmp_path):
+    flushed = []
+    with JsonlAppender(tmp_path, flush_every=2, on_flush=lambda path, batch: flushed.append(len(batch))) as appender:
+        appender.extend([_article(1), _article(2, "hi"), _article(3, "ta")])
+        path = appender.path_for()
+
+    assert flushed == [2, 1]
+    assert [record["id"] for record in _lines(path)] == ["a1", "a2", "a3"]
+    assert [(lang, record["id"]) for lang, record in _indexed(path)] == [("en", "a1"), ("hi", "a2"), ("ta", "a3")]
+
+
+@pytest.mark.parametrize("policy, expected", [("never", 0), ("flush", 3), ("close", 1)])
+def test_fsync_policy(tmp_path, monkeypatch, policy, expected):
+    synced = []
+    fsync = os.fsync
+    monkeypatch.setattr(appender_module.os, "fsync", lambda fd: (synced.append(fd), fsync(fd)))
+    with JsonlAppender(tmp_path, flush_every=1, fsync=policy) as appender:
+        appender.extend([_article(i) for i in range(3)])
+    assert len(synced) == expected
+
+
+def test_unknown_fsync_policy_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        JsonlAppender(tmp_path, fsync="sometimes")
+
+
+def test_torn_line_from_a_crash_is_cut_before_appending(tmp_path):
+    appender = JsonlAppender(tmp_path)
+    path = appender.path_for()
+    path.write_bytes((json.dumps(_article(1)) + "\n" + '{"id": "a2", "tit').encode("utf-8"))
+
+    with appender:
+        appender.append(_article(3))
+
+    assert [record["id"] for record in _lines(path)] == ["a1", "a3"]
+    # The sidecar did not know the file, so it was rebuilt and still matches every line
+    assert [record["id"] for _, record in _indexed(path)] == ["a1", "a3"]
+
+
+def test_failed_write_keeps_the_batch_and_leaves_no_partial_line(tmp_path, monkeypatch):
+    flushed = []
+    appender = JsonlAppender(tmp_path, flush_every=10, on_flush=lambda path, batch: flushed.extend(batch))
+    appender.append(_article(1))
+    appender.flush()
+    path = appender.path_for()
+    size = path.stat().st_size
+
+    write = os.write
+
+    def disk_full(fd, data):
+        # Part of the batch reaches the file before the disk fills up
+        write(fd, bytes(data[:7]))
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    appender.extend([_article(2), _article(3)])
+    with monkeypatch.context() as mp:
+        mp.setattr(appender_module.os, "write", disk_full)
+        with pytest.raises(OSError):
+            appender.flush()
+    assert path.stat().st_size == size
+    assert [a["id"] for a in flushed] == ["a1"]
+
+    appender.close()
+    assert [record["id"] for record in _lines(path)] == ["a1", "a2", "a3"]
+    assert [a["id"] for a in flushed] == ["a1", "a2", "a3"]
+    assert [record["id"] for _, record in _indexed(path)] == ["a1", "a2", "a3"]
@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.models import export_backends
+from src.models.infer import SentimentAnalyzer
+
+TEXTS = export_backends.DEFAULT_EVAL_HEADLINES
+
+
+@pytest.fixture
+def model_dir(tiny_model_dir, tmp_path):
+    """A private copy of the tiny model; exports write into the model directory."""
+    return shutil.copytree(tiny_model_dir, str(tmp_path / "model"))
+
+
+def _manifest(model_dir):
+    with open(os.path.join(model_dir, SentimentAnalyzer.BACKENDS_MANIFEST), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(model_dir, manifest):
+    with open(os.path.join(model_dir, SentimentAnalyzer.BACKENDS_MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def test_torch_int8_is_used_once_its_parity_check_passed(model_dir):
+    # Without a parity report the analyzer stays on fp32
+    assert SentimentAnalyzer(model_dir, backend="torch_int8").backend == "torch"
+
+    manifest = export_backends.run(model_dir, None, ["torch_int8"], threshold=0.0, limit=100, batch_size=4)
+    assert manifest["backends"]["torch_int8"]["passed"]
+    assert manifest["model_hash"] == SentimentAnalyzer.model_files_hash(model_dir)
+
+    analyzer = SentimentAnalyzer(model_dir, backend="torch_int8")
+    assert analyzer.backend == "torch_int8"
+    assert any(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in analyzer.model.modules())
+    assert analyzer.model_version != SentimentAnalyzer(model_dir, backend="torch").model_version
+
+    reference = export_backends.probabilities(SentimentAnalyzer(model_dir, backend="torch"), TEXTS, 4)
+    quantized = export_backends.probabilities(analyzer, TEXTS, 4)
+    assert torch.allclose(reference, quantized, atol=0.05)
+    assert analyzer.predict(TEXTS[0])["label"] in SentimentAnalyzer.ID2LABEL.values()
+
+
+def test_failed_or_stale_parity_falls_back_to_torch(model_dir):
+    export_backends.run(model_dir, None, ["torch_int8"], threshold=0.0, limit=100, batch_size=4)
+    manifest = _manifest(model_dir)
+
+    failed = json.loads(json.dumps(manifest))
+    failed["backends"]["torch_int8"]["passed"] = False
+    _write_manifest(model_dir, failed)
+    assert SentimentAnalyzer(model_dir, backend="torch_int8").backend == "torch"
+    # verify_parity=False is how the export CLI loads a candidate before it has a report
+    assert SentimentAnalyzer(model_dir, backend="torch_int8", verify_parity=False).backend == "torch_int8"
+
+    # Passing report, but the weights changed since (retrained or pruned)
+    _write_manifest(model_dir, manifest)
+    with open(os.path.join(model_dir, "config.json"), "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert SentimentAnalyzer(model_dir, backend="torch_int8").backend == "torch"
+
+
+def test_missing_onnx_graph_falls_back_and_unknown_backends_are_rejected(model_dir):
+    assert SentimentAnalyzer(model_dir, backend="onnx", verify_parity=False).backend == "torch"
+    with pytest.raises(ValueError):
+        SentimentAnalyzer(model_dir, backend="tensorrt")
+
+
+def test_onnx_export_round_trip(model_dir):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    manifest = export_backends.run(model_dir, None, ["onnx", "onnx_int8"], threshold=0.0, limit=100, batch_size=4)
+    assert manifest["backends"]["onnx"]["max_abs_prob_diff"] < 1e-4
+
+    reference = export_backends.probabilities(SentimentAnalyzer(model_dir, backend="torch"), TEXTS, 4)
+    for backend in ("onnx", "onnx_int8"):
+        analyzer = SentimentAnalyzer(model_dir, backend=backend)
+        assert analyzer.backend == backend and analyzer.model is None
+        assert torch.allclose(reference, export_backends.probabilities(analyzer, TEXTS, 4), atol=0.05)
@@ -0,0 +1,63 @@
+import datetime
+import hashlib
+import json
+
+import pytest
+
+pytest.importorskip("feedparser")
+
+from src.ingestion.dedup_index import DedupIndex
+from src.ingestion.rss_google_news import GoogleNewsIngester
+
+
+def _id(text):
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def _article(i):
+    return {"id": _id(f"article {i}"), "title": f"Headline {i}", "link": f"https://example.com/{i}", "language": "en"}
+
+
+def test_ids_persist_across_reopen_and_are_pruned_after_retention(tmp_path):
+    path = tmp_path / DedupIndex.FILENAME
+    today = datetime.date.today()
+    index = DedupIndex(path, retention_days=7)
+    index.add_many([_id("old")], day=today - datetime.timedelta(days=10))
+    index.add_many([_id("recent"), _id("new")])
+    # A re-add keeps the day it was first stored on
+    index.add_many([_id("old")])
+    index.close()
+
+    reopened = DedupIndex(path, retention_days=7)
+    assert len(reopened) == 3
+    assert reopened.filter_seen([_id("old"), _id("new"), _id("unseen")]) == {_id("old"), _id("new")}
+    assert reopened.prune() == 1
+    assert _id("old") not in reopened and _id("recent") in reopened
+    reopened.close()
+
+
+def test_articles_saved_on_an_earlier_day_are_not_stored_again_after_a_restart(tmp_path, monkeypatch):
+    first = GoogleNewsIngester(str(tmp_path))
+    assert first.save_to_jsonl(first._dedup([_article(1), _article(2)]))
+    first.dedup_index.close()
+
+    # Next day, new process: today's file does not exist yet, the index still knows both ids
+    tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+    monkeypatch.setattr(DedupIndex, "_today", staticmethod(lambda: tomorrow.toordinal()))
+    restarted = GoogleNewsIngester(str(tmp_path))
+    unique = restarted._dedup([_article(1), _article(2), _article(3)])
+    assert [a["id"] for a in unique] == [_article(3)["id"]]
+    restarted.dedup_index.close()
+
+
+def test_missing_index_is_seeded_from_files_inside_the_retention_window(tmp_path):
+    today = datetime.date.today()
+    for days_ago, article in ((1, _article(1)), (30, _article(2))):
+        day = today - datetime.timedelta(days=days_ago)
+        with open(tmp_path / f"{day.isoformat()}.jsonl", "w", encoding="utf-8") as f:
+            f.write(json.dumps(article) + "\n")
+
+    ingester = GoogleNewsIngester(str(tmp_path), retention_days=7)
+    assert (tmp_path / DedupIndex.FILENAME).exists()
+    assert [a["id"] for a in ingester._dedup([_article(1), _article(2)])] == [_article(2)["id"]]
+    ingester.dedup_index.close()
@@ -0,0 +1,73 @@
+import copy
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("sklearn")
+
+from src.models.distill import LABEL_IDS, build_student, cache_teacher_logits, distillation_loss, load_teacher
+from src.models.infer import SentimentAnalyzer
+from src.models.train_sentiment import SentimentTrainer, build_dataloader
+
+TEXTS = [
+    "MSME exports rise as demand returns",
+    "Textile units face cash crunch",
+    "छोटे उद्योगों को सस्ता कर्ज",
+    "சிறு தொழில்களுக்கு புதிய கடன் திட்டம்",
+] * 4
+
+
+@pytest.fixture(scope="module")
+def teacher(tiny_model_dir):
+    return load_teacher(tiny_model_dir)
+
+
+def test_distillation_loss_is_zero_only_for_matching_logits():
+    teacher_logits = torch.tensor([[2.0, 0.0, -1.0], [0.0, 1.0, 0.5]])
+    assert distillation_loss(teacher_logits.clone(), teacher_logits).item() == pytest.approx(0.0, abs=1e-6)
+    assert distillation_loss(teacher_logits.flip(-1), teacher_logits).item() > 0
+
+
+def test_student_trains_saves_and_loads_through_the_analyzer(teacher, tmp_path):
+    model, tokenizer = teacher
+    student, student_tokenizer = build_student(model, tokenizer, TEXTS, num_layers=1)
+    assert student.config.num_hidden_layers == 1
+    assert student.config.vocab_size < model.config.vocab_size
+    assert student.config.id2label[0] == "NEGATIVE"
+
+    logits = cache_teacher_logits(model, tokenizer, TEXTS, cache_root=str(tmp_path / "teacher_logits"))
+    trainer = SentimentTrainer(model=student, tokenizer=student_tokenizer, num_threads=1, learning_rate=1e-3)
+    loader = build_dataloader(
+        [{"headline": text} for text in TEXTS], student_tokenizer, batch_size=4, num_workers=0,
+        cache_root=str(tmp_path / "tokenized"), teacher_logits=logits, label_map=LABEL_IDS
+    )
+    trainer.train(loader, epochs=1)
+    trainer.save_model(str(tmp_path / "student"))
+
+    analyzer = SentimentAnalyzer(model_path=str(tmp_path / "student"), backend="torch", verify_parity=False)
+    inputs = student_tokenizer(TEXTS[:4], return_tensors="pt", padding=True)
+    trainer.model.eval()
+    with torch.no_grad():
+        expected = trainer.model(**inputs).logits
+        actual = analyzer._forward(analyzer.tokenizer(TEXTS[:4], return_tensors="pt", padding=True))
+    assert torch.allclose(expected, actual, atol=1e-5)
+    assert analyzer.predict(TEXTS[0])["label"] in ("NEGATIVE", "NEUTRAL", "POSITIVE")
+
+
+def test_mixed_loss_requires_gold_labels(teacher, tmp_path):
+    model, tokenizer = teacher
+    logits = cache_teacher_logits(model, tokenizer, TEXTS, cache_root=str(tmp_path / "teacher_logits"))
+
+    def loader(data):
+        return build_dataloader(
+            data, tokenizer, batch_size=4, num_workers=0, cache_root=str(tmp_path / "tokenized"),
+            teacher_logits=logits, label_map=LABEL_IDS
+        )
+
+    trainer = SentimentTrainer(model=copy.deepcopy(model), tokenizer=tokenizer, num_threads=1, distill_alpha=0.5)
+    with pytest.raises(ValueError, match="sentiment"):
+        trainer.train(loader([{"headline": text} for text in TEXTS]), epochs=1)
+
+    labelled = [{"headline": text, "sentiment": "POS"} for text in TEXTS]
+    trainer.train(loader(labelled), epochs=1, max_steps=1)
+    assert trainer.global_step == 1
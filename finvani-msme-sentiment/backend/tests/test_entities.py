@@ -0,0 +1,49 @@
+import pytest
+
+from src.services.ner_entities import ENTITY_TYPES, get_entity_extractor
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return get_entity_extractor()
+
+
+def test_states_and_sectors_in_english_and_native_script(extractor):
+    english = extractor.extract("Rajasthan handicraft artisans and Punjab textile units seek credit relief")
+    assert english["states"] == ["Rajasthan", "Punjab"]
+    assert english["sectors"] == ["Handicrafts", "Textiles"]
+
+    # Hindi and Tamil aliases resolve to the same canonical names
+    assert extractor.extract("पंजाब में कपड़ा उद्योग को राहत")["states"] == ["Punjab"]
+    tamil = extractor.extract("திருப்பூர் ஜவுளி ஏற்றுமதி சரிவு")
+    assert tamil["sectors"] == ["Textiles", "Exports"]
+    assert tamil["states"] == ["Tamil Nadu"]
+
+
+def test_city_mentions_add_their_state_once(extractor):
+    entities = extractor.extract("Bombay garment units and Maharashtra steel makers hit by power cuts")
+    assert entities["cities"] == ["Mumbai"]
+    assert entities["states"] == ["Maharashtra"]
+    assert entities["sectors"] == ["Textiles", "Steel & Metals"]
+
+
+def test_overlapping_aliases_resolve_leftmost_longest(extractor):
+    entities = extractor.extract("State Bank of India and Bank of India back more Mudra loans")
+    # "Bank of India" inside "State Bank of India" is not reported a second time for SBI's span
+    assert entities["banks"] == ["SBI", "Bank of India"]
+    assert entities["schemes"] == ["Mudra"]
+
+
+def test_aliases_only_match_whole_words(extractor):
+    entities = extractor.extract("Upgrade of metalwork in the goalpost factory")
+    assert entities["sectors"] == ["Manufacturing"]
+    assert entities["states"] == []
+
+
+def test_batch_has_every_type_per_headline(extractor):
+    texts = ["Bengaluru software firms see orders pick up", "Sensex stays flat"]
+    batch = extractor.extract_batch(texts)
+    assert batch == [extractor.extract(text) for text in texts]
+    assert all(tuple(entities) == ENTITY_TYPES for entities in batch)
+    assert batch[0]["states"] == ["Karnataka"] and batch[0]["sectors"] == ["IT & Services"]
+    assert not any(batch[1].values())
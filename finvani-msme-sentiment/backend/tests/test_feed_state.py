@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+pytest.importorskip("feedparser")
+
+from benchmarks.stub_rss_server import StubRSSServer
+from src.ingestion.rss_google_news import GoogleNewsIngester
+
+
+class FailingAppender:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extend(self, articles):
+        raise OSError("disk full")
+
+
+def test_validators_are_kept_only_after_articles_are_saved(tmp_path, monkeypatch):
+    with StubRSSServer(items_per_feed=5) as server:
+        ingester = GoogleNewsIngester(str(tmp_path), base_url=server.base_url)
+        monkeypatch.setattr(ingester, "_open_appender", lambda: FailingAppender())
+        with pytest.raises(OSError):
+            ingester.run_feeds([("MSME", "en")])
+        assert ingester.feed_state == {}
+        assert not (tmp_path / GoogleNewsIngester.FEED_STATE_FILE).exists()
+
+        # A fresh process (or the next run) must get the full feed again, not a 304
+        ingester = GoogleNewsIngester(str(tmp_path), base_url=server.base_url)
+        progress = ingester.run_feeds([("MSME", "en")])
+        assert progress[0]["new"] == 5
+        assert server.not_modified == 0
+        with open(tmp_path / GoogleNewsIngester.FEED_STATE_FILE, encoding="utf-8") as f:
+            assert list(json.load(f).values())[0]["etag"]
+
+        # Validators are now committed: the next fetch is conditional
+        assert ingester.run_feeds([("MSME", "en")])[0]["fetched"] == 0
+        assert server.not_modified == 1
+
+
+def test_failed_save_to_jsonl_discards_validators(tmp_path, monkeypatch):
+    with StubRSSServer(items_per_feed=3) as server:
+        ingester = GoogleNewsIngester(str(tmp_path), base_url=server.base_url)
+        articles = ingester.fetch_feed("MSME", "en")
+        monkeypatch.setattr(ingester, "_open_appender", lambda: FailingAppender())
+        assert ingester.save_to_jsonl(articles) is False
+        assert ingester.feed_state == {}
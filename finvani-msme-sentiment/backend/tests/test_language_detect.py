@@ -0,0 +1,66 @@
+import pytest
+
+from src.preprocess.language_detect import detect_batch, detect_language, detect_script
+
+HEADLINES = {
+    "en": "RBI keeps repo rate unchanged, MSME lenders expect relief in credit costs - Mint",
+    "ta": "ரிசர்வ் வங்கி வட்டி விகிதத்தில் மாற்றமில்லை, சிறு தொழில்களுக்கு நிம்மதி - தினமலர்",
+    "te": "రిజర్వ్ బ్యాంక్ వడ్డీ రేట్లు యథాతథం, చిన్న పరిశ్రమలకు ఊరట - ఈనాడు",
+    "gu": "રિઝર્વ બેંકે વ્યાજ દર યથાવત રાખ્યા, નાના ઉદ્યોગોને રાહત - સંદેશ",
+    "ml": "റിസർവ് ബാങ്ക് പലിശ നിരക്ക് മാറ്റമില്ല, ചെറുകിട വ്യവസായങ്ങൾക്ക് ആശ്വാസം - മനോരമ",
+    "hi": "आरबीआई ने रेपो रेट में कोई बदलाव नहीं किया, छोटे उद्योगों को राहत की उम्मीद - दैनिक भास्कर",
+    "mr": "रिझर्व्ह बँकेने रेपो दरात कोणताही बदल केलेला नाही, लघु उद्योगांना दिलासा - लोकसत्ता",
+    "ne": "सरकारले साना उद्योगहरूलाई सहुलियत ऋण दिने निर्णय गरेको छ - कान्तिपुर",
+    "mai": "सरकार छोट उद्योग सभ केँ सस्त ऋण देत, मिथिला मे खुशी",
+    "bn": "রিজার্ভ ব্যাংক সুদের হার অপরিবর্তিত রাখল, ক্ষুদ্র শিল্পে স্বস্তি - আনন্দবাজার",
+    "as": "অসমৰ ক্ষুদ্ৰ উদ্যোগলৈ নতুন ঋণ আঁচনি",
+    "ur": "ریزرو بینک نے شرح سود برقرار رکھی، چھوٹی صنعتوں کو راحت - انقلاب",
+    "sd": "سنڌ ۾ ننڍي صنعت لاءِ نئين قرض جو اعلان ڪيو ويو",
+}
+
+
+@pytest.mark.parametrize("lang", sorted(HEADLINES))
+def test_headlines_are_detected_without_a_hint(lang):
+    assert detect_language(HEADLINES[lang]) == lang
+
+
+def test_dominant_script_and_its_share():
+    assert detect_script(HEADLINES["ta"]) == ("Tamil", 1.0)
+    script, share = detect_script("MSME क्षेत्र growth")
+    assert script == "Latin" and 0.5 < share < 1.0
+    # Digits and punctuation are not letters of any script
+    assert detect_script("2026 - 10 %") == (None, 0.0)
+
+
+def test_hint_is_used_only_when_the_text_is_ambiguous():
+    # No profile n-grams: the feed language wins over the script's default
+    assert detect_language("सरकार उद्योग") == "hi"
+    assert detect_language("सरकार उद्योग", hint="mr") == "mr"
+    # Clear Marathi evidence overrides a Hindi feed
+    assert detect_language(HEADLINES["mr"], hint="hi") == "mr"
+    # A hint from another script is not trusted for Devanagari text
+    assert detect_language("सरकार उद्योग", hint="ta") == "hi"
+    # English headlines in a Hindi feed stay English
+    assert detect_language(HEADLINES["en"], hint="hi") == "en"
+
+
+def test_bengali_and_arabic_scripts_are_resolved_by_their_distinguishing_letters():
+    assert detect_language(HEADLINES["as"], hint="bn") == "as"
+    assert detect_language(HEADLINES["sd"], hint="ur") == "sd"
+    # Without those letters the feed language decides
+    assert detect_language(HEADLINES["bn"], hint="as") == "as"
+    assert detect_language(HEADLINES["ur"], hint="ks") == "ks"
+
+
+def test_text_without_letters_falls_back_to_the_hint():
+    assert detect_language("", hint="hi") == "hi"
+    assert detect_language("123 - !!") is None
+
+
+def test_batch_matches_single_detection():
+    texts = list(HEADLINES.values())
+    hints = list(HEADLINES)
+    assert detect_batch(texts) == [detect_language(text) for text in texts]
+    assert detect_batch(texts, hints) == [detect_language(text, hint) for text, hint in zip(texts, hints)]
+    with pytest.raises(ValueError):
+        detect_batch(texts, hints[:-1])
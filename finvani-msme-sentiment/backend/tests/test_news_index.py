@@ -0,0 +1,32 @@
+import json
+
+from src.ingestion import news_index
+from src.ingestion.news_index import get_news_index
+
+
+def _write_day(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": f"{path.stem}-{i}", "language": "en",
+                                "published": f"2026-01-01 10:{i:02d}:00"}) + "\n")
+
+
+def test_only_the_most_recent_day_views_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(news_index, "_INDEXES", type(news_index._INDEXES)())
+    days = [tmp_path / f"2026-01-0{day}.jsonl" for day in (1, 2, 3)]
+    for path in days:
+        _write_day(path, 3)
+
+    first = get_news_index(days[0])
+    assert [a["id"] for a in first.latest(limit=2)] == ["2026-01-01-2", "2026-01-01-1"]
+    assert get_news_index(days[0]) is first
+
+    for path in days[1:]:
+        get_news_index(path).latest()
+    assert list(news_index._INDEXES) == days[1:]
+
+    # An evicted day is rebuilt from its sidecar on demand
+    again = get_news_index(days[0])
+    assert again is not first
+    assert [a["id"] for a in again.latest(limit=1)] == ["2026-01-01-2"]
+    assert len(news_index._INDEXES) == news_index.MAX_CACHED_INDEXES
@@ -0,0 +1,44 @@
+import hashlib
+
+import pytest
+
+from src.preprocess.normalize import normalize_batch, normalize_headline
+
+
+def test_only_the_named_publisher_is_stripped():
+    assert normalize_headline("Rupee slips - The Hindu", "The Hindu") == "Rupee slips"
+    # A real tail that is not the entry's <source> is kept
+    assert normalize_headline("MSME loans are getting cheaper - here's why", "The Hindu") \
+        == "MSME loans are getting cheaper - here's why"
+    assert normalize_headline("Rupee slips - The Hindu") == "Rupee slips - The Hindu"
+
+
+def test_batch_matches_single_with_publishers():
+    titles = ["GST cut​ - Mint", "Exports rise - here's why", "छोटे उद्योग - दैनिक भास्कर"]
+    publishers = ["Mint", None, "दैनिक भास्कर"]
+    assert normalize_batch(titles, publishers) == [
+        normalize_headline(t, p) for t, p in zip(titles, publishers)
+    ] == ["GST cut", "Exports rise - here's why", "छोटे उद्योग"]
+
+
+def test_article_ids_keep_the_raw_title_hash(tmp_path):
+    pytest.importorskip("feedparser")
+    from benchmarks.stub_rss_server import StubRSSServer
+    from src.ingestion.rss_google_news import GoogleNewsIngester
+
+    with StubRSSServer(items_per_feed=2) as server:
+        ingester = GoogleNewsIngester(str(tmp_path), base_url=server.base_url)
+        article = ingester.fetch_feed("MSME", "en")[0]
+
+    assert article["publisher"] == "Stub Publisher"
+    # Ids already in the dedup index and the article store stay valid
+    assert article["id"] == hashlib.md5(f"{article['link']}{article['title']}".encode("utf-8")).hexdigest()
+    assert article["dedup_key"] != article["id"]
+
+    # The same article re-served with invisible characters is caught by the second key
+    variant = dict(article, title=article["title"].replace(" ", " ​", 1))
+    variant["id"] = ingester._generate_hash(variant)
+    variant["dedup_key"] = ingester._generate_dedup_key(variant)
+    ingester.seen_hashes.clear()
+    ingester._on_flush(tmp_path / "x.jsonl", [article])
+    assert ingester._dedup([variant]) == []
@@ -0,0 +1,46 @@
+from src.config import settings
+from src.ingestion.scorer import SentimentScorer
+from src.services.msme_relevance import get_relevance_scorer
+
+HEADLINES = {
+    # One core term
+    "core": "SIDBI launches new credit line for women-led micro enterprises",
+    "artisans": "Handloom weavers in Varanasi get new design centre",
+    # A single context term: common in MSME news, scored and stored with its relevance
+    "gst": "GST collections rise 12% year on year",
+    "credit": "RBI increases repo rate by 50 bps, hitting loans",
+    "context_pair": "Exporters struggle to get working capital",
+    # No lexicon term at all
+    "off_topic": "Sensex stays flat ahead of budget announcement",
+}
+
+
+def _scorer(tmp_path):
+    return SentimentScorer(
+        tmp_path / "raw",
+        tmp_path / "sentiment",
+        lambda texts: [{"label": "NEUTRAL", "score": 0.5} for _ in texts],
+        "test-model",
+        relevance=get_relevance_scorer().score_batch,
+        relevance_threshold=settings.MSME_RELEVANCE_THRESHOLD
+    )
+
+
+def test_default_threshold_keeps_context_only_headlines(tmp_path):
+    scorer = _scorer(tmp_path)
+    records = [{"id": name, "title": title} for name, title in HEADLINES.items()]
+    scored = {record["id"]: record for record in scorer._score(records)}
+
+    assert set(scored) == {"core", "artisans", "gst", "credit", "context_pair"}
+    assert scorer.skipped == 1
+    relevance = {name: record["msme_relevance"] for name, record in scored.items()}
+    assert relevance["core"] >= 0.9
+    assert relevance["gst"] == 0.4
+    assert relevance["credit"] == 0.3
+    assert relevance["credit"] < relevance["context_pair"] < relevance["core"]
+
+
+def test_stored_relevance_is_used_and_passed_through(tmp_path):
+    scorer = _scorer(tmp_path)
+    scored = scorer._score([{"id": "a", "title": HEADLINES["off_topic"], "msme_relevance": 0.8}])
+    assert scored[0]["msme_relevance"] == 0.8
@@ -0,0 +1,50 @@
+import threading
+import time
+
+from src.ingestion.scheduler import IngestionScheduler
+
+
+class SlowIngester:
+    def __init__(self, started: threading.Event, release: threading.Event):
+        self.started = started
+        self.release = release
+        self.runs = 0
+
+    def run_feeds(self, feeds):
+        self.runs += 1
+        self.started.set()
+        self.release.wait(5)
+        return [{"query": q, "language": l, "fetched": 1, "new": 1} for q, l in feeds]
+
+
+def test_run_now_during_a_run_returns_that_run():
+    started, release = threading.Event(), threading.Event()
+    ingester = SlowIngester(started, release)
+    scheduler = IngestionScheduler(lambda: ingester, ["MSME"], ["en", "hi"])
+    results = {}
+
+    first = threading.Thread(target=lambda: results.setdefault("first", scheduler.run_now()))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=lambda: results.setdefault("second", scheduler.run_now()))
+    second.start()
+    time.sleep(0.05)
+    assert "second" not in results  # still waiting for the in-progress run
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert ingester.runs == 1
+    assert results["second"]["run_id"] == results["first"]["run_id"] == 1
+    # A later call starts a new run instead of returning the old record
+    assert scheduler.run_now()["run_id"] == 2
+
+
+def test_productive_feeds_are_polled_sooner():
+    started, release = threading.Event(), threading.Event()
+    release.set()
+    scheduler = IngestionScheduler(
+        lambda: SlowIngester(started, release), ["MSME"], ["en"], base_interval=1000, min_interval=100, jitter=0
+    )
+    scheduler.run_now()
+    assert scheduler.feeds[("MSME", "en")].interval == 500
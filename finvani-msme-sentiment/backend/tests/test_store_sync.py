@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+pytest.importorskip("alembic")
+
+from sqlalchemy import select
+
+from src.db import crud
+from src.db.database import init_db, make_engine
+from src.db.schemas import Article
+from src.db.sync import StoreSync
+
+
+def _article(i):
+    return {"id": f"a{i}", "source": "google_news", "query": "MSME", "language": "en",
+            "title": f"Headline {i}", "link": f"https://example.com/{i}", "published": f"2026-01-01 10:{i:02d}:00"}
+
+
+def _append(path, *records, partial=None):
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        if partial:
+            f.write(partial)
+
+
+def _rows(engine):
+    with engine.connect() as conn:
+        return {row.id: row.sentiment_label for row in conn.execute(select(Article.id, Article.sentiment_label))}
+
+
+@pytest.fixture
+def store(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'finvani.db'}")
+    init_db(engine)
+    (tmp_path / "raw").mkdir()
+    (tmp_path / "sentiment").mkdir()
+    yield engine
+    engine.dispose()
+
+
+def _sync(engine, tmp_path, **kwargs):
+    return StoreSync(engine, tmp_path / "raw", tmp_path / "sentiment", tmp_path / "store_sync.json",
+                     retry_delay=0, **kwargs)
+
+
+def test_only_complete_appended_lines_are_synced(store, tmp_path):
+    raw = tmp_path / "raw" / "2026-01-01.jsonl"
+    _append(raw, _article(1), _article(2), partial='{"id": "a3"')
+    sync = _sync(store, tmp_path)
+
+    assert sync.sync_articles() == 2
+    assert sync.sync_articles() == 0
+    assert set(_rows(store)) == {"a1", "a2"}
+
+    # The torn line is finished and another appended; a restart resumes from the persisted watermark
+    with open(raw, "w", encoding="utf-8") as f:
+        f.write("\n".join(json.dumps(_article(i)) for i in (1, 2, 3)) + "\n")
+    assert _sync(store, tmp_path).sync_articles() == 1
+    assert set(_rows(store)) == {"a1", "a2", "a3"}
+
+
+def test_failed_writes_are_retried_and_replayed_on_the_next_pass(store, tmp_path, monkeypatch):
+    _append(tmp_path / "raw" / "2026-01-01.jsonl", _article(1), _article(2))
+    calls, upsert = [], crud.upsert_articles
+
+    def flaky(bind, articles):
+        calls.append(len(articles))
+        if len(calls) <= 4:
+            raise RuntimeError("database is locked")
+        return upsert(bind, articles)
+
+    monkeypatch.setattr(crud, "upsert_articles", flaky)
+    sync = _sync(store, tmp_path, retries=3)
+    # Three attempts, all failing: nothing is written and the watermark stays put
+    assert sync.sync_articles() == 0
+    assert len(calls) == 3 and _rows(store) == {}
+    assert sync.status()["last_error"] == "database is locked"
+
+    # The next pass fails once more, then succeeds on its retry
+    assert sync.sync_articles() == 2
+    assert set(_rows(store)) == {"a1", "a2"}
+
+
+def test_sentiment_waits_for_its_articles(store, tmp_path, monkeypatch):
+    _append(tmp_path / "raw" / "2026-01-01.jsonl", _article(1))
+    _append(tmp_path / "sentiment" / "2026-01-01.jsonl",
+            {"id": "a1", "label": "POSITIVE", "score": 0.9, "model_version": "m"})
+
+    def down(bind, articles):
+        raise RuntimeError("connection refused")
+
+    with monkeypatch.context() as mp:
+        mp.setattr(crud, "upsert_articles", down)
+        sync = _sync(store, tmp_path, retries=1)
+        # An UPDATE now would match no row and be lost, so the sentiment watermark must not move
+        assert sync.sync_sentiment() == 0
+
+    assert sync.sync() == {"articles": 1, "sentiment": 1}
+    assert _rows(store) == {"a1": "POSITIVE"}
+
+
+def test_truncated_file_is_resynced_from_the_start(store, tmp_path):
+    scored = tmp_path / "sentiment" / "2026-01-01.jsonl"
+    _append(tmp_path / "raw" / "2026-01-01.jsonl", _article(1), _article(2))
+    _append(scored, {"id": "a1", "label": "POSITIVE", "score": 0.9}, {"id": "a2", "label": "NEGATIVE", "score": 0.8})
+    sync = _sync(store, tmp_path)
+    sync.sync()
+
+    # The scoring worker cut the file back and rescored with a new model
+    scored.write_text(json.dumps({"id": "a1", "label": "NEUTRAL", "score": 0.6}) + "\n", encoding="utf-8")
+    assert sync.sync_sentiment() == 1
+    assert _rows(store) == {"a1": "NEUTRAL", "a2": "NEGATIVE"}
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("sklearn")
+
+from src.models.train_sentiment import SentimentTrainer, build_dataloader
+
+DATA = [
+    {"headline": f"{text} {i}", "sentiment": label}
+    for i in range(12)
+    for text, label in (("Profits soar for MSME sector", "POS"), ("Severe losses due to inflation", "NEG"),
+                        ("Market remains stable today", "NEU"))
+]
+
+
+def _trainer(model_dir, tmp_path, checkpoint_dir=None, **kwargs):
+    torch.manual_seed(0)
+    return SentimentTrainer(
+        model_dir, num_threads=1, log_every=1,
+        checkpoint_dir=str(tmp_path / checkpoint_dir) if checkpoint_dir else None, **kwargs
+    )
+
+
+def _loader(trainer, tmp_path, data=DATA, batch_size=4):
+    return build_dataloader(
+        data, trainer.tokenizer, batch_size=batch_size, num_workers=0, cache_root=str(tmp_path / "tokenized")
+    )
+
+
+def test_interrupted_and_resumed_training_matches_a_straight_run(tiny_model_dir, tmp_path):
+    def run(checkpoint_dir, max_steps=None):
+        trainer = _trainer(tiny_model_dir, tmp_path, checkpoint_dir, grad_accum_steps=2, bf16=True, checkpoint_every=2)
+        trainer.train(_loader(trainer, tmp_path), epochs=2, max_steps=max_steps)
+        return trainer
+
+    straight = run("straight")
+    stopped = run("resumed", max_steps=3)  # stops mid-epoch
+    assert stopped.epoch == 0 and stopped.global_step == 3
+    assert os.path.exists(os.path.join(tmp_path, "resumed", SentimentTrainer.CHECKPOINT_FILE))
+    resumed = run("resumed")
+
+    assert resumed.epoch == 2
+    for name, param in straight.model.state_dict().items():
+        assert torch.equal(param, resumed.model.state_dict()[name]), f"resumed training diverged at {name}"
+
+
+def test_short_last_accumulation_window_is_averaged_over_its_own_batches(tiny_model_dir, tmp_path):
+    # Three identical batches with grad_accum_steps=2: windows of 2 and 1 batches.
+    # With the learning rate at 0 and no dropout both windows must give the same gradient.
+    trainer = _trainer(tiny_model_dir, tmp_path, grad_accum_steps=2, learning_rate=0.0, max_grad_norm=0)
+    for module in trainer.model.modules():
+        if isinstance(module, torch.nn.Dropout):
+            module.p = 0.0
+    loader = _loader(trainer, tmp_path, data=[{"headline": "Profits soar for MSME sector", "sentiment": "POS"}] * 12)
+    assert len(loader) == 3
+
+    grads = []
+    trainer.optimizer.register_step_pre_hook(lambda optimizer, args, kwargs: grads.append(
+        torch.cat([p.grad.flatten() for p in trainer.model.parameters() if p.grad is not None])
+    ))
+    trainer.train(loader, epochs=1)
+
+    assert len(grads) == 2
+    assert torch.allclose(grads[0], grads[1], rtol=1e-4, atol=1e-6)
@@ -0,0 +1,54 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from src.models.infer import SentimentAnalyzer
+from src.models.vocab_pruning import prune_model_vocab, prune_tokenizer, used_token_ids
+
+TEXTS = [
+    "MSME exports rise as demand returns",
+    "Textile units face cash crunch",
+    "छोटे उद्योगों को सस्ता कर्ज",
+    "சிறு தொழில்களுக்கு புதிய கடன் திட்டம்",
+]
+
+
+def test_pruned_model_round_trips_through_the_analyzer(tiny_model_dir, tmp_path):
+    tokenizer = AutoTokenizer.from_pretrained(tiny_model_dir, use_fast=True)
+    model = AutoModelForSequenceClassification.from_pretrained(tiny_model_dir)
+    model.eval()
+    reference = tokenizer(TEXTS, return_tensors="pt", padding=True)
+    with torch.no_grad():
+        expected = model(**reference).logits
+
+    keep_ids = used_token_ids(tokenizer, TEXTS)
+    assert len(keep_ids) < model.config.vocab_size
+    pruned_tokenizer = prune_tokenizer(tokenizer, keep_ids)
+    prune_model_vocab(model, keep_ids)
+    model.save_pretrained(str(tmp_path / "pruned"))
+    pruned_tokenizer.save_pretrained(str(tmp_path / "pruned"))
+
+    analyzer = SentimentAnalyzer(model_path=str(tmp_path / "pruned"), backend="torch", verify_parity=False)
+    assert analyzer.model.config.vocab_size == len(keep_ids)
+    inputs = analyzer.tokenizer(TEXTS, return_tensors="pt", padding=True)
+    # Same segmentation: every pruned id maps back to the original id
+    assert torch.equal(torch.tensor(keep_ids)[inputs["input_ids"]], reference["input_ids"])
+    assert torch.equal(inputs["attention_mask"], reference["attention_mask"])
+    with torch.no_grad():
+        actual = analyzer._forward(inputs)
+    assert torch.allclose(expected, actual, atol=1e-5)
+
+
+def test_text_outside_the_kept_pieces_is_resegmented(tiny_model_dir):
+    tokenizer = AutoTokenizer.from_pretrained(tiny_model_dir, use_fast=True)
+    keep_ids = used_token_ids(tokenizer, TEXTS[:1])
+    pruned = prune_tokenizer(tokenizer, keep_ids)
+
+    # Kept pieces only: identical segmentation
+    original = tokenizer(TEXTS[0])["input_ids"]
+    assert [keep_ids[i] for i in pruned(TEXTS[0])["input_ids"]] == original
+    # Pieces were removed: the text no longer maps back to its original ids
+    original = tokenizer(TEXTS[2])["input_ids"]
+    assert [keep_ids[i] for i in pruned(TEXTS[2])["input_ids"]] != original
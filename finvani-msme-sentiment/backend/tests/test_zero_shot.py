@@ -0,0 +1,36 @@
+from src.ingestion.scorer import SentimentScorer
+
+
+def test_sector_tagger_fills_only_headlines_without_a_gazetteer_sector(tmp_path):
+    tagged = []
+
+    def tagger(headlines):
+        tagged.extend(headlines)
+        return [["Exports"] for _ in headlines]
+
+    scorer = SentimentScorer(
+        tmp_path / "raw",
+        tmp_path / "sentiment",
+        lambda texts: [{"label": "NEUTRAL", "score": 0.5} for _ in texts],
+        "test-model",
+        entities=lambda texts: [{"sectors": ["Textiles"] if "garment" in t else []} for t in texts],
+        sector_tagger=tagger
+    )
+    scored = scorer._score([
+        {"id": "a", "title": "Tiruppur garment units see orders return"},
+        {"id": "b", "title": "Shipments to the US fall for a third month"},
+    ])
+
+    assert [record["sectors"] for record in scored] == [["Textiles"], ["Exports"]]
+    assert tagged == ["Shipments to the US fall for a third month"]
+
+
+def test_embedding_classifier_tags_with_threshold(tiny_model_dir):
+    from src.models.zero_shot import ZeroShotClassifier
+
+    classifier = ZeroShotClassifier(labels=["Textiles", "Exports"], mode="embedding", model_path=tiny_model_dir)
+    headlines = ["सूरत के कपड़ा कारीगरों को मुद्रा लोन", "Exporters seek credit relief"]
+
+    tags = classifier.tag_batch(headlines, min_score=0.0)
+    assert all(len(t) == 1 and t[0] in ("Textiles", "Exports") for t in tags)
+    assert classifier.tag_batch(headlines, min_score=1.01) == [[], []]
@@ -38,7 +38,8 @@ export async function analyzeSentiment(text: string): Promise<SentimentResponse>
 export async function fetchHeadlines(lang: string = "en", randomize: boolean = false): Promise<NewsArticle[]> {
     const url = `${API_BASE_URL}/news/latest?lang=${lang}&randomize=${randomize}`;
     try {
-        const response = await fetch(url, { cache: 'no-store' });
+        // 'no-cache' revalidates with If-None-Match, so unchanged news comes back as a 304
+        const response = await fetch(url, { cache: 'no-cache' });
         if (!response.ok) {
             throw new Error("Failed to fetch news");
         }